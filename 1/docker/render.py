@@ -0,0 +1,771 @@
+#!/usr/bin/env python3
+"""
+Render helper for the scenes in this folder.
+
+Examples:
+    python render.py acts laravel_with_docker.py LaravelDockerStory
+    python render.py scene laravel_with_docker.py LaravelDockerStory
+    python render.py scene laravel_with_docker.py LaravelDockerStory --parallel-acts -j 16
+    python render.py scene docker_with_audio.py DockerTikTokWithAudio --shard-frames 8
+    python render.py scene laravel_with_docker.py LaravelDockerStory --from-act 5B
+    python render.py scene docker_compose_scene.py DockerComposeScene --resume
+    python render.py scene docker_compose_scene.py DockerComposeScene --direct
+    python render.py scene laravel_with_docker.py LaravelDockerStory --tiles 4
+    python render.py scene laravel_with_docker.py LaravelDockerStory --dirty-rects
+    python render.py scene docker_compose_scene.py DockerComposeScene --vfr
+    python render.py scene laravel_with_docker.py LaravelDockerStory --adaptive-rate
+    python render.py scene laravel_with_docker.py LaravelDockerStory --variants draft-720p,square
+    python render.py scene laravel_with_docker.py LaravelDockerStory --publish
+    python render.py scene laravel_with_docker.py LaravelDockerStory --hls
+    python render.py scene laravel_with_docker.py LaravelDockerStory --profile draft-540p30
+    python render.py scene laravel_with_docker.py LaravelDockerStory --trace
+    python render.py trace LaravelDockerStory --sort raster --top 20
+    python render.py lint laravel_with_docker.py
+    python render.py lint docker_with_audio.py DockerTikTokWithAudio --dry-run
+    python render.py timeline laravel_with_docker.py --events
+    python render.py scene laravel_with_docker.py LaravelDockerStory --profile draft-540p30 --memory-budget 1.5G
+    python render.py watch laravel_with_docker.py LaravelDockerStory
+    python render.py publish --clean
+    python render.py cache stats
+    python render.py cache gc --budget 20G
+    python render.py cache serve --root /srv/render-cache --port 8765
+    python render.py scene docker_compose_scene.py DockerComposeScene --remote-cache http://render-box:8765
+    python render.py farm submit /mnt/render/queue laravel_with_docker.py LaravelDockerStory
+    python render.py farm worker /mnt/render/queue --slots 2
+    python render.py farm assemble /mnt/render/queue --wait
+    python render.py batch
+    python render.py batch --only draft -j 4
+    python render.py daemon start
+    python render.py --warm scene docker_compose_scene.py DockerComposeScene --from-act 5
+    python render.py tune-encoder media/videos/laravel_with_docker/1920p60/LaravelDockerStory.mp4 --start 20
+    python render.py bench-tiles laravel_with_docker.py LaravelDockerStory --tiles 4 --frames 300
+"""
+
+import argparse
+import os
+import sys
+import time
+
+
+def cmd_acts(args):
+    from render_tools.acts import find_acts_in_file
+
+    acts = find_acts_in_file(args.scene_file, args.scene_name)
+    if not acts:
+        print(f"No act markers found in {args.scene_name}.construct")
+        return 1
+    for act in acts:
+        planned = ""
+        if act.planned_start is not None:
+            planned = f"  ({act.planned_start:g}-{act.planned_end:g}s)"
+        print(f"{act.index:>3}  {act.key:<7} line {act.line:<5} {act.title}{planned}")
+    return 0
+
+
+def use_profile(name):
+    """Select the render profile ``name`` for this process and its workers; False if there is none."""
+    from render_tools.profiles import PROFILE_ENV, get_profile
+
+    try:
+        profile = get_profile(name)
+    except ValueError as error:
+        print(error)
+        return False
+    os.environ[PROFILE_ENV] = profile.name
+    return True
+
+
+def cmd_scene(args):
+    from render_tools.runner import load_scene, render_scene
+
+    if args.profile and not use_profile(args.profile):
+        return 2
+    publisher = None
+    if args.publish:
+        from render_tools.publish import Publisher
+        publisher = Publisher()
+
+    if args.hls and (args.parallel_acts or args.direct or args.variants):
+        print("--hls cuts its segments from the partial movie files of a single process render; "
+              "drop --parallel-acts/--direct/--variants")
+        return 2
+    if (args.trace or args.log_plays) and args.parallel_acts:
+        print("--trace and --log-plays profile a single process render; drop --parallel-acts")
+        return 2
+    if (args.memory or args.memory_budget) and args.parallel_acts:
+        print("--memory samples a single process render at its act boundaries; drop --parallel-acts")
+        return 2
+
+    if args.parallel_acts:
+        from render_tools.parallel import render_acts_parallel
+        movie = render_acts_parallel(args.scene_file, args.scene_name, jobs=args.jobs, output_file=args.output)
+        if publisher is not None:
+            publisher.submit(movie)
+            publisher.close()
+        return 0
+
+    from manim import config
+
+    scene_class = load_scene(args.scene_file, args.scene_name)
+    renderer_kwargs = {}
+    suffix = ""
+    if args.from_act is not None:
+        from render_tools.acts import find_acts, select_act
+        renderer_kwargs["first_act"] = select_act(find_acts(scene_class), args.from_act).index
+        suffix = f"_from_{args.from_act}"
+    if args.from_time is not None:
+        renderer_kwargs["from_time"] = args.from_time
+        suffix = f"_from_{args.from_time:g}s"
+    if args.direct or args.variants:
+        if args.resume:
+            print("--direct and --variants write no partial movie files, so there is nothing to --resume")
+            return 2
+        if args.variants:
+            from render_tools.variants import FanOutFileWriter, parse_variants
+            renderer_kwargs["variants"] = parse_variants(args.variants)
+            renderer_kwargs["file_writer_class"] = FanOutFileWriter
+        else:
+            from render_tools.direct import DirectFileWriter
+            renderer_kwargs["file_writer_class"] = DirectFileWriter
+        # No partial files means no cache to look up: skip hashing every play
+        config.disable_caching = True
+    elif not args.no_checkpoint:
+        from render_tools.checkpoint import Checkpoint
+        from render_tools.renderer import cache_variant
+        from render_tools.tuning import load_profile
+        window = {"from_act": args.from_act, "from_time": args.from_time}
+        profile = None if args.no_encoder_profile else load_profile()
+        variant = cache_variant(args.vfr, args.adaptive_rate, args.max_frame_step, args.frame_fill, profile)
+        renderer_kwargs["checkpoint"] = Checkpoint(
+            args.scene_file, args.scene_name, window=window, resume=args.resume, variant=variant
+        )
+    if not config.disable_caching and not args.no_store:
+        from render_tools.store import MediaStore, parse_size
+        budget = parse_size(args.cache_budget) if args.cache_budget else None
+        renderer_kwargs["store"] = MediaStore(budget=budget, policy=args.cache_policy)
+    remote = args.remote_cache or os.environ.get("RENDER_REMOTE_CACHE")
+    if remote and not config.disable_caching:
+        from render_tools.remote import RemoteCacheClient, open_remote_cache
+        renderer_kwargs["remote_cache"] = RemoteCacheClient(
+            open_remote_cache(remote), config.media_dir, upload=not args.no_remote_upload
+        )
+    if args.output:
+        config.output_file = args.output
+    elif suffix:
+        # Don't overwrite the full render with a partial one
+        config.output_file = args.scene_name + suffix.replace(" ", "")
+    if args.shard_frames > 1:
+        from render_tools.sharding import FrameSharder
+        renderer_kwargs["sharder"] = FrameSharder(args.shard_frames, args.shard_min_seconds)
+    if args.frame_pool:
+        renderer_kwargs["frame_pool_size"] = args.frame_pool
+    if args.tiles > 1:
+        if args.dirty_rects:
+            print("--dirty-rects and --tiles are different rasterization modes, pick one")
+            return 2
+        renderer_kwargs["tiles"] = args.tiles
+    if args.dirty_rects:
+        renderer_kwargs["dirty_rects"] = True
+    if args.no_encoder_profile:
+        renderer_kwargs["encoder_profile"] = None
+    if args.cfr_output and not args.vfr:
+        print("--cfr-output only applies to --vfr renders")
+        return 2
+    if args.vfr:
+        renderer_kwargs["vfr"] = True
+        renderer_kwargs["cfr_output"] = args.cfr_output
+    if args.adaptive_rate:
+        from render_tools.profiles import current_profile
+        profile = current_profile()
+        if profile is not None and profile.frame_rate < config.frame_rate:
+            print(f"--adaptive-rate fills in skipped frames, and {profile.name} writes fewer frames; pick one")
+            return 2
+        renderer_kwargs["adaptive_rate"] = True
+        renderer_kwargs["max_frame_step"] = args.max_frame_step
+        renderer_kwargs["frame_fill"] = args.frame_fill
+    if publisher is not None:
+        renderer_kwargs["publisher"] = publisher
+    if args.trace or args.log_plays:
+        from render_tools.profiler import RenderProfiler
+        renderer_kwargs["profiler"] = RenderProfiler(trace=args.trace, log_plays=args.log_plays)
+        if args.log_plays:
+            config.progress_bar = "none"
+    memory_guard = None
+    if args.memory or args.memory_budget:
+        from render_tools.memory import MemoryGuard
+        from render_tools.store import parse_size
+        budget = parse_size(args.memory_budget) if args.memory_budget else None
+        memory_guard = renderer_kwargs["memory_guard"] = MemoryGuard(budget, allocations=not args.no_tracemalloc)
+    server = None
+    if args.hls:
+        from render_tools.hls import HlsSegmenter, serve_hls
+        renderer_kwargs["hls"] = HlsSegmenter(args.scene_name, segment_seconds=args.hls_segment)
+        if args.hls_port:
+            server = serve_hls(renderer_kwargs["hls"].directory, port=args.hls_port)
+    render_scene(scene_class, **renderer_kwargs)
+    if publisher is not None:
+        publisher.close()
+    if server is not None:
+        print(f"Render finished; still serving the preview on port {server.server_port}, Ctrl-C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+    if memory_guard is not None and memory_guard.over_budget:
+        print(f"Over the memory budget in {len(memory_guard.over_budget)} act(s): "
+              + ", ".join(sample["label"] for sample in memory_guard.over_budget))
+        return 1
+    return 0
+
+
+def cmd_trace(args):
+    from pathlib import Path
+
+    from render_tools.profiler import SORT_KEYS, format_acts, format_table, load_report
+
+    if args.sort not in SORT_KEYS:
+        print(f"Can't sort on {args.sort}; pick one of {', '.join(SORT_KEYS)}")
+        return 2
+    path = Path(args.report)
+    if not path.exists():
+        path = Path("media") / "profile" / f"{args.report}.json"
+    if not path.exists():
+        print(f"No profile at {args.report} or {path}; render with --trace first")
+        return 1
+    report = load_report(path)
+    print(format_table(report, sort=args.sort, top=args.top))
+    print()
+    print(format_acts(report))
+    return 0
+
+
+def cmd_lint(args):
+    import json
+
+    from render_tools.acts import scene_names_in_file
+    from render_tools.lint import lint_scene
+    from render_tools.profiles import current_profile
+
+    if args.profile and not use_profile(args.profile):
+        return 2
+    names = [args.scene_name] if args.scene_name else scene_names_in_file(args.scene_file)
+    reports = []
+    for name in names:
+        dry_run = None
+        if args.dry_run:
+            from render_tools.dryrun import dry_run as run_construct
+            from render_tools.runner import load_scene
+            dry_run = run_construct(load_scene(args.scene_file, name))
+        reports.append(lint_scene(args.scene_file, name, profile=current_profile(), dry_run=dry_run))
+    if args.json:
+        print(json.dumps([report.to_dict() for report in reports], indent=1))
+    else:
+        print("\n\n".join(report.format() for report in reports))
+    return 1 if any(report.findings for report in reports) else 0
+
+
+def cmd_timeline(args):
+    import json
+
+    from manim import config
+
+    from render_tools.acts import scene_names_in_file
+    from render_tools.dryrun import dry_run
+    from render_tools.runner import load_scene
+    from render_tools.timeline import (
+        GUIDELINE_BUDGET, Budget, check_timeline, format_timeline, scene_timeline, write_timeline,
+    )
+
+    budget = GUIDELINE_BUDGET
+    if args.no_budget:
+        budget = None
+    elif args.duration is not None or args.acts is not None:
+        try:
+            duration = args.duration if args.duration is not None else GUIDELINE_BUDGET.duration
+            budget = Budget.parse(duration, args.acts)
+        except ValueError:
+            print(f"Can't parse --acts {args.acts!r} (e.g. 0-30,30-75,75-110,110-120)")
+            return 2
+    if args.json:
+        # Keep manim's log lines out of the JSON
+        config.verbosity = "WARNING"
+    names = [args.scene_name] if args.scene_name else scene_names_in_file(args.scene_file)
+    timelines = []
+    failed = False
+    for name in names:
+        renderer = dry_run(load_scene(args.scene_file, name))
+        timeline = scene_timeline(renderer)
+        timeline["issues"] = check_timeline(timeline, budget, tolerance=args.tolerance)
+        timeline["path"] = str(write_timeline(timeline))
+        timelines.append(timeline)
+        failed = failed or bool(timeline["issues"])
+        if args.json:
+            continue
+        print(format_timeline(timeline, budget, events=args.events))
+        played = [act for act in timeline["acts"] if act["start"] is not None]
+        if budget is not None and budget.acts and len(played) != len(budget.acts):
+            print(f"{len(played)} acts against the budget's {len(budget.acts)}: only the total length is checked")
+        for issue in timeline["issues"]:
+            print(f"  ! {issue}")
+        print(f"Timeline written to {timeline['path']}\n")
+    if args.json:
+        print(json.dumps(timelines, indent=1))
+    return 1 if failed else 0
+
+
+def cmd_watch(args):
+    from render_tools.watch import SceneWatcher
+
+    if args.profile and not use_profile(args.profile):
+        return 2
+    watcher = SceneWatcher(args.scene_file, args.scene_name, jobs=args.jobs, preview_file=args.preview)
+    if args.once:
+        rendered = watcher.update()
+        print(f"{len(rendered)} acts rendered; preview at {watcher.preview_file}")
+        return 0
+    try:
+        watcher.watch(poll_seconds=args.poll)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_publish(args):
+    from render_tools.publish import Publisher, clean_media, final_movies
+
+    movies = args.movie_files or final_movies()
+    publisher = Publisher(
+        args.dest,
+        jobs=args.jobs,
+        target_lufs=args.target_lufs,
+        poster_time=args.poster_time,
+        preview=not args.no_preview,
+        keep_source=args.keep_source,
+    )
+    for movie in movies:
+        publisher.submit(movie)
+    entries = publisher.close()
+    if args.clean:
+        clean_media()
+    if not movies:
+        print("No final videos found")
+    for entry in entries:
+        level = "silent" if entry["loudness_lufs"] is None else f"{entry['loudness_lufs']:g} LUFS {entry['gain_db']:+g} dB"
+        print(f"{entry['outputs']['movie']:<50} {level}")
+    print(f"Published {len(entries)} of {len(movies)} videos to {args.dest}/")
+    return 0
+
+
+def cmd_cache(args):
+    from render_tools.store import MediaStore, format_size, parse_size
+
+    if args.action == "serve":
+        from render_tools.remote import serve_cache
+        serve_cache(args.root, host=args.host, port=args.port)
+        return 0
+
+    budget = parse_size(args.budget) if args.budget else None
+    if args.dry_run:
+        store = MediaStore()
+    else:
+        store = MediaStore(budget=budget, policy=args.policy)
+    if args.action == "gc":
+        report = store.gc(budget=budget, policy=args.policy, dry_run=args.dry_run)
+        verb = "Would evict" if args.dry_run else "Evicted"
+        print(f"{verb} {report['evicted']} objects, {format_size(report['freed'])}; "
+              f"{format_size(report['size'])} left")
+        return 0
+
+    summary = store.summary()
+    settings = summary["settings"]
+    budget = format_size(settings["budget"]) if settings["budget"] is not None else "none"
+    print(f"Store: {format_size(summary['size'])}, budget {budget}, policy {settings['policy']}, "
+          f"keeps the last {settings['keep_renders']} renders of each scene")
+    print(f"{'kind':<8} {'objects':>8} {'size':>11} {'deduped':>11} {'hits':>7} {'misses':>7} {'hit rate':>8} "
+          f"{'reclaimable':>11}")
+    for kind, stats in summary["kinds"].items():
+        rate = f"{100 * stats['hit_rate']:.1f}%" if stats["hit_rate"] is not None else "-"
+        print(f"{kind:<8} {stats['objects']:>8} {format_size(stats['size']):>11} "
+              f"{format_size(stats['deduplicated']):>11} {stats['hits']:>7} {stats['misses']:>7} {rate:>8} "
+              f"{format_size(stats['reclaimable']):>11}")
+    if summary["over_budget"]:
+        print(f"Over budget by {format_size(summary['over_budget'])}: run `render.py cache gc`")
+    for scene, count in sorted(summary["scenes"].items()):
+        print(f"  {scene}: {count} entries in its last render")
+    return 0
+
+
+def cmd_farm(args):
+    from render_tools.jobqueue import JobQueue
+
+    queue = JobQueue(args.queue, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+    if args.action == "submit":
+        from render_tools.coordinator import submit_renders
+        if not args.scene_file:
+            print("farm submit needs a scene file")
+            return 2
+        submitted = submit_renders(queue, args.scene_file, args.scenes, per_scene=args.per_scene)
+        print(f"Queued {len(submitted)} jobs in {queue.root}")
+        for identifier in submitted:
+            print(f"  {identifier}")
+        return 0
+    if args.action == "worker":
+        from render_tools.coordinator import run_worker
+        finished = run_worker(queue, slots=args.slots, wait_for_jobs=args.wait, poll_seconds=args.poll)
+        print(f"Finished {finished} jobs")
+        return 0
+    if args.action == "assemble":
+        from render_tools.coordinator import assemble
+        outputs, failed = assemble(queue, wait_for_jobs=args.wait, poll_seconds=args.poll)
+        for output in outputs:
+            print(f"Assembled {output}")
+        for scene_name in failed:
+            print(f"{scene_name} has a failed job, see `render.py farm status`")
+        return 1 if failed else 0
+
+    from render_tools.coordinator import job_errors, queue_status
+    counts, rows = queue_status(queue)
+    print(", ".join(f"{count} {state}" for state, count in counts.items()))
+    for identifier, state, attempt, node in rows:
+        print(f"{identifier:<48} {state:<8} attempt {attempt + 1:<3} {node}")
+        if state == "failed":
+            print("    " + job_errors(queue, identifier)[-1].strip().splitlines()[-1])
+    return 0
+
+
+def cmd_batch(args):
+    from render_tools.batch import discover_scenes, format_summary, render_batch
+
+    scenes = discover_scenes(args.folder)
+    if args.scenes:
+        unknown = set(args.scenes) - {scene for _, scene in scenes}
+        if unknown:
+            print(f"No scene named {', '.join(sorted(unknown))} in {args.folder}")
+            return 2
+        scenes = [(scene_file, scene) for scene_file, scene in scenes if scene in args.scenes]
+    if not scenes:
+        print(f"No scenes found in {args.folder}")
+        return 1
+    publisher = None
+    if args.publish:
+        from render_tools.publish import Publisher
+        publisher = Publisher()
+    qualities = (args.only,) if args.only else ("draft", "final")
+    rows, wall_seconds = render_batch(
+        scenes,
+        qualities=qualities,
+        jobs=args.jobs,
+        encoder_threads=args.encoder_threads,
+        publisher=publisher,
+    )
+    if publisher is not None:
+        publisher.close()
+    print(format_summary(rows, wall_seconds))
+    return 1 if any(row["status"] != "ok" for row in rows) else 0
+
+
+def cmd_bench_tiles(args):
+    from render_tools.bench import bench_tiles
+    from render_tools.runner import load_scene
+
+    scene_class = load_scene(args.scene_file, args.scene_name)
+    renderer_kwargs = {}
+    if args.from_act is not None:
+        from render_tools.acts import find_acts, select_act
+        renderer_kwargs["first_act"] = select_act(find_acts(scene_class), args.from_act).index
+    renderer = bench_tiles(scene_class, args.tiles, max_frames=args.frames, **renderer_kwargs)
+    print(renderer.summary())
+    return 1 if renderer.mismatched_frames else 0
+
+
+def cmd_tune_encoder(args):
+    from render_tools.tuning import CRFS, PRESETS, TUNES, tune_encoder
+
+    results, best = tune_encoder(
+        args.movie_file,
+        start=args.start,
+        seconds=args.seconds,
+        presets=args.presets.split(",") if args.presets else PRESETS,
+        tunes=args.tunes.split(",") if args.tunes else TUNES,
+        crfs=[int(crf) for crf in args.crfs.split(",")] if args.crfs else CRFS,
+        min_ssim=args.min_ssim,
+        jobs=args.jobs,
+        write=not args.dry_run,
+    )
+    print(f"{'preset':<10} {'tune':<11} {'crf':>3} {'seconds':>9} {'KiB':>8} {'ssim':>8} {'psnr':>6}")
+    for result in results:
+        profile = result["profile"]
+        mark = "  <-" if result is best else ""
+        # Timed side by side with the other encodes only: slower than alone
+        load = " " if result["timed_alone"] else "*"
+        print(
+            f"{profile['preset']:<10} {profile['tune']:<11} {profile['crf']:>3} "
+            f"{result['encode_seconds']:>8.3f}{load} {result['size_bytes'] / 1024:>8.1f} "
+            f"{result['ssim']:>8.5f} {result['psnr']:>6.2f}{mark}"
+        )
+    if not all(result["timed_alone"] for result in results):
+        print("* below --min-ssim, timed under load only")
+    if best is None:
+        print(f"No setting reached SSIM {args.min_ssim}")
+        return 1
+    return 0
+
+
+def cmd_daemon(args):
+    from render_tools.daemon import RenderDaemon, daemon_running, send, socket_path, warm_up
+
+    path = socket_path()
+    if args.action == "start":
+        seconds = warm_up()
+        print(f"Warmed up in {seconds:.1f}s")
+        RenderDaemon(path, main, max_jobs=args.jobs).serve()
+        return 0
+    if not daemon_running(path):
+        print(f"No render daemon on {path}")
+        return 1
+    if args.action == "stop":
+        reply = send(path, {"command": "stop"})
+        print(f"Render daemon stopping after {reply['jobs']} running jobs")
+        return 0
+    reply = send(path, {"command": "status"})
+    print(f"Render daemon {reply['pid']} on {path}: {len(reply['jobs'])} jobs running, {reply['waiting']} waiting")
+    for job in reply["jobs"]:
+        print(f"  {job['pid']:>7} {job['seconds']:>8.1f}s  {' '.join(job['argv'])}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render the TikTok scenes with the render tools')
+    parser.add_argument('--warm', action='store_true',
+                        help='Run the command in the warm render daemon (see the daemon command)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    acts = subparsers.add_parser('acts', help='List the act markers of a scene')
+    acts.add_argument('scene_file')
+    acts.add_argument('scene_name')
+    acts.set_defaults(func=cmd_acts)
+
+    scene = subparsers.add_parser('scene', help='Render a scene')
+    scene.add_argument('scene_file')
+    scene.add_argument('scene_name')
+    scene.add_argument('--profile', metavar='NAME',
+                       help='Render profile: draft-540p30, review-720p60 or final-1080p60 '
+                            "(default: $RENDER_PROFILE, else the scene file's settings)")
+    scene.add_argument('--parallel-acts', action='store_true',
+                       help='Render every act in its own process and stitch the results')
+    scene.add_argument('-j', '--jobs', type=int, default=None,
+                       help='Worker processes for --parallel-acts (default: CPU count)')
+    window = scene.add_mutually_exclusive_group()
+    window.add_argument('--from-act', metavar='ACT',
+                        help='Start rendering at this act ("4B", "ending", or see the acts command)')
+    window.add_argument('--from-time', type=float, metavar='SECONDS',
+                        help='Start rendering at the first play starting at or after this time')
+    scene.add_argument('--direct', action='store_true',
+                       help='Stream all frames into one encoder (no partial files, no cache)')
+    scene.add_argument('--variants', metavar='LIST',
+                       help='Also encode these outputs from the same frames, e.g. draft-720p,square,540x960@crf30 '
+                            '(implies --direct)')
+    scene.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted render from its checkpoint')
+    scene.add_argument('--no-checkpoint', action='store_true',
+                       help='Do not write a checkpoint manifest')
+    scene.add_argument('--frame-pool', type=int, default=0, metavar='N',
+                       help='Hand frames to the encoder thread through N reusable buffers')
+    scene.add_argument('--tiles', type=int, default=0, metavar='N',
+                       help='Rasterize each frame as N horizontal bands on N threads')
+    scene.add_argument('--dirty-rects', action='store_true',
+                       help='Redraw only the part of each frame that changed since the previous one')
+    scene.add_argument('--vfr', action='store_true',
+                       help='Encode runs of identical frames once (variable frame rate output)')
+    scene.add_argument('--cfr-output', action='store_true',
+                       help='With --vfr, re-encode the final movie at a constant frame rate')
+    scene.add_argument('--adaptive-rate', action='store_true',
+                       help='Rasterize slow plays at a lower rate and fill in the frames between')
+    scene.add_argument('--max-frame-step', type=int, default=2, metavar='N',
+                       help='With --adaptive-rate, rasterize at least every Nth frame (default: 2, i.e. 30fps)')
+    scene.add_argument('--frame-fill', choices=['blend', 'repeat'], default='blend',
+                       help='With --adaptive-rate, blend neighbouring frames or repeat the previous one')
+    scene.add_argument('--no-encoder-profile', action='store_true',
+                       help='Ignore the profile written by tune-encoder')
+    scene.add_argument('--cache-budget', metavar='SIZE',
+                       help='Keep the render cache under SIZE (e.g. 20G), evicting old entries (see the cache command)')
+    scene.add_argument('--cache-policy', choices=['lru', 'lfu'], default=None,
+                       help='Evict the least recently (lru, default) or least often (lfu) used entries first')
+    scene.add_argument('--no-store', action='store_true',
+                       help="Leave the render cache to manim's own file count limit")
+    scene.add_argument('--remote-cache', metavar='DIR_OR_URL',
+                       help='Shared cache of partial movie files: a folder or an http:// cache server '
+                            '(default: $RENDER_REMOTE_CACHE)')
+    scene.add_argument('--no-remote-upload', action='store_true',
+                       help='Only fetch from the remote cache, never upload to it')
+    scene.add_argument('--publish', action='store_true',
+                       help='Publish the movie to video/ once it is written (see the publish command)')
+    scene.add_argument('--hls', action='store_true',
+                       help='Publish finished plays as a live HLS preview in media/hls/<Scene> while rendering')
+    scene.add_argument('--hls-segment', type=float, default=4.0, metavar='SECONDS',
+                       help='Target HLS segment length (default: 4)')
+    scene.add_argument('--hls-port', type=int, default=8800,
+                       help='Serve the preview on this local port (default: 8800, 0: do not serve)')
+    scene.add_argument('--trace', action='store_true',
+                       help='Time every play and write media/profile/<Scene>.json and a Chrome trace')
+    scene.add_argument('--log-plays', action='store_true',
+                       help='One log line with timings per play instead of the progress bars')
+    scene.add_argument('--memory', action='store_true',
+                       help='Sample RSS, allocations and live mobjects at every act boundary, into media/memory/')
+    scene.add_argument('--memory-budget', metavar='SIZE',
+                       help='Flag acts whose peak RSS goes over SIZE (e.g. 1.5G) and exit with 1 (implies --memory)')
+    scene.add_argument('--no-tracemalloc', action='store_true',
+                       help='With --memory, skip the per-line allocation statistics (much less overhead)')
+    scene.add_argument('--shard-frames', type=int, default=0, metavar='N',
+                       help='Rasterize long plays on N processes')
+    scene.add_argument('--shard-min-seconds', type=float, default=1.0,
+                       help='Only shard plays at least this long (default: 1.0)')
+    scene.add_argument('-o', '--output', default=None,
+                       help='Output movie path (default: the usual media/videos location)')
+    scene.set_defaults(func=cmd_scene)
+
+    trace = subparsers.add_parser('trace', help='Print the play timings of a --trace render, sorted')
+    trace.add_argument('report', help='A media/profile/<Scene>.json file, or just the scene name')
+    trace.add_argument('--sort', default='wall',
+                       help='wall (default), raster, frame (ms per frame), encode, hash, construct, frames, '
+                            'cues or start (scene order)')
+    trace.add_argument('--top', type=int, default=None, metavar='N', help='Only the first N plays')
+    trace.set_defaults(func=cmd_trace)
+
+    lint = subparsers.add_parser('lint', help='Flag expensive patterns in a scene and estimate the render cost per act')
+    lint.add_argument('scene_file')
+    lint.add_argument('scene_name', nargs='?', help='Scene class (default: every scene in the file)')
+    lint.add_argument('--dry-run', action='store_true',
+                      help='Also run construct without rendering, for exact plays per act and invisible mobjects')
+    lint.add_argument('--profile', metavar='NAME',
+                      help='Estimate for this render profile, e.g. draft-540p30 (default: $RENDER_PROFILE)')
+    lint.add_argument('--json', action='store_true', help='Print the findings and estimates as JSON')
+    lint.set_defaults(func=cmd_lint)
+
+    timeline = subparsers.add_parser('timeline', help='Time every play, act and sound cue without rendering, '
+                                                      'and check the duration budget')
+    timeline.add_argument('scene_file')
+    timeline.add_argument('scene_name', nargs='?', help='Scene class (default: every scene in the file)')
+    timeline.add_argument('--duration', type=float, default=None, metavar='SECONDS',
+                          help="Total length budget (default: guideline.md's 120)")
+    timeline.add_argument('--acts', metavar='SPANS',
+                          help="Act spans of the budget (default: guideline.md's 0-30,30-75,75-110,110-120, "
+                               "or none with --duration)")
+    timeline.add_argument('--no-budget', action='store_true',
+                          help='Only check the planned times in the act banners')
+    timeline.add_argument('--tolerance', type=float, default=1.0, metavar='SECONDS',
+                          help='Allowed difference from the budget and the planned times (default: 1)')
+    timeline.add_argument('--events', action='store_true', help='Also list every play, wait and cue')
+    timeline.add_argument('--json', action='store_true', help='Print the timelines as JSON')
+    timeline.set_defaults(func=cmd_timeline)
+
+    watch = subparsers.add_parser('watch', help='Re-render the acts an edit touched every time the scene file is saved')
+    watch.add_argument('scene_file')
+    watch.add_argument('scene_name')
+    watch.add_argument('-j', '--jobs', type=int, default=None,
+                       help='Acts rendered at once (default: CPU count)')
+    watch.add_argument('--profile', metavar='NAME',
+                       help='Render profile, e.g. draft-540p30 (default: $RENDER_PROFILE)')
+    watch.add_argument('--preview', metavar='PATH',
+                       help='Preview movie, replaced after every update (default: media/watch/<Scene>/preview.mp4)')
+    watch.add_argument('--poll', type=float, default=0.5, help='Seconds between checks of the file (default: 0.5)')
+    watch.add_argument('--once', action='store_true', help='Bring the preview up to date once and exit')
+    watch.set_defaults(func=cmd_watch)
+
+    publish = subparsers.add_parser('publish', help='Publish final movies to video/ (fast start, loudness, poster, preview)')
+    publish.add_argument('movie_files', nargs='*',
+                         help='Movies to publish (default: every final movie under media/videos)')
+    publish.add_argument('--dest', default='video', help='Output folder (default: video)')
+    publish.add_argument('--target-lufs', type=float, default=-14.0,
+                         help='Integrated loudness of the published audio (default: -14)')
+    publish.add_argument('--poster-time', type=float, default=2.0,
+                         help='Scene time of the poster frame in seconds (default: 2)')
+    publish.add_argument('--no-preview', action='store_true', help='Skip the poster and the low-bitrate preview')
+    publish.add_argument('--keep-source', action='store_true', help='Copy instead of moving out of media/videos')
+    publish.add_argument('--clean', action='store_true',
+                         help='Afterwards remove partial movie files, the text cache and temp files')
+    publish.add_argument('-j', '--jobs', type=int, default=2, help='Movies published at once (default: 2)')
+    publish.set_defaults(func=cmd_publish)
+
+    cache = subparsers.add_parser('cache', help='Inspect or trim the render cache (media/store)')
+    cache.add_argument('action', nargs='?', choices=['stats', 'gc', 'serve'], default='stats',
+                       help='stats (default), gc, or serve a remote cache over HTTP')
+    cache.add_argument('--budget', metavar='SIZE', help='Disk budget, e.g. 20G (saved for later renders)')
+    cache.add_argument('--policy', choices=['lru', 'lfu'], default=None, help='Eviction order (saved)')
+    cache.add_argument('--dry-run', action='store_true', help='With gc, only report what would be evicted')
+    cache.add_argument('--root', default='remote_cache', help='With serve, the folder to serve (default: remote_cache)')
+    cache.add_argument('--host', default='127.0.0.1',
+                       help='With serve, the address to listen on (default: 127.0.0.1, this machine only; '
+                            'use 0.0.0.0 to serve the network)')
+    cache.add_argument('--port', type=int, default=8765, help='With serve, the port (default: 8765)')
+    cache.set_defaults(func=cmd_cache)
+
+    farm = subparsers.add_parser('farm', help='Render on several machines through a job queue in a shared folder')
+    farm.add_argument('action', choices=['submit', 'worker', 'assemble', 'status'])
+    farm.add_argument('queue', help='Queue folder on the shared mount')
+    farm.add_argument('scene_file', nargs='?', help='With submit, the scene file')
+    farm.add_argument('scenes', nargs='*', help='With submit, the scenes to render (default: all in the file)')
+    farm.add_argument('--per-scene', action='store_true', help='With submit, one job per scene instead of per act')
+    farm.add_argument('--slots', type=int, default=1, help='With worker, jobs rendered at once on this node')
+    farm.add_argument('--wait', action='store_true',
+                      help='worker: keep polling for new jobs; assemble: wait until every job has finished')
+    farm.add_argument('--poll', type=float, default=5.0, help='Seconds between queue checks (default: 5)')
+    farm.add_argument('--lease-seconds', type=float, default=60.0,
+                      help="Requeue a worker's jobs after this long without a heartbeat (default: 60)")
+    farm.add_argument('--max-attempts', type=int, default=3, help='Attempts per job before it fails (default: 3)')
+    farm.set_defaults(func=cmd_farm)
+
+    batch = subparsers.add_parser('batch', help='Render every scene in the folder, drafts first, on a process pool')
+    batch.add_argument('scenes', nargs='*', help='Only these scenes (default: every scene found)')
+    batch.add_argument('--folder', default='.', help='Folder with the scene files (default: .)')
+    batch.add_argument('--only', choices=['draft', 'final'],
+                       help='Render only drafts (540x960, 30fps) or only finals (default: both)')
+    batch.add_argument('-j', '--jobs', type=int, default=None,
+                       help='Scenes rendered at once (default: CPUs / (1 + encoder threads))')
+    batch.add_argument('--encoder-threads', type=int, default=None, metavar='N',
+                       help='x264 threads per render (default: 2, or what -j leaves over)')
+    batch.add_argument('--publish', action='store_true', help='Publish each final to video/ as soon as it is done')
+    batch.set_defaults(func=cmd_batch)
+
+    bench = subparsers.add_parser('bench-tiles', help='Compare serial and tiled rasterization of a scene')
+    bench.add_argument('scene_file')
+    bench.add_argument('scene_name')
+    bench.add_argument('--tiles', type=int, default=4, metavar='N',
+                       help='Number of horizontal bands (default: 4)')
+    bench.add_argument('--frames', type=int, default=None, metavar='N',
+                       help='Stop after N frames (default: the whole scene)')
+    bench.add_argument('--from-act', metavar='ACT',
+                       help='Start benchmarking at this act')
+    bench.set_defaults(func=cmd_bench_tiles)
+
+    tune = subparsers.add_parser('tune-encoder', help='Find the fastest x264 settings that keep our quality bar')
+    tune.add_argument('movie_file', help='A rendered movie of one of the scenes')
+    tune.add_argument('--start', type=float, default=0.0, help='Segment start in seconds (default: 0)')
+    tune.add_argument('--seconds', type=float, default=4.0, help='Segment length (default: 4)')
+    tune.add_argument('--presets', help='Comma separated x264 presets (default: ultrafast..medium)')
+    tune.add_argument('--tunes', help='Comma separated x264 tunes, "none" for no tune')
+    tune.add_argument('--crfs', help='Comma separated CRF values (default: 18,21,23,26)')
+    tune.add_argument('--min-ssim', type=float, default=0.98,
+                      help='Lowest acceptable SSIM on any frame (default: 0.98)')
+    tune.add_argument('-j', '--jobs', type=int, default=None,
+                      help='Parallel encodes (default: a quarter of the CPUs)')
+    tune.add_argument('--dry-run', action='store_true', help='Print the results without writing the profile')
+    tune.set_defaults(func=cmd_tune_encoder)
+
+    daemon = subparsers.add_parser('daemon', help='Keep manim loaded and run --warm commands in forked children')
+    daemon.add_argument('action', nargs='?', choices=['start', 'stop', 'status'], default='status')
+    daemon.add_argument('-j', '--jobs', type=int, default=None,
+                        help='With start, jobs run at once; the rest wait (default: CPU count)')
+    daemon.set_defaults(func=cmd_daemon)
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = parser.parse_args(argv)
+    if args.warm and args.command != 'daemon':
+        from render_tools.daemon import run_in_daemon
+        return run_in_daemon([arg for arg in argv if arg != '--warm'])
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""
+Render tooling for the scenes in this folder.
+
+Run through ``render.py``; see the README for the available modes.
+"""
@@ -0,0 +1,177 @@
+"""
+Act markers for scene scripts.
+
+Every scene in this folder splits its ``construct`` into acts with a comment
+banner, for example::
+
+    # ==========================
+    # SCENE 4B: Dockerfile Explanation Part 2 (40-50s)
+    # ==========================
+
+    # ==========================================
+    # ACT 1: THE PROBLEM - Manual Container Hell (0s - 50s)
+    # ==========================================
+
+This module reads those banners (no changes to the scene files needed) and
+maps a line of ``construct`` back to the act it belongs to. A scene without
+banners that splits itself with ``self.next_section(...)`` gets one act per
+section instead, starting at each call.
+"""
+
+import ast
+import bisect
+import inspect
+import re
+import sys
+import textwrap
+from dataclasses import dataclass
+from pathlib import Path
+
+# "SCENE 4B: Title (40-50s)", "ACT 2: Title (50s - 110s)", "ENDING: Title"
+MARKER_RE = re.compile(
+    r"^\s*#\s*(?P<label>(?:SCENE|ACT)\s+\w+|ENDING)\s*:\s*(?P<title>.*?)\s*$"
+)
+PLANNED_RE = re.compile(r"\((?P<start>\d+(?:\.\d+)?)s?\s*-\s*(?P<end>\d+(?:\.\d+)?)s\)")
+
+
+@dataclass
+class Act:
+    index: int
+    label: str          # "SCENE 4B", "ACT 2", "ENDING"
+    title: str          # text after the colon, planned times stripped
+    line: int           # absolute line number of the marker in the source file
+    planned_start: float = None
+    planned_end: float = None
+
+    @property
+    def key(self):
+        """Short id used on the command line: "4B", "2", "ENDING"."""
+        return self.label.split()[-1].upper()
+
+    def to_dict(self):
+        return {
+            "index": self.index,
+            "label": self.label,
+            "title": self.title,
+            "line": self.line,
+            "planned_start": self.planned_start,
+            "planned_end": self.planned_end,
+        }
+
+
+def parse_acts(lines, first_line=1):
+    """Find act markers in ``lines`` (line ``first_line`` is ``lines[0]``)."""
+    acts = []
+    for offset, text in enumerate(lines):
+        match = MARKER_RE.match(text)
+        if not match:
+            continue
+        title = match.group("title")
+        planned_start = planned_end = None
+        planned = PLANNED_RE.search(title)
+        if planned:
+            planned_start = float(planned.group("start"))
+            planned_end = float(planned.group("end"))
+            title = " ".join((title[:planned.start()] + title[planned.end():]).split())
+        acts.append(Act(
+            index=len(acts),
+            label=" ".join(match.group("label").split()),
+            title=title,
+            line=first_line + offset,
+            planned_start=planned_start,
+            planned_end=planned_end,
+        ))
+    return acts
+
+
+def parse_sections(lines, first_line=1):
+    """One act per ``self.next_section(...)`` call in the ``construct`` source ``lines``."""
+    tree = ast.parse(textwrap.dedent("".join(line if line.endswith("\n") else line + "\n" for line in lines)))
+    calls = sorted(
+        (node for node in ast.walk(tree)
+         if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+         and node.func.attr == "next_section"),
+        key=lambda node: node.lineno,
+    )
+    acts = []
+    for call in calls:
+        name = call.args[0] if call.args else next((kw.value for kw in call.keywords if kw.arg == "name"), None)
+        title = name.value if isinstance(name, ast.Constant) and isinstance(name.value, str) else ""
+        acts.append(Act(
+            index=len(acts),
+            label=f"SECTION {len(acts) + 1}",
+            title=title,
+            line=first_line + call.lineno - 1,
+        ))
+    return acts
+
+
+def find_acts(scene_class):
+    """Acts of an imported scene class, read from its ``construct`` source."""
+    lines, first_line = inspect.getsourcelines(scene_class.construct)
+    return parse_acts(lines, first_line) or parse_sections(lines, first_line)
+
+
+def find_acts_in_file(path, class_name):
+    """Acts of ``class_name`` in ``path`` without importing the module (and manim)."""
+    source = Path(path).read_text(encoding="utf-8")
+    construct = find_construct(ast.parse(source), class_name)
+    if construct is None:
+        return []
+    lines = source.splitlines()[construct.lineno - 1:construct.end_lineno]
+    return parse_acts(lines, construct.lineno) or parse_sections(lines, construct.lineno)
+
+
+def find_construct(tree, class_name):
+    """The ``construct`` FunctionDef node of ``class_name`` in a parsed module."""
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name == "construct":
+                    return item
+    return None
+
+
+def scene_names_in_file(path):
+    """Classes of ``path`` that define their own ``construct``, in source order (no import)."""
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    return [
+        node.name for node in tree.body
+        if isinstance(node, ast.ClassDef) and find_construct(tree, node.name) is not None
+    ]
+
+
+def act_at_line(acts, line):
+    """Index of the act containing ``line``. Code above the first marker counts as act 0."""
+    if not acts:
+        return 0
+    position = bisect.bisect_right([act.line for act in acts], line) - 1
+    return max(position, 0)
+
+
+def construct_line(scene):
+    """Line of ``scene.construct`` that is currently executing, or None.
+
+    Walks up the call stack from the caller, so a ``self.play`` made from a
+    helper such as ``play_outro`` resolves to the line in ``construct`` that
+    called the helper.
+    """
+    code = type(scene).construct.__code__
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code is code:
+            return frame.f_lineno
+        frame = frame.f_back
+    return None
+
+
+def select_act(acts, key):
+    """Resolve a command-line act id ("4B", "scene 4b", "ending" or a 0-based index)."""
+    wanted = " ".join(str(key).split()).upper()
+    for act in acts:
+        if wanted in (act.key, act.label.upper()):
+            return act
+    if wanted.isdigit() and int(wanted) < len(acts):
+        return acts[int(wanted)]
+    known = ", ".join(act.key for act in acts)
+    raise ValueError(f"Unknown act '{key}'. Known acts: {known}")
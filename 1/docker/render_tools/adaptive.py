@@ -0,0 +1,127 @@
+"""
+Adaptive per-animation frame rate.
+
+All scenes render at ``config.frame_rate = 60``, but a slow fade or a
+``FadeIn(..., shift=UP*0.2)`` looks the same rasterized at 30fps with the
+frames in between blended. Before each play the renderer picks a frame step:
+1 rasterizes every frame, 2 every other frame (30fps), and so on. The
+skipped frames are filled by blending the rasterized frames around them (or
+repeating the previous one), so the output still has one frame per 60fps
+tick and every timing stays the same.
+
+A play can declare its internal rate::
+
+    self.play(FadeIn(box), run_time=1, render_fps=30)
+
+(plain manim sets ``render_fps`` on the animations and ignores it).
+Otherwise the rate is estimated from the on-screen motion: for transforms
+(``FadeIn``/``FadeOut`` with a shift or scale, ``.animate``, ``Indicate``...)
+the peak speed in pixels per output frame follows from how far the points
+travel, the run time and the steepest part of the rate function. Animations
+without a known motion model (``Write``, ``Create``, ``Flash``...) and
+mobjects with updaters always get every frame.
+"""
+
+import numpy as np
+
+from manim.animation.animation import Wait
+from manim.animation.composition import AnimationGroup
+from manim.animation.transform import Transform
+
+_rate_slopes = {}
+
+
+def max_rate_slope(rate_func):
+    """Steepest slope of ``rate_func`` on [0, 1]."""
+    slope = _rate_slopes.get(rate_func)
+    if slope is None:
+        alphas = np.linspace(0, 1, 241)
+        values = np.array([rate_func(alpha) for alpha in alphas], dtype=float)
+        slope = float(np.abs(np.diff(values)).max() * (len(alphas) - 1))
+        _rate_slopes[rate_func] = slope
+    return slope
+
+
+def transform_distance(animation):
+    """Longest distance (scene units) any point of a begun Transform travels, or ``None``."""
+    starts = animation.starting_mobject.family_members_with_points()
+    targets = animation.target_copy.family_members_with_points()
+    if len(starts) != len(targets):
+        return None
+    distance = 0.0
+    for start, target in zip(starts, targets):
+        if start.points.shape != target.points.shape:
+            return None
+        if len(start.points):
+            distance = max(distance, float(np.linalg.norm(target.points - start.points, axis=1).max()))
+    arc = abs(animation.path_arc)
+    if arc > 1e-6:
+        # Points travel along an arc, not the chord between start and target
+        distance *= (arc / 2) / np.sin(min(arc, np.pi) / 2)
+    return distance
+
+
+def motion_speed(animation, pixels_per_unit, frame_rate):
+    """Peak on-screen speed of a begun animation in pixels per output frame, ``None`` if unknown."""
+    run_time = animation.run_time
+    if run_time <= 0:
+        return 0.0
+    if isinstance(animation, Wait):
+        return 0.0
+    if isinstance(animation, AnimationGroup):
+        if not animation.animations:
+            return 0.0
+        # The group's rate function and run time rescale the time of every animation in it
+        scale = max_rate_slope(animation.rate_func) * animation.max_end_time / run_time
+        speeds = [motion_speed(sub, pixels_per_unit, frame_rate) for sub in animation.animations]
+        if any(speed is None for speed in speeds):
+            return None
+        return max(speeds) * scale
+    if isinstance(animation, Transform):
+        distance = transform_distance(animation)
+        if distance is None:
+            return None
+        # Submobjects lagging behind each other each get a shorter share of the run time
+        count = len(animation.mobject.family_members_with_points())
+        lag = (count - 1) * animation.lag_ratio + 1 if count else 1
+        return distance * pixels_per_unit * max_rate_slope(animation.rate_func) * lag / (run_time * frame_rate)
+    return None
+
+
+def choose_frame_step(scene, camera, max_step=2, max_gap=4.0):
+    """Frame step for the current play of ``scene``.
+
+    ``max_gap`` is the most a point may move (pixels) between two
+    rasterized frames for blending to stand in for the frames in between.
+    """
+    frame_rate = camera.frame_rate
+    declared = [getattr(animation, "render_fps", None) for animation in scene.animations]
+    declared = [fps for fps in declared if fps]
+    if declared:
+        return max(1, int(round(frame_rate / min(declared))))
+    for mobject in scene.moving_mobjects:
+        if mobject.get_family_updaters():
+            return 1
+    pixels_per_unit = camera.pixel_height / camera.frame_height
+    speed = 0.0
+    for animation in scene.animations:
+        animation_speed = motion_speed(animation, pixels_per_unit, frame_rate)
+        if animation_speed is None:
+            return 1
+        speed = max(speed, animation_speed)
+    step = max_step
+    while step > 1 and speed * step > max_gap:
+        step -= 1
+    return step
+
+
+def blend_frames(first, second, count):
+    """``count`` frames evenly spaced between ``first`` and ``second`` (uint8 RGBA)."""
+    first = first.astype(np.uint16)
+    second = second.astype(np.uint16)
+    total = count + 1
+    frames = []
+    for index in range(1, total):
+        blended = (first * (total - index) + second * index + total // 2) // total
+        frames.append(blended.astype(np.uint8))
+    return frames
@@ -0,0 +1,206 @@
+"""
+Render every scene in the folder on one machine.
+
+``render.py batch`` finds the scenes with the AST (every class that defines
+its own ``construct``, so ``TikTokScene`` itself is skipped) and renders each
+one as a draft (the ``draft-540p30`` profile, see profiles.py) and as a final
+on a process pool. All drafts are queued before any final, so a palette
+change can be checked on every scene before the long renders start.
+
+A render is one rasterizing thread plus x264's encoder threads. The pool
+runs ``cpu_count // (1 + encoder_threads)`` jobs at once, and each job's
+libx264 streams are capped at ``encoder_threads``, so the machine is busy
+without the encoders of several jobs fighting over the same cores.
+
+Every job renders in a fresh process (the scene modules set ``config`` at
+import) into its own media folder, ``media/batch/<quality>/<file>.<Scene>``,
+so concurrent jobs never write the same text SVG or partial movie file. The
+folders are kept between runs and act as each job's cache. The timings of
+the last run are kept in ``media/batch/timings.json``; within drafts and
+within finals the slowest jobs start first. The table printed at the end is
+also written to ``media/batch/summary.json``.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from .acts import scene_names_in_file
+from .jobqueue import read_json, write_json
+
+# manim's logger. manim itself is imported by the functions that render, so planning a
+# batch doesn't load it
+logger = logging.getLogger("manim")
+
+# Quality -> render profile (profiles.py); None keeps the scene file's config
+QUALITIES = {
+    "draft": "draft-540p30",
+    "final": None,
+}
+
+
+@dataclass
+class BatchJob:
+    quality: str
+    scene_file: str
+    scene: str
+
+    @property
+    def name(self):
+        return f"{Path(self.scene_file).stem}.{self.scene}"
+
+    def media_dir(self, batch_dir):
+        return Path(batch_dir) / self.quality / self.name
+
+
+def discover_scenes(folder="."):
+    """(scene file, scene name) for every scene in the ``.py`` files of ``folder``."""
+    scenes = []
+    for path in sorted(Path(folder).glob("*.py")):
+        try:
+            names = scene_names_in_file(path)
+        except SyntaxError as error:
+            logger.warning(f"Skipping {path.name}: {error}")
+            continue
+        scenes.extend((str(path), name) for name in names)
+    return scenes
+
+
+def plan_pool(jobs=None, encoder_threads=None, cpus=None):
+    """(pool size, encoder threads per job) for this machine."""
+    cpus = cpus or os.cpu_count() or 1
+    if encoder_threads is None:
+        if jobs is None:
+            encoder_threads = 2
+        else:
+            # Share what the rasterizers leave over
+            encoder_threads = max(1, cpus // jobs - 1)
+    if jobs is None:
+        jobs = max(1, cpus // (1 + encoder_threads))
+    return jobs, encoder_threads
+
+
+def batch_jobs(scenes, qualities, timings=None):
+    """Jobs in start order: drafts first, then the slowest (by ``timings``) first."""
+    timings = timings or {}
+    ordered = []
+    for quality in QUALITIES:
+        if quality not in qualities:
+            continue
+        jobs = [BatchJob(quality, scene_file, scene) for scene_file, scene in scenes]
+        jobs.sort(key=lambda job: -timings.get(f"{quality}/{job.name}", 0.0))
+        ordered.extend(jobs)
+    return ordered
+
+
+def run_batch_job(job, batch_dir, encoder_threads, base_media_dir):
+    """Worker: render one job in this (fresh) process; returns its summary row."""
+    from manim import config
+
+    from .profiles import PROFILE_ENV
+    from .runner import load_scene, render_scene
+    from .store import MediaStore
+    from .tuning import load_profile
+
+    started = time.perf_counter()
+    # This process renders this one job
+    if QUALITIES[job.quality] is None:
+        os.environ.pop(PROFILE_ENV, None)
+    else:
+        os.environ[PROFILE_ENV] = QUALITIES[job.quality]
+    scene_class = load_scene(job.scene_file, job.scene)
+    # The tuned profile lives in the main media folder; it only applies at its own resolution
+    profile = load_profile(Path(base_media_dir) / "encoder_profile.json")
+    config.media_dir = str(job.media_dir(batch_dir))
+    config.progress_bar = "none"
+    store = MediaStore()
+    renderer = render_scene(
+        scene_class, store=store, encoder_profile=profile, encoder_threads=encoder_threads
+    )
+    return {
+        "movie_file": str(renderer.file_writer.movie_file_path),
+        "duration": round(renderer.time, 3),
+        "plays": renderer.num_plays,
+        "cached": store.hits["partial"],
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def render_batch(scenes, qualities=("draft", "final"), jobs=None, encoder_threads=None, publisher=None):
+    """Render ``scenes`` in every quality of ``qualities``.
+
+    Returns (one row per job in start order, wall seconds); both are also
+    written to ``media/batch/summary.json``.
+    """
+    from manim import config
+
+    started = time.perf_counter()
+    batch_dir = Path(config.media_dir) / "batch"
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    timings_path = batch_dir / "timings.json"
+    timings = read_json(timings_path) or {}
+    queue = batch_jobs(scenes, qualities, timings)
+    if not queue:
+        return [], 0.0
+    jobs, encoder_threads = plan_pool(jobs, encoder_threads)
+    jobs = min(jobs, len(queue))
+    logger.info(f"Rendering {len(queue)} jobs on {jobs} processes, {encoder_threads} encoder threads each")
+
+    rows = {}
+    # spawn: every job imports its scene module (and its config) fresh
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context, max_tasks_per_child=1) as pool:
+        # The pool starts jobs in submission order
+        futures = {
+            pool.submit(run_batch_job, job, str(batch_dir), encoder_threads, str(config.media_dir)): job
+            for job in queue
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            row = {"quality": job.quality, "scene_file": job.scene_file, "scene": job.scene}
+            try:
+                row.update(future.result(), status="ok")
+            except Exception:
+                error = traceback.format_exc(limit=3)
+                logger.error(f"{job.quality} {job.name} failed:\n{error}")
+                row.update(status="failed", error=error.strip().splitlines()[-1])
+                rows[job.name, job.quality] = row
+                continue
+            rows[job.name, job.quality] = row
+            timings[f"{job.quality}/{job.name}"] = row["seconds"]
+            logger.info(f"{job.quality} {job.name} done in {row['seconds']:.1f}s")
+            if publisher is not None and job.quality == "final":
+                publisher.submit(row["movie_file"])
+    write_json(timings_path, timings)
+    rows = [rows[job.name, job.quality] for job in queue]
+    wall_seconds = time.perf_counter() - started
+    write_json(batch_dir / "summary.json", {"wall_seconds": round(wall_seconds, 3), "jobs": rows})
+    return rows, wall_seconds
+
+
+def format_summary(rows, wall_seconds):
+    lines = [f"{'quality':<7} {'scene':<45} {'status':<6} {'seconds':>8} {'plays':>6} {'cached':>6} {'length':>7}"]
+    for row in rows:
+        name = f"{Path(row['scene_file']).stem}.{row['scene']}"
+        if row["status"] != "ok":
+            lines.append(f"{row['quality']:<7} {name:<45} {row['status']:<6} {row['error']}")
+            continue
+        lines.append(
+            f"{row['quality']:<7} {name:<45} {row['status']:<6} {row['seconds']:>8.1f} "
+            f"{row['plays']:>6} {row['cached']:>6} {row['duration']:>6.1f}s"
+        )
+    busy = sum(row.get("seconds", 0.0) for row in rows)
+    failed = sum(row["status"] != "ok" for row in rows)
+    lines.append(
+        f"{len(rows) - failed} of {len(rows)} jobs rendered in {wall_seconds:.1f}s "
+        f"({busy:.1f}s of render time, {busy / wall_seconds if wall_seconds else 0:.1f}x)"
+    )
+    for row in rows:
+        if row["status"] == "ok":
+            lines.append(f"  {row['movie_file']}")
+    return "\n".join(lines)
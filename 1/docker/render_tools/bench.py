@@ -0,0 +1,78 @@
+"""
+Benchmarks for the render tools, run on the real scenes.
+
+``bench_tiles`` rasterizes every frame with the serial camera and with the
+tiled one (tiles.py), times both and counts pixels that differ.
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from manim import config, logger
+from manim.utils.exceptions import EndSceneEarlyException
+
+from .renderer import ToolRenderer
+
+
+class TileBenchRenderer(ToolRenderer):
+    """Rasterizes every frame twice, serially and tiled, and compares them.
+
+    Nothing is encoded; the render stops after ``max_frames`` frames.
+    """
+
+    def __init__(self, tiles, max_frames=None, **kwargs):
+        super().__init__(tiles=tiles, **kwargs)
+        self.max_frames = max_frames
+        self.frames = 0
+        self.serial_seconds = 0.0
+        self.tiled_seconds = 0.0
+        self.mismatched_frames = 0
+        self.mismatched_pixels = 0
+
+    def render(self, scene, time, moving_mobjects=None):
+        if self.skip_animations:
+            return
+        if self.max_frames is not None and self.frames >= self.max_frames:
+            raise EndSceneEarlyException()
+        camera = self.camera
+        tiles = camera.tiles
+
+        camera.set_tiles(1)
+        started = perf_counter()
+        self.update_frame(scene, moving_mobjects)
+        self.serial_seconds += perf_counter() - started
+        serial = camera.pixel_array.copy()
+
+        camera.set_tiles(tiles)
+        started = perf_counter()
+        self.update_frame(scene, moving_mobjects)
+        self.tiled_seconds += perf_counter() - started
+
+        differing = np.any(camera.pixel_array != serial, axis=-1).sum()
+        if differing:
+            self.mismatched_frames += 1
+            self.mismatched_pixels += int(differing)
+        self.frames += 1
+
+    def summary(self):
+        speedup = self.serial_seconds / self.tiled_seconds if self.tiled_seconds else 0.0
+        return (
+            f"{self.frames} frames, {self.camera.tiles} tiles: "
+            f"serial {self.serial_seconds:.2f}s, tiled {self.tiled_seconds:.2f}s "
+            f"({speedup:.2f}x), {self.mismatched_frames} frames differ "
+            f"({self.mismatched_pixels} pixels)"
+        )
+
+
+def bench_tiles(scene_class, tiles, max_frames=None, **renderer_kwargs):
+    """Run ``scene_class`` through :class:`TileBenchRenderer` and return it."""
+    config.write_to_movie = False
+    config.save_last_frame = False
+    config.disable_caching = True
+    renderer_kwargs.setdefault("defer_audio", True)
+    renderer = TileBenchRenderer(tiles, max_frames=max_frames, **renderer_kwargs)
+    scene = scene_class(renderer=renderer)
+    scene.render()
+    logger.info(renderer.summary())
+    return renderer
@@ -0,0 +1,108 @@
+"""
+Crash-safe checkpoints for long renders.
+
+After every completed ``play``/``wait`` the renderer rewrites a manifest
+(atomically: temp file, fsync, rename) with, per play: the partial movie file,
+its animation hash and size, the act, and the cumulative scene time, plus the
+full list of sound cues so far.
+
+A resumed run checks that the manifest belongs to the same scene source,
+resolution, frame rate, render window and frame options (``--vfr``,
+``--adaptive-rate``), then replays ``construct`` without hashing or
+rasterizing for every play whose partial file is still intact, reusing
+those files as they are. Rendering starts again at the first missing
+or damaged segment.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from manim import config, logger
+
+
+def source_digest(scene_file):
+    return hashlib.sha256(Path(scene_file).read_bytes()).hexdigest()
+
+
+class Checkpoint:
+    def __init__(self, scene_file, scene_name, window=None, resume=False, variant=None):
+        self.scene_file = Path(scene_file)
+        self.scene_name = scene_name
+        self.path = Path(config.media_dir) / "checkpoints" / (
+            f"{self.scene_file.stem}.{scene_name}.{config.pixel_height}p{config.frame_rate:g}.json"
+        )
+        self.header = {
+            "scene_file": self.scene_file.name,
+            "scene": scene_name,
+            "source_sha256": source_digest(self.scene_file),
+            "pixel_width": config.pixel_width,
+            "pixel_height": config.pixel_height,
+            "frame_rate": config.frame_rate,
+            "movie_file_extension": config.movie_file_extension,
+            "window": window or {},
+            "variant": variant,
+        }
+        self.plays = []
+        self.resumable = []
+        if resume:
+            self.resumable = self.load_resumable()
+
+    # --- Resume ---
+    def load_resumable(self):
+        """Play entries of a previous run that can be reused, up to the first missing segment."""
+        if not self.path.exists():
+            logger.info(f"No checkpoint at {self.path}, rendering from the start")
+            return []
+        manifest = json.loads(self.path.read_text(encoding="utf-8"))
+        for key, value in self.header.items():
+            if manifest.get(key) != value:
+                logger.warning(f"Checkpoint {self.path} is stale ({key} changed), rendering from the start")
+                return []
+        plays = []
+        for entry in manifest["plays"]:
+            partial = entry["partial_movie_file"]
+            if partial is not None:
+                partial_path = Path(partial)
+                if not partial_path.exists() or partial_path.stat().st_size != entry["size"]:
+                    break
+            plays.append(entry)
+        logger.info(
+            f"Resuming {self.scene_name}: {len(plays)} of {len(manifest['plays'])} "
+            f"checkpointed animations reusable"
+        )
+        return plays
+
+    def resumed_entry(self, play_index):
+        if play_index < len(self.resumable):
+            return self.resumable[play_index]
+        return None
+
+    # --- Recording ---
+    def record(self, renderer):
+        """Called after every completed play."""
+        files = renderer.file_writer.partial_movie_files
+        partial = files[-1] if len(files) == renderer.num_plays else None
+        self.plays.append({
+            "index": renderer.num_plays - 1,
+            "act": renderer.current_act,
+            "hash": renderer.animations_hashes[-1],
+            "partial_movie_file": partial,
+            "size": Path(partial).stat().st_size if partial else None,
+            "time": round(renderer.time, 6),
+        })
+        self.write(renderer, complete=False)
+
+    def write(self, renderer, complete):
+        manifest = dict(self.header)
+        manifest["complete"] = complete
+        manifest["plays"] = self.plays
+        manifest["sound_cues"] = [cue.to_dict() for cue in renderer.file_writer.sound_cues]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as fp:
+            json.dump(manifest, fp, indent=1)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp_path, self.path)
@@ -0,0 +1,234 @@
+"""
+Render scenes on several machines through a shared-directory job queue.
+
+``render.py farm submit QUEUE FILE [SCENE...]`` splits each scene into one
+job per act (the same per-act renders as ``--parallel-acts``), or one job
+for the whole scene when it has no act markers or ``--per-scene`` is given.
+``render.py farm worker QUEUE`` runs on every node: it claims jobs (see
+jobqueue.py), renders each one in a fresh process with the queue's
+``media`` folder as the media directory, and reports the act manifest
+as the job's result. ``render.py farm assemble QUEUE`` stitches each scene
+once all its jobs are done, in act order, into ``QUEUE/output``.
+
+The nodes only share the queue directory, and paths in results are relative
+to it, so the mount point may differ from node to node. Every node needs its
+own checkout of the scene files; a job records the scene source's sha256,
+and a node with a different version of the file refuses the job.
+"""
+
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from manim import config, logger
+
+from .acts import find_acts_in_file, scene_names_in_file
+from .checkpoint import source_digest
+from .jobqueue import Heartbeat, read_json, worker_name, write_json
+
+
+def job_id(order, scene_name, act_index):
+    part = "scene" if act_index is None else f"act{act_index:02d}"
+    return f"{order:04d}-{scene_name}-{part}"
+
+
+def submit_renders(queue, scene_file, scene_names=None, per_scene=False):
+    """Queue the jobs for ``scene_names`` (default: every scene in the file). Returns the new job ids."""
+    scene_file = Path(scene_file)
+    scene_names = scene_names or scene_names_in_file(scene_file)
+    digest = source_digest(scene_file)
+    submitted = []
+    for scene_name in scene_names:
+        acts = [] if per_scene else find_acts_in_file(scene_file, scene_name)
+        parts = list(range(len(acts))) or [None]
+        # A scene's jobs need consecutive orders (see scene_jobs), reserved at once against other submitters
+        order = queue.reserve(len(parts))
+        for part, act_index in enumerate(parts):
+            identifier = job_id(order, scene_name, act_index)
+            order += 1
+            job = {
+                "scene_file": scene_file.name,
+                "scene": scene_name,
+                "source_sha256": digest,
+                "act": act_index,
+                "part": part,
+                "parts": len(parts),
+            }
+            if queue.submit(identifier, job):
+                submitted.append(identifier)
+    return submitted
+
+
+def run_job(queue_root, job):
+    """Render one job in this (fresh) process; returns its result with queue-relative paths."""
+    from .parallel import render_act
+
+    queue_root = Path(queue_root).resolve()
+    scene_file = Path(job["scene_file"])
+    if not scene_file.exists():
+        raise FileNotFoundError(f"{scene_file} is not in {Path.cwd()}; run the worker from the scene folder")
+    if source_digest(scene_file) != job["source_sha256"]:
+        raise RuntimeError(f"{scene_file} differs from the submitted version; update this node's checkout")
+    config.media_dir = str(queue_root / "media")
+    manifest_dir = queue_root / "media" / "acts" / job["id"]
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_json(render_act(str(scene_file), job["scene"], job["act"], manifest_dir))
+
+    def relative(path):
+        return Path(path).resolve().relative_to(queue_root).as_posix()
+
+    scene_dir = scene_file.resolve().parent
+    manifest["partial_movie_files"] = [relative(path) for path in manifest["partial_movie_files"]]
+    manifest["movie_file"] = relative(manifest["movie_file"])
+    for cue in manifest["sound_cues"]:
+        # Sounds live next to the scene file, wherever the checkout is
+        path = Path(cue["path"]).resolve()
+        if path.is_relative_to(scene_dir):
+            cue["path"] = path.relative_to(scene_dir).as_posix()
+    manifest["node"] = worker_name()
+    return manifest
+
+
+def run_worker(queue, slots=1, wait_for_jobs=False, poll_seconds=5.0):
+    """Claim and render jobs until the queue is empty (or forever with ``wait_for_jobs``)."""
+    worker = worker_name()
+    heartbeat = Heartbeat(queue, worker, interval=max(1.0, queue.lease_seconds / 4))
+    running = {}
+    finished = 0
+    # spawn: every job imports its scene module (and its config) fresh
+    context = multiprocessing.get_context("spawn")
+    logger.info(f"Worker {worker} taking up to {slots} jobs from {queue.root}")
+    try:
+        with ProcessPoolExecutor(max_workers=slots, mp_context=context, max_tasks_per_child=1) as pool:
+            while True:
+                queue.reap()
+                while len(running) < slots:
+                    lease = queue.claim(worker)
+                    if lease is None:
+                        break
+                    job = queue.job(lease["id"])
+                    logger.info(f"Rendering {lease['id']} (attempt {lease['attempt'] + 1})")
+                    running[pool.submit(run_job, str(queue.root), job)] = lease
+                if not running:
+                    if not wait_for_jobs and not queue.ids("pending"):
+                        break
+                    time.sleep(poll_seconds)
+                    continue
+                done, _ = wait(running, timeout=poll_seconds, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lease = running.pop(future)
+                    try:
+                        finished += report_job(queue, lease, future)
+                    except OSError as error:
+                        # The shared folder hiccuped; the lease runs out and another node retries the job
+                        logger.error(f"Couldn't record the outcome of {lease['id']}: {error}")
+    finally:
+        heartbeat.stop()
+    return finished
+
+
+def report_job(queue, lease, future):
+    """Record a finished job's result, or its error for another attempt. Returns 1 if it is done."""
+    try:
+        result = future.result()
+    except Exception:
+        error = traceback.format_exc(limit=3)
+        logger.error(f"{lease['id']} failed:\n{error}")
+        queue.fail(lease, error)
+        return 0
+    if not queue.complete(lease, result):
+        logger.warning(f"{lease['id']} finished after its lease expired; result dropped")
+        return 0
+    logger.info(f"{lease['id']} done in {result['render_seconds']:.1f}s")
+    return 1
+
+
+def scene_jobs(queue):
+    """Jobs grouped by (submission, scene): {key: [job, ...]} in part order."""
+    groups = {}
+    for name in sorted(os.listdir(queue.root / "jobs")):
+        if name.startswith("."):
+            continue
+        job = read_json(queue.root / "jobs" / name)
+        if job is None:
+            continue
+        first = int(job["id"].split("-", 1)[0]) - job["part"]
+        groups.setdefault((first, job["scene"]), []).append(job)
+    return {key: sorted(jobs, key=lambda job: job["part"]) for key, jobs in groups.items()}
+
+
+def assemble_ready(queue, scene_dir="."):
+    """Stitch every scene whose jobs are all done and that isn't assembled yet.
+
+    Returns (assembled output paths, scenes with a failed job).
+    """
+    from .parallel import stitch_acts
+
+    output_dir = queue.root / "output"
+    output_dir.mkdir(exist_ok=True)
+    assembled = []
+    failed = []
+    for (first, scene_name), jobs in scene_jobs(queue).items():
+        marker = output_dir / f".{first:04d}-{scene_name}.json"
+        if marker.exists():
+            continue
+        if any(queue.path("failed", job["id"]).exists() for job in jobs):
+            failed.append(scene_name)
+            continue
+        if not all(queue.path("done", job["id"]).exists() for job in jobs) or len(jobs) != jobs[0]["parts"]:
+            continue
+        manifests = []
+        for job in jobs:
+            manifest = queue.result(job["id"])
+            manifest["partial_movie_files"] = [str(queue.root / path) for path in manifest["partial_movie_files"]]
+            for cue in manifest["sound_cues"]:
+                cue["path"] = str(Path(scene_dir) / cue["path"])
+            manifests.append(manifest)
+        output = output_dir / f"{scene_name}{config.movie_file_extension}"
+        started = time.perf_counter()
+        stitch_acts(manifests, output)
+        write_json(marker, {
+            "scene": scene_name,
+            "output": output.name,
+            "jobs": [job["id"] for job in jobs],
+            "nodes": sorted({manifest.get("node", "?") for manifest in manifests}),
+            "render_seconds": round(sum(manifest["render_seconds"] for manifest in manifests), 3),
+        })
+        logger.info(f"Assembled {output} from {len(jobs)} jobs in {time.perf_counter() - started:.1f}s")
+        assembled.append(output)
+    return assembled, failed
+
+
+def assemble(queue, wait_for_jobs=False, poll_seconds=5.0, scene_dir="."):
+    """Assemble finished scenes; with ``wait_for_jobs``, until no job is pending or running."""
+    outputs = []
+    while True:
+        queue.reap()
+        assembled, failed = assemble_ready(queue, scene_dir)
+        outputs.extend(assembled)
+        counts = queue.counts()
+        if not wait_for_jobs or counts["pending"] + counts["running"] == 0:
+            if wait_for_jobs:
+                # Jobs that finished between the last two checks
+                assembled, failed = assemble_ready(queue, scene_dir)
+                outputs.extend(assembled)
+            return outputs, failed
+        time.sleep(poll_seconds)
+
+
+def queue_status(queue):
+    """(counts per state, [(job id, state, attempt, node)])."""
+    rows = []
+    for state in ("running", "pending", "failed", "done"):
+        for identifier in queue.ids(state):
+            info = read_json(queue.path(state, identifier)) or {}
+            rows.append((identifier, state, info.get("attempt", 0), info.get("worker", "")))
+    return queue.counts(), sorted(rows)
+
+
+def job_errors(queue, identifier):
+    return (read_json(queue.path("failed", identifier)) or {}).get("errors", [])
+
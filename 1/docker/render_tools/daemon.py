@@ -0,0 +1,303 @@
+"""
+A warm render process that forks a child for every job.
+
+``render.py daemon start`` imports manim, numpy, scipy, PyAV, pydub and the
+render tools once, and warms Pango and fontconfig by laying out a ``Text``
+in the fonts the scenes use. It then listens on a Unix socket
+(``media/render-daemon.sock``). ``render.py --warm <command> ...`` sends its
+command line there instead of running it, and the daemon forks. The child
+starts from the warm, copy-on-write parent with nothing to import but the
+scene file itself. It runs the command in the client's folder, with its
+output going straight to the client.
+
+Every scene file sets ``config`` when it is imported, so two scenes can't
+share a process. Here each job's scene import and ``config`` changes happen
+in its own child and die with it: the parent never imports a scene, and
+every job starts from the same untouched ``config``.
+
+This module doesn't import manim at module level: a ``--warm`` client only
+needs the socket, and that is what makes it start fast.
+
+The daemon is single-threaded (forking a process with threads running is
+asking for deadlocks): one ``select`` loop accepts jobs, notices clients
+that went away (their job is terminated), and reaps finished children.
+"""
+
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# manim's logger, configured once the daemon has imported manim
+logger = logging.getLogger("manim")
+
+# Sent before the exit status, after the job's output
+TRAILER = b"\0"
+# The default font and the one the code panels use
+FONTS = ["", "Monospace"]
+# The environment a job takes from its client, in full: unset in the client means unset in the job
+ENV_PREFIXES = ("RENDER_", "MANIM_")
+
+
+def socket_path(media_dir="media"):
+    """The socket in ``media_dir`` (manim's default media folder, relative to the scene folder)."""
+    return Path(media_dir).resolve() / "render-daemon.sock"
+
+
+def warm_up():
+    """Import what every job needs and initialize the font stack. Returns the seconds it took."""
+    started = time.perf_counter()
+    import av  # noqa: F401
+    import manimpango
+    import numpy  # noqa: F401
+    import pydub  # noqa: F401
+    import scipy.special  # noqa: F401
+    from manim import Text
+
+    from . import checkpoint, encode, file_writer, hashing, renderer, runner, store  # noqa: F401
+
+    manimpango.list_fonts()
+    for font in FONTS:
+        # Pango layout and fontconfig matching; the SVG lands in the text cache
+        Text("Warm up 0123", font=font)
+    return time.perf_counter() - started
+
+
+def read_request(conn, timeout=5.0):
+    conn.settimeout(timeout)
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    conn.settimeout(None)
+    if not data:
+        # daemon_running() checking on us
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+class RenderDaemon:
+    """Accepts jobs on ``path`` and runs ``handler(argv)`` for each in a forked child."""
+
+    def __init__(self, path, handler, max_jobs=None):
+        self.path = Path(path)
+        self.handler = handler
+        self.max_jobs = max_jobs or os.cpu_count() or 1
+        self.jobs = {}          # pid -> (connection, argv, start time)
+        self.waiting = []       # (connection, request) over max_jobs
+        self.terminated = set()
+        self.stopping = False
+
+    def serve(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            if daemon_running(self.path):
+                raise RuntimeError(f"A render daemon is already listening on {self.path}")
+            self.path.unlink()
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(str(self.path))
+        self.listener.listen()
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, "stopping", True))
+        # A finished job wakes the select loop up, so its client gets the exit status right away
+        self.wakeup, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_write, False)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        signal.set_wakeup_fd(wakeup_write)
+        logger.info(f"Render daemon {os.getpid()} listening on {self.path}, up to {self.max_jobs} jobs at once")
+        try:
+            while not self.stopping or self.jobs:
+                connections = [conn for conn, _, _ in self.jobs.values()]
+                readable, _, _ = select.select([self.listener, self.wakeup, *connections], [], [], 0.5)
+                for ready in readable:
+                    if ready == self.wakeup:
+                        os.read(self.wakeup, 512)
+                    elif ready is self.listener:
+                        self.accept()
+                    else:
+                        self.client_input(ready)
+                self.reap()
+                while self.waiting and len(self.jobs) < self.max_jobs:
+                    self.start(*self.waiting.pop(0))
+        finally:
+            self.listener.close()
+            self.path.unlink(missing_ok=True)
+
+    def accept(self):
+        conn, _ = self.listener.accept()
+        try:
+            request = read_request(conn)
+        except (OSError, ValueError) as error:
+            logger.warning(f"Bad request: {error}")
+            conn.close()
+            return
+        if request is None:
+            conn.close()
+        elif request.get("command") == "stop":
+            self.stopping = True
+            self.reply(conn, {"stopping": True, "jobs": len(self.jobs)})
+        elif request.get("command") == "status":
+            now = time.time()
+            self.reply(conn, {
+                "pid": os.getpid(),
+                "jobs": [
+                    {"pid": pid, "argv": argv, "seconds": round(now - started, 1)}
+                    for pid, (_, argv, started) in self.jobs.items()
+                ],
+                "waiting": len(self.waiting),
+            })
+        elif self.stopping:
+            self.reply(conn, {"exit": 75, "error": "the daemon is stopping"})
+        elif len(self.jobs) < self.max_jobs:
+            self.start(conn, request)
+        else:
+            self.waiting.append((conn, request))
+
+    def reply(self, conn, message):
+        try:
+            conn.sendall(TRAILER + json.dumps(message).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+        conn.close()
+
+    def start(self, conn, request):
+        argv = request["argv"]
+        pid = os.fork()
+        if pid == 0:
+            self.run_child(conn, request)
+        self.jobs[pid] = (conn, argv, time.time())
+        logger.info(f"Job {pid}: {' '.join(argv)}")
+
+    def run_child(self, conn, request):
+        """In the forked child: run the job with its output on the client connection. Never returns."""
+        code = 1
+        try:
+            self.listener.close()
+            for other, _, _ in self.jobs.values():
+                other.close()
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            os.chdir(request["cwd"])
+            env = request.get("env", {})
+            for key in [key for key in os.environ if key.startswith(ENV_PREFIXES) and key not in env]:
+                del os.environ[key]
+            os.environ.update(env)
+            # Settings the client's folder would have given a fresh manim process
+            if Path("manim.cfg").exists():
+                from manim import config
+                config.digest_file("manim.cfg")
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(conn.fileno(), 1)
+            os.dup2(conn.fileno(), 2)
+            sys.stdout.reconfigure(line_buffering=True)
+            code = self.handler(request["argv"]) or 0
+        except SystemExit as error:
+            code = error.code if isinstance(error.code, int) else (0 if error.code is None else 1)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(code)
+
+    def client_input(self, conn):
+        """A client only ever talks first, so anything here means it hung up: stop its job."""
+        for pid, (job_conn, _, _) in self.jobs.items():
+            if job_conn is conn and pid not in self.terminated:
+                try:
+                    if conn.recv(1, socket.MSG_PEEK):
+                        return
+                except OSError:
+                    pass
+                logger.info(f"Job {pid}: client went away, terminating")
+                self.terminated.add(pid)
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+                return
+
+    def reap(self):
+        while self.jobs:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            conn, argv, started = self.jobs.pop(pid)
+            self.terminated.discard(pid)
+            code = os.waitstatus_to_exitcode(status)
+            logger.info(f"Job {pid} exited with {code} after {time.time() - started:.1f}s")
+            self.reply(conn, {"exit": code})
+
+
+# --- Client ---
+def connect(path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(path))
+    return client
+
+
+def daemon_running(path):
+    try:
+        connect(path).close()
+        return True
+    except OSError:
+        return False
+
+
+def send(path, request, output=None):
+    """Send ``request`` and copy what comes back to ``output`` until the trailer; returns the trailer."""
+    output = output or sys.stdout.buffer
+    client = connect(path)
+    try:
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        received = b""
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                raise ConnectionError("The render daemon closed the connection without an exit status")
+            received += chunk
+            marker = received.find(TRAILER)
+            if marker < 0:
+                output.write(received)
+                output.flush()
+                received = b""
+                continue
+            output.write(received[:marker])
+            output.flush()
+            trailer = received[marker + 1:]
+            while not trailer.endswith(b"\n"):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                trailer += chunk
+            return json.loads(trailer.decode("utf-8"))
+    finally:
+        client.close()
+
+
+def run_in_daemon(argv, path=None):
+    """Run the ``render.py`` command line ``argv`` in the daemon; returns its exit status."""
+    path = path or socket_path()
+    if not daemon_running(path):
+        print(f"No render daemon at {path}; start it with `render.py daemon start`", file=sys.stderr)
+        return 2
+    # Only what a job may reasonably depend on; the daemon's own environment is the base
+    env = {key: value for key, value in os.environ.items() if key.startswith(ENV_PREFIXES)}
+    reply = send(path, {"argv": list(argv), "cwd": os.getcwd(), "env": env})
+    if "error" in reply:
+        print(f"Render daemon: {reply['error']}", file=sys.stderr)
+    return reply["exit"]
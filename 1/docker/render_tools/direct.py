@@ -0,0 +1,65 @@
+"""
+Direct-to-final encoding: one encoder for the whole scene.
+
+The default writer opens an encoder per ``play``/``wait`` (the outro shake
+alone is nine 0.08s partial files), then concatenates them all and muxes
+audio. For final renders where the cache doesn't matter, this writer
+streams every frame into a single long-lived encoder writing the final
+movie and muxes the mixed sound cues once at the end. No partial movie
+files, no concat pass.
+"""
+
+from manim import logger
+from manim.utils.file_ops import write_to_movie
+
+from .encode import mix_cues, mux_audio
+from .file_writer import ToolFileWriter
+
+
+class DirectFileWriter(ToolFileWriter):
+    def __init__(self, renderer, scene_name, **kwargs):
+        self.stream_open = False
+        self.mixed = None
+        super().__init__(renderer, scene_name, **kwargs)
+
+    def add_partial_movie_file(self, hash_animation):
+        # Keep indices aligned with num_plays, but nothing is ever written per play
+        self.partial_movie_files.append(None)
+        self.sections[-1].partial_movie_files.append(None)
+
+    def is_already_cached(self, hash_invocation):
+        return False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        if write_to_movie() and allow_write and not self.stream_open:
+            self.open_partial_movie_stream(file_path=self.movie_file_path)
+            self.stream_open = True
+
+    def end_animation(self, allow_write=False):
+        # The stream stays open across plays
+        pass
+
+    def finish(self):
+        if not self.stream_open:
+            logger.info("No animations are contained in this scene.")
+            return
+        self.close_partial_movie_stream()
+        self.stream_open = False
+
+        track = self.mixed_track()
+        if track is not None:
+            mux_audio(self.movie_file_path, track)
+        if self.subcaptions:
+            self.write_subcaption_file()
+        self.print_file_ready_message(str(self.movie_file_path))
+
+    def mixed_track(self):
+        """The sound cues inside the render window as one track, or ``None`` without cues."""
+        if self.mixed is None:
+            cues = [cue for cue in self.sound_cues if self.renderer.cue_in_window(cue)]
+            if not cues:
+                return None
+            offset = self.renderer.window_offset()
+            self.mixed = mix_cues(cues, offset=offset, duration=self.renderer.time - offset,
+                                   store=self.renderer.store)
+        return self.mixed
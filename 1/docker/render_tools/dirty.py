@@ -0,0 +1,209 @@
+"""
+Dirty-rectangle incremental rendering.
+
+manim already draws the static mobjects of a play once (the static image),
+but every frame it still copies that whole image back and redraws every
+moving mobject. During the Dockerfile typing only the new line and the
+cursor change from one frame to the next.
+
+:class:`DirtyRectCamera` remembers what each drawn mobject looked like in the
+previous frame (a hash of its points, colors and stroke). For the next frame
+it takes the union of the old and new bounding boxes of everything that
+changed, appeared or disappeared, restores just that rectangle from the
+background and redraws the mobjects that reach into it, clipped to it. The
+rest of the previous frame is kept as it is.
+
+Inside the rectangle each pixel is computed exactly as the serial camera
+computes it (same transform, pixel-aligned clip); outside it nothing changed.
+A new static image, a change in drawing order or a rectangle covering most
+of the frame falls back to a full redraw.
+"""
+
+import itertools as it
+
+import cairo
+import numpy as np
+
+from manim.mobject.mobject import Mobject
+from manim.mobject.types.image_mobject import AbstractImageMobject
+from manim.mobject.types.vectorized_mobject import VMobject
+
+from .pipeline import PooledCamera
+from .tiles import pixel_bounds
+
+# Redraw the whole frame when the dirty rectangle covers more than this
+FULL_REDRAW_FRACTION = 0.6
+
+
+def appearance_key(mobject):
+    """Hash of everything the camera uses to draw ``mobject``; ``None`` if unknown (always redrawn)."""
+    if isinstance(mobject, VMobject):
+        arrays = (
+            mobject.points,
+            mobject.get_fill_rgbas(),
+            mobject.get_stroke_rgbas(),
+            mobject.get_stroke_rgbas(background=True),
+            np.asarray(mobject.sheen_direction, dtype=float),
+        )
+        extra = (
+            mobject.get_stroke_width(),
+            mobject.get_stroke_width(background=True),
+            mobject.sheen_factor,
+            mobject.joint_type,
+            mobject.cap_style,
+            mobject.get_background_image(),
+        )
+    elif isinstance(mobject, AbstractImageMobject):
+        arrays = (mobject.points, mobject.get_pixel_array())
+        extra = ()
+    else:
+        return None
+    return hash((tuple(np.ascontiguousarray(array).tobytes() for array in arrays), extra))
+
+
+def union_box(boxes):
+    lefts, tops, rights, bottoms = zip(*boxes)
+    return min(lefts), min(tops), max(rights), max(bottoms)
+
+
+class DirtyRectCamera(PooledCamera):
+    """Camera that redraws only the part of the frame that changed since the last frame.
+
+    Only :meth:`capture_dirty` draws incrementally; any other capture
+    invalidates what it remembers about the pixel array.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.drawn = None
+        self.drawn_order = []
+        self.drawn_base = None
+        self.clip_contexts = {}
+        # Stats
+        self.frames = 0
+        self.full_frames = 0
+        self.unchanged_frames = 0
+        self.dirty_pixels = 0
+        super().__init__(*args, **kwargs)
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        self.drawn = None
+        super().capture_mobjects(mobjects, **kwargs)
+
+    def capture_dirty(self, background, mobjects):
+        """Bring the pixel array to ``background`` with ``mobjects`` drawn on top."""
+        family = self.get_mobjects_to_display(mobjects)
+        current = {}
+        for mobject in family:
+            current[id(mobject)] = (appearance_key(mobject), pixel_bounds(self, mobject))
+        previous = self.drawn
+        self.frames += 1
+
+        box = None
+        if previous is not None and background is self.drawn_base:
+            box = self.changed_box(previous, current, family)
+        if box is None:
+            self.full_frames += 1
+            self.set_pixel_array(background)
+            super().capture_mobjects(mobjects)
+        elif box is not False:
+            self.redraw_box(background, family, current, box)
+        else:
+            self.unchanged_frames += 1
+        self.drawn = current
+        self.drawn_order = [id(mobject) for mobject in family]
+        self.drawn_base = background
+
+    def changed_box(self, previous, current, family):
+        """Pixel box to redraw, ``False`` if nothing changed, ``None`` for a full redraw."""
+        order = [id(mobject) for mobject in family if id(mobject) in previous]
+        if order != [key for key in self.drawn_order if key in current]:
+            return None
+        boxes = []
+        for key in previous.keys() | current.keys():
+            before = previous.get(key)
+            after = current.get(key)
+            if before is not None and after is not None and before[0] is not None and before[0] == after[0]:
+                continue
+            for state in (before, after):
+                if state is not None and state[1] is not None:
+                    boxes.append(state[1])
+        if not boxes:
+            return False
+        left, top, right, bottom = union_box(boxes)
+        left, top = max(left, 0), max(top, 0)
+        right, bottom = min(right, self.pixel_width), min(bottom, self.pixel_height)
+        if right <= left or bottom <= top:
+            return False
+        if (right - left) * (bottom - top) > FULL_REDRAW_FRACTION * self.pixel_width * self.pixel_height:
+            return None
+        return left, top, right, bottom
+
+    def redraw_box(self, background, family, current, box):
+        left, top, right, bottom = box
+        self.dirty_pixels += (right - left) * (bottom - top)
+        region = (slice(top, bottom), slice(left, right))
+        self.pixel_array[region] = background[region]
+        touching = [
+            mobject for mobject in family
+            if current[id(mobject)][1] is not None and self.overlaps(current[id(mobject)][1], box)
+        ]
+        for group_type, group in it.groupby(touching, self.type_or_raise):
+            group = list(group)
+            if group_type is Mobject:
+                continue
+            if group_type is VMobject:
+                for image, batch in it.groupby(group, lambda vm: vm.get_background_image()):
+                    if image:
+                        self.redraw_on_copy(self.display_multiple_background_colored_vmobjects, list(batch), region)
+                    else:
+                        ctx = self.get_clip_context(self.pixel_array, box)
+                        for vmobject in batch:
+                            self.display_vectorized(vmobject, ctx)
+            else:
+                self.redraw_on_copy(self.display_funcs[group_type], group, region)
+
+    def redraw_on_copy(self, display, mobjects, region):
+        """Draw with one of manim's whole-frame display functions, keeping only ``region``."""
+        scratch = self.pixel_array.copy()
+        display(mobjects, scratch)
+        self.pixel_array[region] = scratch[region]
+
+    @staticmethod
+    def overlaps(bounds, box):
+        return bounds[0] < box[2] and bounds[2] > box[0] and bounds[1] < box[3] and bounds[3] > box[1]
+
+    def get_clip_context(self, pixel_array, box):
+        """A cairo context on ``pixel_array`` with the camera's transform, clipped to ``box``."""
+        key = id(pixel_array)
+        ctx = self.clip_contexts.get(key)
+        if ctx is None:
+            surface = cairo.ImageSurface.create_for_data(
+                pixel_array.data, cairo.FORMAT_ARGB32, self.pixel_width, self.pixel_height
+            )
+            ctx = cairo.Context(surface)
+            self.clip_contexts[key] = ctx
+        pw, ph = self.pixel_width, self.pixel_height
+        fw, fh = self.frame_width, self.frame_height
+        fc = self.frame_center
+        left, top, right, bottom = box
+        ctx.identity_matrix()
+        ctx.reset_clip()
+        ctx.rectangle(left, top, right - left, bottom - top)
+        ctx.clip()
+        # Same matrix as Camera.get_cairo_context
+        ctx.set_matrix(cairo.Matrix(
+            (pw / fw), 0, 0, -(ph / fh),
+            (pw / 2) - fc[0] * (pw / fw),
+            (ph / 2) + fc[1] * (ph / fh),
+        ))
+        return ctx
+
+    def summary(self):
+        incremental = self.frames - self.full_frames - self.unchanged_frames
+        average = self.dirty_pixels / incremental if incremental else 0
+        frame = self.pixel_width * self.pixel_height
+        return (
+            f"Dirty rectangles: {self.frames} frames, {self.full_frames} full redraws, "
+            f"{self.unchanged_frames} unchanged, {incremental} partial "
+            f"(avg {100 * average / frame:.1f}% of the frame)"
+        )
@@ -0,0 +1,109 @@
+"""
+Dry runs: ``construct`` without rasterizing, hashing, encoding or mixing.
+
+:class:`DryRunRenderer` treats every play the way a render window treats
+the plays outside it: ``construct`` runs for real, so every mobject is built
+and every updater runs, and the scene time advances by exactly the frames a
+render would write. But nothing is drawn, hashed, encoded or mixed, and no
+file is written (manim's ``dry_run``). Sound cues are still recorded, at their
+scene time.
+
+The renderer records every play and wait, and at the end of every act the
+mobjects left in the scene that draw nothing (see :func:`invisible`).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from manim import config
+from manim.mobject.types.image_mobject import AbstractImageMobject
+from manim.mobject.types.vectorized_mobject import VMobject
+
+from .acts import construct_line
+from .memory import mobject_label
+from .profiler import describe
+from .profiles import max_opacity
+from .renderer import ToolRenderer
+
+
+@dataclass
+class PlayEntry:
+    index: int
+    act: int
+    kind: str           # "play" or "wait"
+    animations: str
+    start: float        # scene time
+    end: float
+    line: int           # line of construct, None if unknown
+
+
+def invisible(mobject):
+    """True if nothing in ``mobject``'s family would draw a pixel."""
+    for member in mobject.get_family():
+        if isinstance(member, VMobject):
+            if len(member.points) and max_opacity(member) > 0:
+                return False
+        elif isinstance(member, AbstractImageMobject):
+            if np.any(member.get_pixel_array()[:, :, 3]):
+                return False
+        elif len(member.points):
+            return False
+    return True
+
+
+class DryRunRenderer(ToolRenderer):
+    def __init__(self, **kwargs):
+        config.dry_run = True
+        # A skipped play still gets a one-step progress bar
+        config.progress_bar = "none"
+        # Cues are recorded by the file writer, never mixed
+        kwargs.setdefault("defer_audio", True)
+        kwargs.setdefault("encoder_profile", None)
+        super().__init__(**kwargs)
+        self.entries = []
+        self.invisible = {}     # act -> labels of the invisible mobjects in the scene when it ended
+
+    def update_skipping_status(self):
+        super().update_skipping_status()
+        self.skip_animations = True
+
+    def play(self, scene, *args, **kwargs):
+        act = self.locate_act()
+        if act != self.current_act:
+            self.end_act(self.current_act)
+        start = self.time
+        line = construct_line(scene)
+        super().play(scene, *args, **kwargs)
+        animations = scene.animations or []
+        kind = "wait" if len(animations) == 1 and type(animations[0]).__name__ == "Wait" else "play"
+        self.entries.append(PlayEntry(
+            index=len(self.entries),
+            act=self.current_act,
+            kind=kind,
+            animations=describe(animations),
+            start=round(start, 6),
+            end=round(self.time, 6),
+            line=line,
+        ))
+
+    def end_act(self, act):
+        self.invisible[act] = [
+            mobject_label(mobject) for mobject in self.scene.mobjects if invisible(mobject)
+        ]
+
+    def update_frame(self, scene, *args, **kwargs):
+        # Also the still frame manim draws for a scene without plays
+        return
+
+    def scene_finished(self, scene):
+        self.end_act(self.current_act)
+        super().scene_finished(scene)
+
+
+def dry_run(scene_class, **renderer_kwargs):
+    """Run ``scene_class``'s ``construct`` with a :class:`DryRunRenderer` and return the renderer."""
+    renderer = DryRunRenderer(**renderer_kwargs)
+    scene = scene_class(renderer=renderer)
+    scene.render()
+    return renderer
@@ -0,0 +1,227 @@
+"""
+Container-level helpers shared by the render modes: joining movie files
+without re-encoding, mixing sound cues and muxing the mixed track.
+
+Sound files that aren't wav are converted once and kept in ``media/audio``,
+named by a hash of the source file, instead of being converted again for
+every ``add_sound`` of every render.
+
+These follow what manim's ``SceneFileWriter.combine_to_movie`` does, but work
+on plain file lists so they can be used outside of a single scene render.
+"""
+
+import os
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import av
+import numpy as np
+from pydub import AudioSegment
+
+from manim import __version__, config, logger
+from manim.scene.scene_file_writer import convert_audio, to_av_frame_rate
+from manim.utils.sounds import get_full_sound_file_path
+
+from .store import file_digest
+
+
+@dataclass
+class SoundCue:
+    """One ``add_sound`` call: what, when (scene seconds) and how loud."""
+    path: str
+    time: float
+    gain: float = None
+    act: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def concat_movies(input_files, output_file):
+    """Join movie files with identical codec settings into ``output_file`` (stream copy)."""
+    output_file = Path(output_file)
+    with tempfile.TemporaryDirectory() as tmp:
+        file_list = Path(tmp) / "movie_file_list.txt"
+        with file_list.open("w", encoding="utf-8") as fp:
+            for path in input_files:
+                fp.write(f"file 'file:{Path(path).resolve().as_posix()}'\n")
+
+        movies_input = av.open(str(file_list), options={"safe": "0", "an": "1"}, format="concat")
+        movies_stream = movies_input.streams.video[0]
+        output_container = av.open(str(output_file), mode="w")
+        output_container.metadata["comment"] = f"Rendered with Manim Community v{__version__}"
+        output_stream = output_container.add_stream(template=movies_stream)
+        for packet in movies_input.demux(movies_stream):
+            # Skip the flushing packets demux generates
+            if packet.dts is None:
+                continue
+            packet.dts = None
+            packet.stream = output_stream
+            output_container.mux(packet)
+        movies_input.close()
+        output_container.close()
+    return output_file
+
+
+def mix_cues(cues, offset=0.0, duration=None, store=None):
+    """Overlay every cue onto one silent track. Cue times are shifted by ``-offset``."""
+    track = AudioSegment.silent(int(np.ceil((duration or 0) * 1000)))
+    converted = {}
+    for cue in cues:
+        time = cue.time - offset
+        if time < 0:
+            continue
+        if cue.path not in converted:
+            converted[cue.path] = load_sound(cue.path, store)
+        segment = converted[cue.path]
+        if cue.gain:
+            segment = segment.apply_gain(cue.gain)
+        end = time + segment.duration_seconds
+        if end > track.duration_seconds:
+            track = track.append(
+                AudioSegment.silent(int(np.ceil((end - track.duration_seconds) * 1000))),
+                crossfade=0,
+            )
+        track = track.overlay(segment, position=int(1000 * time))
+    return track
+
+
+def converted_sound_path(file_path):
+    return Path(config.media_dir) / "audio" / f"{file_path.stem}.{file_digest(file_path)[:16]}.wav"
+
+
+def load_sound(path, store=None):
+    """Load a sound file as an AudioSegment, converting non-wav files like manim does (cached).
+
+    With a :class:`~render_tools.store.MediaStore` the lookup and the
+    converted file are recorded in it.
+    """
+    file_path = get_full_sound_file_path(path)
+    if file_path.suffix in (".wav", ".raw"):
+        return AudioSegment.from_file(file_path)
+    wav_path = converted_sound_path(file_path)
+    hit = wav_path.exists()
+    if not hit:
+        wav_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = wav_path.with_name(f".{wav_path.stem}.{os.getpid()}.tmp.wav")
+        convert_audio(file_path, temp_path, "pcm_s16le")
+        os.replace(temp_path, wav_path)
+    if store is not None:
+        store.record(wav_path, hit)
+        if not hit:
+            store.ingest(wav_path)
+    return AudioSegment.from_file(wav_path)
+
+
+def mux_audio(movie_file, track):
+    """Replace the audio of ``movie_file`` with ``track`` (an AudioSegment), in place."""
+    movie_file = Path(movie_file)
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = Path(tmp) / "mix.wav"
+        track.export(wav_path, format="wav", bitrate="312k")
+        sound_path = wav_path
+        if movie_file.suffix == ".mp4":
+            sound_path = wav_path.with_suffix(".aac")
+            convert_audio(wav_path, sound_path, "aac")
+        elif movie_file.suffix == ".webm":
+            sound_path = wav_path.with_suffix(".ogg")
+            convert_audio(wav_path, sound_path, "libvorbis")
+
+        temp_movie = Path(tmp) / f"muxed{movie_file.suffix}"
+        with av.open(str(movie_file)) as video_input, av.open(str(sound_path)) as audio_input:
+            video_stream = video_input.streams.video[0]
+            audio_stream = audio_input.streams.audio[0]
+            output_container = av.open(str(temp_movie), mode="w", options={"shortest": "1"})
+            output_container.metadata["comment"] = f"Rendered with Manim Community v{__version__}"
+            output_video = output_container.add_stream(template=video_stream)
+            output_audio = output_container.add_stream(template=audio_stream)
+            for packet in video_input.demux(video_stream):
+                if packet.dts is None:
+                    continue
+                packet.stream = output_video
+                output_container.mux(packet)
+            for packet in audio_input.demux(audio_stream):
+                if packet.dts is None:
+                    continue
+                packet.stream = output_audio
+                output_container.mux(packet)
+            output_container.close()
+        shutil.move(str(temp_movie), str(movie_file))
+    logger.info("Muxed audio into %(path)s", {"path": str(movie_file)})
+    return movie_file
+
+
+def has_held_frames(movie_file, rate):
+    """True if a video packet of ``movie_file`` stands for more than one frame at ``rate``."""
+    with av.open(str(movie_file)) as movie_input:
+        video_stream = movie_input.streams.video[0]
+        step = 1 / (rate * video_stream.time_base)
+        pts = sorted(packet.pts for packet in movie_input.demux(video_stream) if packet.pts is not None)
+    return any(later - earlier > step for earlier, later in zip(pts, pts[1:]))
+
+
+def restore_cfr(movie_file, frame_rate, encoder_profile=None, threads=0):
+    """Re-encode a variable frame rate ``movie_file`` at a constant ``frame_rate``, in place.
+
+    Held frames are repeated up to the next frame; audio is copied as is. The video
+    is encoded with ``encoder_profile`` (see tuning.py) and at most ``threads``
+    threads, like the partial movies. A movie without held frames is left alone.
+    """
+    movie_file = Path(movie_file)
+    rate = to_av_frame_rate(frame_rate)
+    if not has_held_frames(movie_file, rate):
+        logger.info("No held frames in %(path)s, kept as is", {"path": str(movie_file)})
+        return movie_file
+    options = {"crf": "23"} if encoder_profile is None else encoder_profile.options()
+    if threads:
+        options["threads"] = str(threads)
+    with tempfile.TemporaryDirectory() as tmp:
+        temp_movie = Path(tmp) / f"cfr{movie_file.suffix}"
+        with av.open(str(movie_file)) as movie_input:
+            video_stream = movie_input.streams.video[0]
+            audio_streams = movie_input.streams.audio[:1]
+            if video_stream.duration is not None:
+                duration = float(video_stream.duration * video_stream.time_base)
+            else:
+                duration = movie_input.duration / av.time_base
+            output_container = av.open(str(temp_movie), mode="w")
+            output_container.metadata["comment"] = f"Rendered with Manim Community v{__version__}"
+            output_video = output_container.add_stream("libx264", rate=rate, options=options)
+            output_video.pix_fmt = "yuv420p"
+            output_video.width = video_stream.codec_context.width
+            output_video.height = video_stream.codec_context.height
+            output_audio = None
+            if audio_streams:
+                output_audio = output_container.add_stream(template=audio_streams[0])
+
+            index = 0
+            held = None
+
+            def write_until(position):
+                nonlocal index
+                while held is not None and index < position:
+                    frame = av.VideoFrame.from_ndarray(held, format="rgb24")
+                    frame.pts = index
+                    for packet in output_video.encode(frame):
+                        output_container.mux(packet)
+                    index += 1
+
+            for packet in movie_input.demux(video_stream, *audio_streams):
+                if packet.dts is None:
+                    continue
+                if packet.stream.type == "audio":
+                    packet.stream = output_audio
+                    output_container.mux(packet)
+                    continue
+                for frame in packet.decode():
+                    write_until(round(frame.time * rate))
+                    held = frame.to_ndarray(format="rgb24")
+            write_until(round(duration * rate))
+            for packet in output_video.encode():
+                output_container.mux(packet)
+            output_container.close()
+        shutil.move(str(temp_movie), str(movie_file))
+    logger.info("Restored a constant frame rate in %(path)s", {"path": str(movie_file)})
+    return movie_file
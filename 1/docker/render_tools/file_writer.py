@@ -0,0 +1,209 @@
+"""
+SceneFileWriter used by the render tools.
+
+Differences from manim's writer:
+
+* ``add_sound`` only records a :class:`SoundCue`; the cues are mixed when the
+  movie is combined, so a render that starts mid-scene or is split across
+  processes can still place every sound at its exact scene time.
+* partial movie files are written to a temporary name and renamed when
+  complete, so a crashed or concurrent render never leaves a half-written
+  file that later looks like a cache hit.
+* a play resumed from a checkpoint reuses the partial file recorded there.
+* frames from the renderer's frame pool (pipeline.py) go back to the pool
+  once they are encoded.
+* libx264 streams use the tuned encoder profile, if any (tuning.py), and at
+  most ``renderer.encoder_threads`` threads.
+* with a media store (store.py), cache lookups are recorded, new partial
+  movie files are stored by content, and the store's budget replaces
+  manim's per-scene file count limit.
+* with a remote cache (remote.py), a local cache miss is looked up on the
+  remote first, and new partial movie files are uploaded to it.
+* with a live HLS preview (hls.py), the movie's video is joined from the
+  preview's segments, which hold the same packets as the partial movie files.
+* with a render profile below the scene's frame rate (profiles.py), video
+  streams and the resolution folder use the profile's rate.
+* with ``renderer.vfr``, a run of identical frames (a frozen ``wait`` or
+  frames that simply didn't change) is encoded once and held until the next
+  different frame, giving a variable frame rate stream.
+"""
+
+import os
+import time
+from fractions import Fraction
+from pathlib import Path
+
+import av
+import numpy as np
+
+from manim import config
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import write_to_movie
+
+from .encode import SoundCue, concat_movies, load_sound
+from .profiles import output_frame_rate
+
+
+class ToolFileWriter(SceneFileWriter):
+    def __init__(self, renderer, scene_name, **kwargs):
+        self.sound_cues = []
+        super().__init__(renderer, scene_name, **kwargs)
+        variant = renderer.cache_variant()
+        if variant and hasattr(self, "partial_movie_directory"):
+            # Keep VFR/adaptive partial files apart so a normal render never reuses them from the cache
+            directory = self.partial_movie_directory
+            self.partial_movie_directory = directory.with_name(f"{directory.name}.{variant}")
+            self.partial_movie_directory.mkdir(parents=True, exist_ok=True)
+
+    def get_resolution_directory(self):
+        if self.renderer.ticks_per_frame == 1:
+            return super().get_resolution_directory()
+        return f"{config.pixel_height}p{self.renderer.output_frame_rate:g}"
+
+    # --- Sound ---
+    def add_sound(self, sound_file, time=None, gain=None, **kwargs):
+        if time is None:
+            time = self.renderer.time
+        self.sound_cues.append(SoundCue(
+            path=str(sound_file),
+            time=time,
+            gain=gain,
+            act=self.renderer.locate_act(),
+        ))
+
+    def mix_recorded_sounds(self):
+        """Mix the cues inside the render window, relative to where the window starts."""
+        offset = self.renderer.window_offset()
+        converted = {}
+        for cue in self.sound_cues:
+            if not self.renderer.cue_in_window(cue):
+                continue
+            # Same as SceneFileWriter.add_sound, with the converted wav cached
+            if cue.path not in converted:
+                converted[cue.path] = load_sound(cue.path, self.renderer.store)
+            segment = converted[cue.path]
+            if cue.gain:
+                segment = segment.apply_gain(cue.gain)
+            self.add_audio_segment(segment, cue.time - offset)
+
+    # --- Frames ---
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        super().write_frame(frame_or_renderer, num_frames)
+        if not write_to_movie() and self.renderer.frame_pool is not None:
+            self.renderer.frame_pool.release(frame_or_renderer)
+
+    def listen_and_write(self):
+        pool = self.renderer.frame_pool
+        while True:
+            waiting = time.perf_counter()
+            num_frames, frame_data = self.queue.get()
+            if pool is not None:
+                pool.writer_idle_seconds += time.perf_counter() - waiting
+            if frame_data is None:
+                if self.renderer.vfr:
+                    self.end_held_frame()
+                break
+            self.encode_and_write_frame(frame_data, num_frames)
+            if pool is not None:
+                pool.release(frame_data)
+
+    # --- Variable frame rate ---
+    def encode_and_write_frame(self, frame, num_frames):
+        if not self.renderer.vfr:
+            super().encode_and_write_frame(frame, num_frames)
+            return
+        self.frame_repeated = self.held_frame is not None and np.array_equal(frame, self.held_frame)
+        if self.frame_repeated:
+            self.renderer.held_frames += num_frames
+        else:
+            self.encode_at(frame, self.next_pts)
+            # Pool buffers are recycled once this returns
+            self.held_frame = frame.copy()
+        self.next_pts += num_frames
+
+    def encode_at(self, frame, pts):
+        av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+        av_frame.pts = pts
+        av_frame.time_base = self.video_stream.codec_context.time_base
+        for packet in self.video_stream.encode(av_frame):
+            self.video_container.mux(packet)
+        self.last_pts = pts
+
+    def end_held_frame(self):
+        """Repeat the held frame at the end of the stream so the last hold keeps its length."""
+        if self.held_frame is not None and self.next_pts - 1 > self.last_pts:
+            self.encode_at(self.held_frame, self.next_pts - 1)
+
+    # --- Partial movie files ---
+    def is_already_cached(self, hash_invocation):
+        cached = super().is_already_cached(hash_invocation)
+        path = self.partial_movie_directory / f"{hash_invocation}{config.movie_file_extension}"
+        if not cached and self.renderer.remote_cache is not None:
+            cached = self.renderer.remote_cache.fetch(path)
+            if cached and self.renderer.store is not None:
+                self.renderer.store.ingest(path)
+        if self.renderer.store is not None:
+            self.renderer.store.record(path, cached)
+        return cached
+
+    def add_partial_movie_file(self, hash_animation):
+        entry = self.renderer.resumed_entry
+        if entry is None or not hasattr(self, "partial_movie_directory"):
+            super().add_partial_movie_file(hash_animation)
+            return
+        if self.renderer.store is not None:
+            self.renderer.store.use(entry["partial_movie_file"])
+        self.partial_movie_files.append(entry["partial_movie_file"])
+        self.sections[-1].partial_movie_files.append(entry["partial_movie_file"])
+
+    def open_partial_movie_stream(self, file_path=None):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_target = Path(file_path)
+        temp_path = self.partial_movie_target.with_name(
+            f"{self.partial_movie_target.stem}.{os.getpid()}.tmp{self.partial_movie_target.suffix}"
+        )
+        with output_frame_rate(self.renderer.output_frame_rate):
+            super().open_partial_movie_stream(file_path=temp_path)
+        profile = self.renderer.encoder_profile
+        if profile is not None and self.video_stream.codec_context.name == "libx264":
+            self.video_stream.codec_context.options.update(profile.options())
+        if self.renderer.encoder_threads and self.video_stream.codec_context.name == "libx264":
+            self.video_stream.codec_context.options["threads"] = str(self.renderer.encoder_threads)
+        if self.renderer.vfr:
+            self.held_frame = None
+            self.next_pts = 0
+            self.last_pts = -1
+            codec_context = self.video_stream.codec_context
+            codec_context.time_base = 1 / Fraction(codec_context.framerate)
+            if codec_context.name == "libx264":
+                # B-frames reorder timestamps, which breaks the gaps a VFR stream relies on
+                codec_context.options["bf"] = "0"
+
+    def close_partial_movie_stream(self):
+        super().close_partial_movie_stream()
+        os.replace(self.partial_movie_file_path, self.partial_movie_target)
+        if self.renderer.store is not None:
+            self.renderer.store.ingest(self.partial_movie_target)
+        if self.renderer.remote_cache is not None:
+            self.renderer.remote_cache.upload(self.partial_movie_target)
+
+    def combine_files(self, input_files, output_file, create_gif=False, includes_sound=False):
+        hls = self.renderer.hls
+        whole_movie = list(input_files) == [path for path in self.partial_movie_files if path is not None]
+        if hls is None or not hls.finished or create_gif or not whole_movie:
+            super().combine_files(input_files, output_file, create_gif, includes_sound)
+            return
+        concat_movies(hls.segment_paths(), output_file)
+
+    def clean_cache(self):
+        if self.renderer.store is None:
+            super().clean_cache()
+
+    def finish(self):
+        if self.renderer.defer_audio:
+            # Per-act workers: the caller stitches partial files and mixes every cue once
+            self.finish_last_section()
+            return
+        self.mix_recorded_sounds()
+        super().finish()
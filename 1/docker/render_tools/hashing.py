@@ -0,0 +1,84 @@
+"""
+Play hashes that are the same on every machine.
+
+manim names each partial movie file after a hash of the JSON dump of the
+camera, the animations and the mobjects of a play. That dump contains
+absolute paths: the ``SOUND_DIR``/``ASSET_DIR`` globals the scene scripts
+build from ``__file__`` (they end up in the closure of every function that is
+hashed), and the ``media/texts`` SVG file every ``Text`` keeps. The same
+play therefore hashes differently in ``/Users/eric/code/Video/docker`` and in
+a teammate's checkout, and a shared cache would never hit.
+
+:func:`portable_hash_from_play_call` is manim's ``get_hash_from_play_call``
+with those roots (scene folder, media folder, home folder) replaced by
+placeholders before hashing. The hash keeps manim's
+``<camera>_<animations>_<mobjects>`` format.
+"""
+
+import contextlib
+import json
+import zlib
+from pathlib import Path
+
+from manim import config
+from manim.renderer import cairo_renderer
+from manim.utils.hashing import _Memoizer, get_json
+
+
+def path_roots():
+    """(absolute path, placeholder) pairs to replace, longest path first."""
+    roots = {}
+    if config.input_file:
+        roots[Path(config.input_file).resolve().parent] = "<project>"
+    roots[Path(config.media_dir).resolve()] = "<media>"
+    roots[Path.home()] = "<home>"
+    pairs = []
+    for path, placeholder in roots.items():
+        text = str(path)
+        # As written in the JSON dump, where backslashes are escaped
+        for form in {text, json.dumps(text)[1:-1], path.as_posix()}:
+            if len(form) > 1:
+                pairs.append((form, placeholder))
+    return sorted(pairs, key=lambda pair: -len(pair[0]))
+
+
+def portable_json(obj, roots):
+    dumped = get_json(obj)
+    for path, placeholder in roots:
+        dumped = dumped.replace(path, placeholder)
+    return dumped
+
+
+def portable_hash_from_play_call(scene_object, camera_object, animations_list, current_mobjects_list):
+    """Same as ``manim.utils.hashing.get_hash_from_play_call``, without machine-specific paths."""
+    roots = path_roots()
+    _Memoizer.mark_as_processed(scene_object)
+    camera_json = portable_json(camera_object, roots)
+    animations_list_json = [portable_json(x, roots) for x in sorted(animations_list, key=str)]
+    current_mobjects_list_json = [portable_json(x, roots) for x in current_mobjects_list]
+    hash_camera, hash_animations, hash_current_mobjects = (
+        zlib.crc32(repr(json_val).encode())
+        for json_val in [camera_json, animations_list_json, current_mobjects_list_json]
+    )
+    _Memoizer.reset_already_processed()
+    return f"{hash_camera}_{hash_animations}_{hash_current_mobjects}"
+
+
+def portable_state_hash(scene_object, mobjects):
+    """Hash of ``mobjects`` as they are now, in the same form as the mobjects part of a play hash."""
+    roots = path_roots()
+    _Memoizer.mark_as_processed(scene_object)
+    mobjects_json = [portable_json(x, roots) for x in mobjects]
+    _Memoizer.reset_already_processed()
+    return zlib.crc32(repr(mobjects_json).encode())
+
+
+@contextlib.contextmanager
+def portable_hashing():
+    """Make the cairo renderer hash plays with :func:`portable_hash_from_play_call` while active."""
+    original = cairo_renderer.get_hash_from_play_call
+    cairo_renderer.get_hash_from_play_call = portable_hash_from_play_call
+    try:
+        yield
+    finally:
+        cairo_renderer.get_hash_from_play_call = original
@@ -0,0 +1,218 @@
+"""
+Progressive HLS preview of a render in progress.
+
+Every partial movie file is cut into MPEG-TS segments as soon as its play
+is finished: the packets are copied (no re-encode), shifted to their scene
+time, and a new segment starts at the first keyframe after
+``segment_seconds``, and at every act boundary. The sound cues recorded so
+far are mixed into the segment's stretch of audio. ``playlist.m3u8`` (an
+EVENT playlist) gets a line per segment, and ``#EXT-X-ENDLIST`` once the
+scene is finished, so the first acts can be reviewed while the later ones
+are still rasterizing. :func:`serve_hls` serves the folder, with a small
+``index.html`` player.
+
+The final movie's video is joined from the same segments (see
+``ToolFileWriter.combine_files``), so every frame is encoded once. Its
+audio is the whole scene mixed at once, as usual; a segment's audio is for
+review only.
+"""
+
+import functools
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import av
+import numpy as np
+from pydub import AudioSegment
+
+from manim import config, logger
+
+from .encode import load_sound
+from .publish import add_audio_stream, encode_audio, mux_interleaved
+
+SEGMENT_SECONDS = 4.0
+AUDIO_RATE = 48_000
+AUDIO_BITRATE = 128_000
+# Segment timestamps start here: the first packets of an x264 stream with
+# B-frames have a dts before their pts, and MPEG-TS can't go below zero
+BASE_SECONDS = 1.0
+
+INDEX_HTML = """<!doctype html>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>body {{ margin: 0; background: #111; }} video {{ display: block; margin: auto; height: 100vh; }}</style>
+<video id="video" controls autoplay muted></video>
+<script src="https://cdn.jsdelivr.net/npm/hls.js@1"></script>
+<script>
+  const video = document.getElementById("video");
+  if (video.canPlayType("application/vnd.apple.mpegurl")) {{
+    video.src = "playlist.m3u8";
+  }} else {{
+    const hls = new Hls();
+    hls.loadSource("playlist.m3u8");
+    hls.attachMedia(video);
+  }}
+</script>
+"""
+
+
+def hls_dir(scene_name):
+    return Path(config.media_dir) / "hls" / scene_name
+
+
+class HlsSegmenter:
+    """Cuts finished partial movie files into HLS segments on a background thread."""
+
+    def __init__(self, scene_name, segment_seconds=SEGMENT_SECONDS, directory=None):
+        self.directory = Path(directory) if directory else hls_dir(scene_name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Segments of a previous render would end up in this one's playlist
+        for stale in self.directory.glob("segment_*.ts"):
+            stale.unlink()
+        (self.directory / "playlist.m3u8").unlink(missing_ok=True)
+        (self.directory / "index.html").write_text(INDEX_HTML.format(title=scene_name), encoding="utf-8")
+        self.segment_seconds = segment_seconds
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hls")
+        self.futures = []
+        self.segments = []          # (file name, seconds)
+        self.container = None
+        self.video_packets = []
+        self.start = 0.0
+        self.act = None
+        self.track = AudioSegment.silent(0, frame_rate=AUDIO_RATE).set_channels(2)
+        self.mixed_cues = 0
+        self.finished = False
+
+    @property
+    def playlist_path(self):
+        return self.directory / "playlist.m3u8"
+
+    def add(self, partial_movie_file, start, act, cues):
+        """Queue the partial movie file of a finished play that starts at ``start`` (seconds into the movie).
+
+        ``cues`` are the sound cues so far, as (seconds into the movie, path, gain).
+        """
+        new_cues = cues[self.mixed_cues:]
+        self.mixed_cues = len(cues)
+        self.futures.append(self.executor.submit(self.cut, Path(partial_movie_file), start, act, new_cues))
+
+    def finish(self, end):
+        """Close the last segment at ``end`` and end the playlist."""
+        self.futures.append(self.executor.submit(self.close_segment, end, True))
+        self.executor.shutdown()
+        self.finished = True
+        for future in self.futures:
+            # Raise what went wrong on the thread
+            future.result()
+
+    def segment_paths(self):
+        return [self.directory / name for name, _ in self.segments]
+
+    # --- On the segmenter thread ---
+    def cut(self, path, start, act, cues):
+        self.mix(cues)
+        with av.open(str(path)) as source:
+            stream = source.streams.video[0]
+            for packet in source.demux(stream):
+                if packet.dts is None:
+                    continue
+                time = start + float(packet.pts * packet.time_base)
+                if packet.is_keyframe and (
+                    self.container is None or act != self.act or time - self.start >= self.segment_seconds - 1e-6
+                ):
+                    self.close_segment(time)
+                    self.open_segment(stream, time)
+                    self.act = act
+                shift = round(BASE_SECONDS / packet.time_base) + round(start / packet.time_base)
+                packet.pts += shift
+                packet.dts += shift
+                packet.stream = self.video_stream
+                self.video_packets.append(packet)
+
+    def open_segment(self, template, start):
+        name = f"segment_{len(self.segments):05d}.ts"
+        self.container = av.open(str(self.directory / f".{name}.tmp"), mode="w", format="mpegts")
+        self.video_stream = self.container.add_stream(template=template)
+        self.audio_stream = add_audio_stream(self.container, AUDIO_RATE, "stereo", AUDIO_BITRATE)
+        self.name = name
+        self.start = start
+
+    def close_segment(self, end, last=False):
+        if self.container is not None:
+            audio_packets = encode_audio(self.audio_stream, self.audio_samples(self.start, end), AUDIO_RATE, "stereo")
+            shift = round((BASE_SECONDS + self.start) * AUDIO_RATE)
+            for packet in audio_packets:
+                packet.pts += shift
+                packet.dts += shift
+            mux_interleaved(self.container, self.video_packets, audio_packets)
+            self.container.close()
+            (self.directory / f".{self.name}.tmp").replace(self.directory / self.name)
+            self.segments.append((self.name, end - self.start))
+            self.container = None
+            self.video_packets = []
+        if self.segments:
+            self.write_playlist(ended=last)
+
+    def mix(self, cues):
+        for time, path, gain in cues:
+            if time < 0:
+                continue
+            segment = load_sound(path)
+            if gain:
+                segment = segment.apply_gain(gain)
+            end_ms = int(math.ceil((time + segment.duration_seconds) * 1000))
+            if end_ms > len(self.track):
+                self.track += AudioSegment.silent(end_ms - len(self.track), frame_rate=AUDIO_RATE).set_channels(2)
+            self.track = self.track.overlay(segment, position=int(1000 * time))
+
+    def audio_samples(self, start, end):
+        """The mixed track from ``start`` to ``end`` as float (2, n) samples at AUDIO_RATE."""
+        piece = self.track[int(round(start * 1000)):int(round(end * 1000))]
+        piece = piece.set_frame_rate(AUDIO_RATE).set_channels(2).set_sample_width(2)
+        samples = np.array(piece.get_array_of_samples(), dtype=np.float32).reshape(-1, 2).T / 32768
+        wanted = round((end - start) * AUDIO_RATE)
+        if samples.shape[1] < wanted:
+            samples = np.pad(samples, ((0, 0), (0, wanted - samples.shape[1])))
+        return samples[:, :wanted]
+
+    def write_playlist(self, ended=False):
+        # Cuts only happen at keyframes, so a segment can run a GOP over segment_seconds
+        target = math.ceil(max(seconds for _, seconds in self.segments))
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{max(target, math.ceil(self.segment_seconds))}",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        for name, seconds in self.segments:
+            lines += [f"#EXTINF:{seconds:.3f},", name]
+        if ended:
+            lines.append("#EXT-X-ENDLIST")
+        temp = self.directory / ".playlist.m3u8.tmp"
+        temp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        temp.replace(self.playlist_path)
+
+
+# --- Local server ---
+class HlsRequestHandler(SimpleHTTPRequestHandler):
+    def end_headers(self):
+        # The playlist changes under the player
+        self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def serve_hls(directory, host="127.0.0.1", port=8800):
+    """Serve ``directory`` on a background thread; returns the server (``shutdown()`` to stop)."""
+    handler = functools.partial(HlsRequestHandler, directory=str(directory))
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="hls-server", daemon=True)
+    thread.start()
+    logger.info(f"Live preview at http://{host}:{server.server_port}/ (playlist.m3u8)")
+    return server
@@ -0,0 +1,223 @@
+"""
+A job queue in a shared directory, for render nodes on one NFS mount.
+
+There is no server and no lock: every state change is a ``rename``, and
+every reservation an exclusive create, both of which the filesystem (NFS
+included) performs atomically, so exactly one node wins each race::
+
+    orders/<n>            submission order n, taken by one submitter
+    jobs/<id>.json        the job, written once by submit
+    pending/<id>          waiting (attempt count and past errors)
+    running/<id>          claimed by a worker: pending/<id> renamed here
+    done/<id>             finished; its result is results/<id>.json
+    failed/<id>           out of attempts
+    heartbeats/<worker>   a counter each worker bumps every few seconds
+
+A worker that dies stops bumping its heartbeat. Any node that sees a
+worker's counter unchanged for ``lease_seconds`` (by its own clock, so
+clocks don't need to agree) puts that worker's running jobs back in
+``pending`` with one more attempt. A job that fails or times out
+``max_attempts`` times goes to ``failed``.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+STATES = ("pending", "running", "done", "failed")
+
+
+def write_json(path, data):
+    """Write ``data`` to ``path`` through a temporary name."""
+    path = Path(path)
+    temp = path.with_name(f".{path.name}.{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}.tmp")
+    temp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(temp, path)
+
+
+def read_json(path):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        # Gone, or replaced while we were reading it
+        return None
+
+
+def same_lease(state, lease):
+    """True if the ``running/`` file ``state`` is still ``lease``, not a later claim of the same job."""
+    return state is not None and (state.get("worker"), state.get("claimed")) == (lease["worker"], lease.get("claimed"))
+
+
+def worker_name():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    def __init__(self, root, lease_seconds=60, max_attempts=3):
+        self.root = Path(root)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for name in ("orders", "jobs", "results", "heartbeats", *STATES):
+            (self.root / name).mkdir(parents=True, exist_ok=True)
+        # worker -> (last counter seen, local time it was first seen)
+        self.observed = {}
+
+    def path(self, state, job_id):
+        return self.root / state / job_id
+
+    def ids(self, state):
+        return sorted(name for name in os.listdir(self.root / state) if not name.startswith("."))
+
+    # --- Submitting ---
+    def reserve(self, count):
+        """Take ``count`` consecutive submission orders no other submitter has; returns the first."""
+        # Queues from before orders/ numbered their jobs by counting them
+        start = max(len(os.listdir(self.root / "orders")), len(os.listdir(self.root / "jobs")))
+        while True:
+            for order in range(start, start + count):
+                try:
+                    os.close(os.open(self.root / "orders" / f"{order:06d}", os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                except FileExistsError:
+                    # Taken by another submitter: the orders taken so far stay unused
+                    start = order + 1
+                    break
+            else:
+                return start
+
+    def submit(self, job_id, job):
+        """Add a job; a job id that is already queued or finished is left alone."""
+        if any(self.path(state, job_id).exists() for state in STATES):
+            return False
+        write_json(self.root / "jobs" / f"{job_id}.json", {"id": job_id, **job})
+        write_json(self.path("pending", job_id), {"attempt": 0, "errors": []})
+        return True
+
+    def job(self, job_id):
+        return read_json(self.root / "jobs" / f"{job_id}.json")
+
+    def result(self, job_id):
+        return read_json(self.root / "results" / f"{job_id}.json")
+
+    # --- Working ---
+    def claim(self, worker):
+        """Move the first pending job to ``running`` for ``worker``; returns its lease or ``None``."""
+        for job_id in self.ids("pending"):
+            running = self.path("running", job_id)
+            try:
+                os.rename(self.path("pending", job_id), running)
+            except FileNotFoundError:
+                # Another worker got it first
+                continue
+            state = read_json(running) or {"attempt": 0, "errors": []}
+            lease = {**state, "id": job_id, "worker": worker, "claimed": time.time()}
+            write_json(running, lease)
+            return lease
+        return None
+
+    def owns(self, lease):
+        return same_lease(read_json(self.path("running", lease["id"])), lease)
+
+    def complete(self, lease, result):
+        """Record ``result`` and move the job to ``done``, unless the lease was taken away meanwhile."""
+        job_id = lease["id"]
+        running = self.path("running", job_id)
+        # Take the job out of running/ first, so a reap can't requeue it while the result is written
+        parked = running.with_name(f".{job_id}.{worker_name()}.complete")
+        try:
+            os.rename(running, parked)
+        except FileNotFoundError:
+            # Requeued by a reap
+            return False
+        if not same_lease(read_json(parked), lease):
+            # Requeued and claimed again in between: the job is someone else's now
+            os.rename(parked, running)
+            return False
+        write_json(self.root / "results" / f"{job_id}.json", result)
+        os.rename(parked, self.path("done", job_id))
+        return True
+
+    def fail(self, lease, error):
+        """Put the job back in ``pending`` for another attempt, or in ``failed``."""
+        return self.release(self.path("running", lease["id"]), lease, error)
+
+    def release(self, running, lease, error):
+        """Requeue the job of ``lease``; ``False`` if it isn't that lease's job any more."""
+        job_id = lease["id"]
+        # Take the job out of running/ first, so nobody claims it while it is rewritten
+        parked = running.with_name(f".{job_id}.{worker_name()}.release")
+        try:
+            os.rename(running, parked)
+        except FileNotFoundError:
+            return False
+        if not same_lease(read_json(parked), lease):
+            os.rename(parked, running)
+            return False
+        state = {"attempt": lease.get("attempt", 0) + 1, "errors": lease.get("errors", []) + [error]}
+        if state["attempt"] >= self.max_attempts:
+            write_json(self.path("failed", job_id), state)
+        else:
+            write_json(self.path("pending", job_id), state)
+        parked.unlink(missing_ok=True)
+        return True
+
+    def heartbeat(self, worker, beat):
+        write_json(self.root / "heartbeats" / worker, {"beat": beat, "host": socket.gethostname()})
+
+    # --- Leases ---
+    def reap(self):
+        """Requeue the running jobs of workers whose heartbeat stopped. Returns their ids."""
+        now = time.monotonic()
+        stale = set()
+        for worker in os.listdir(self.root / "heartbeats"):
+            if worker.startswith("."):
+                continue
+            beat = (read_json(self.root / "heartbeats" / worker) or {}).get("beat")
+            seen = self.observed.get(worker)
+            if seen is None or seen[0] != beat:
+                self.observed[worker] = (beat, now)
+            elif now - seen[1] >= self.lease_seconds:
+                stale.add(worker)
+        requeued = []
+        for job_id in self.ids("running"):
+            running = self.path("running", job_id)
+            lease = read_json(running)
+            if lease is None or "worker" not in lease:
+                continue
+            worker = lease["worker"]
+            if worker in stale or not (self.root / "heartbeats" / worker).exists():
+                if self.release(running, lease, f"lease of {worker} expired"):
+                    requeued.append(job_id)
+        for worker in stale:
+            (self.root / "heartbeats" / worker).unlink(missing_ok=True)
+            self.observed.pop(worker, None)
+        return requeued
+
+    def counts(self):
+        return {state: len(self.ids(state)) for state in STATES}
+
+
+class Heartbeat:
+    """Bumps a worker's heartbeat on a background thread until stopped."""
+
+    def __init__(self, queue, worker, interval):
+        self.queue = queue
+        self.worker = worker
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.queue.heartbeat(worker, 0)
+        self.thread = threading.Thread(target=self.run, name="heartbeat", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        beat = 0
+        while not self.stopped.wait(self.interval):
+            beat += 1
+            self.queue.heartbeat(self.worker, beat)
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        (self.queue.root / "heartbeats" / self.worker).unlink(missing_ok=True)
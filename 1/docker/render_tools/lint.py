@@ -0,0 +1,768 @@
+"""
+Render-cost linter for scene scripts.
+
+Scenes drafted from ``guideline.md`` tend to repeat a few expensive patterns.
+``render.py lint`` reads a scene's source (no import, no manim run) and flags:
+
+* ``repeated-build``: ``Text``, ``Tex``, ``SVGMobject``... built with the same
+  arguments on every pass of a loop or every call of a helper, or the same
+  constant ``Text`` built at several places. Each one runs Pango (or LaTeX)
+  and parses an SVG again, where ``.copy()`` of one instance only copies
+  points.
+* ``micro-plays``: runs of very short plays, like a shake made of nine 0.08s
+  plays. Every play is hashed, opens and closes its own partial movie file
+  and encoder, and is a separate cache entry; one play with ``Wiggle`` or a
+  ``rate_func`` draws the same frames.
+* ``fadeout-each``: one ``FadeOut`` per mobject (``*[FadeOut(m) for m in
+  ...]``, four or more ``FadeOut`` arguments, or a loop of fading plays),
+  where a single ``FadeOut(Group(...))`` interpolates one animation.
+* ``invisible-left``: a mobject faded to opacity 0 that is never removed.
+  cairo still builds its paths for every frame, and it is hashed with every
+  play.
+
+It also estimates what every act costs to render. Frames and plays come from
+the run times in the source, and seconds per frame and per play from the
+``--trace`` reports in ``media/profile`` (profiler.py). That is the scene's
+own report for the acts it has, or the pooled reports of every scene. Costs
+are scaled to the pixel size and frame rate the render would use.
+
+With ``--dry-run`` the scene is imported and ``construct`` runs with the
+:class:`~render_tools.dryrun.DryRunRenderer`: plays and frames per act are
+then exact, and the mobjects that draw nothing are taken from the scene at
+the end of every act instead of guessed from the source.
+"""
+
+import ast
+import math
+import statistics
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .acts import act_at_line, find_acts_in_file, find_construct
+from .profiler import act_rows, load_report
+
+# Mobjects whose constructor does the expensive work, and what that work is
+BUILD_CLASSES = {
+    "Text": "a Pango layout and SVG parsing",
+    "MarkupText": "a Pango layout and SVG parsing",
+    "Paragraph": "a Pango layout and SVG parsing",
+    "Code": "highlighting, a Pango layout and SVG parsing",
+    "Tex": "a LaTeX run and SVG parsing",
+    "MathTex": "a LaTeX run and SVG parsing",
+    "SVGMobject": "SVG parsing",
+    "ImageMobject": "image decoding",
+}
+# Animations that take their (first) mobject out of the scene
+REMOVERS = {"FadeOut", "Uncreate", "Unwrite", "ShrinkToCenter", "ReplacementTransform", "FadeTransform"}
+# A play shorter than this is a micro-play; this many in a row are flagged
+MICRO_PLAY_SECONDS = 0.2
+MICRO_PLAY_RUN = 4
+# FadeOut arguments of one play that are better off as one FadeOut of a Group
+FADEOUT_ARGS = 4
+# Module-level settings the scene files make, e.g. "config.frame_rate = 60"
+CONFIG_KEYS = ("pixel_width", "pixel_height", "frame_rate", "frame_width", "frame_height")
+
+
+@dataclass
+class Finding:
+    rule: str
+    line: int
+    act: int
+    message: str
+    suggestion: str
+    saving: float = None        # render seconds saved, if the profiles say
+
+
+@dataclass
+class StaticPlay:
+    line: int                   # line in construct, for the act
+    source_line: int            # line of the play itself
+    act: int
+    kind: str                   # "play" or "wait"
+    run_time: float             # None if it isn't a constant
+    count: int                  # times it runs (loops)
+    exact: bool                 # run time and count are known
+    subject: str = None         # X of an "X.animate..." first argument
+    loop: int = None            # id of the innermost loop around it
+    repeat: int = 1             # passes of that loop
+
+
+# --- AST helpers ---
+def call_name(node):
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def is_self_call(node, name):
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == name
+            and isinstance(node.func.value, ast.Name) and node.func.value.id == "self")
+
+
+def number(node):
+    """Value of a constant numeric expression, or ``None``."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = number(node.operand)
+        return None if value is None else (-value if isinstance(node.op, ast.USub) else value)
+    if isinstance(node, ast.BinOp):
+        left, right = number(node.left), number(node.right)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Add):
+            return left + right
+        if isinstance(node.op, ast.Sub):
+            return left - right
+        if isinstance(node.op, ast.Mult):
+            return left * right
+        if isinstance(node.op, ast.Div) and right:
+            return left / right
+    return None
+
+
+def keyword(call, name):
+    return next((kw.value for kw in call.keywords if kw.arg == name), None)
+
+
+def root_name(node):
+    """``X`` of ``X.animate.shift(...)``, ``X[0].copy()`` and the like."""
+    while True:
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, (ast.Attribute, ast.Subscript)):
+            node = node.value
+        elif isinstance(node, ast.Call):
+            node = node.func
+        else:
+            return None
+
+
+def stored_names(node):
+    return {sub.id for sub in ast.walk(node) if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Store)}
+
+
+def loaded_names(node):
+    return {sub.id for sub in ast.walk(node) if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Load)}
+
+
+def calls_in(node):
+    """Calls in ``node`` in source order, not looking into nested functions."""
+    calls = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ast.Call):
+            calls.append(current)
+        for child in ast.iter_child_nodes(current):
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                stack.append(child)
+    return sorted(calls, key=lambda call: (call.lineno, call.col_offset))
+
+
+def short(node, width=70):
+    text = " ".join(ast.unparse(node).split())
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def build_args(call):
+    return [*call.args, *(kw.value for kw in call.keywords)]
+
+
+# --- Scene source ---
+class SceneSource:
+    """The parsed source of one scene class: its functions, acts and module-level ``config``."""
+
+    def __init__(self, path, class_name):
+        self.path = Path(path)
+        self.class_name = class_name
+        self.tree = ast.parse(self.path.read_text(encoding="utf-8"))
+        self.construct = find_construct(self.tree, class_name)
+        if self.construct is None:
+            raise ValueError(f"No class {class_name} with a construct method in {self.path}")
+        self.acts = find_acts_in_file(self.path, class_name)
+        self.functions = self.find_functions()
+        self.module_config = {
+            node.targets[0].attr: number(node.value)
+            for node in self.tree.body
+            if isinstance(node, ast.Assign) and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Attribute) and node.targets[0].attr in CONFIG_KEYS
+            and isinstance(node.targets[0].value, ast.Name) and node.targets[0].value.id == "config"
+            and number(node.value) is not None
+        }
+
+    def find_functions(self):
+        """Methods of the class and its bases in the module, and functions nested in ``construct``."""
+        classes = {node.name: node for node in self.tree.body if isinstance(node, ast.ClassDef)}
+        functions = {}
+        pending = [self.class_name]
+        while pending:
+            node = classes.get(pending.pop(0))
+            if node is None:
+                continue
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name != "construct":
+                    functions.setdefault(item.name, item)
+            pending.extend(base.id for base in node.bases if isinstance(base, ast.Name))
+        for node in ast.walk(self.construct):
+            if isinstance(node, ast.FunctionDef) and node is not self.construct:
+                functions.setdefault(node.name, node)
+        return functions
+
+    def act_of(self, line):
+        """Act of a line of ``construct``; ``None`` for lines of methods outside it."""
+        if not self.construct.lineno <= line <= self.construct.end_lineno:
+            return None
+        return act_at_line(self.acts, line)
+
+    def local_function(self, call):
+        """The helper ``call`` runs (``self.helper(...)`` or a function nested in construct), or ``None``."""
+        func = call.func
+        if isinstance(func, ast.Name):
+            node = self.functions.get(func.id)
+        elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self":
+            node = self.functions.get(func.attr)
+        else:
+            return None
+        return node if node is not self.construct else None
+
+
+def loop_count(loop, assignments):
+    """How often ``loop`` runs, or ``None``."""
+    if isinstance(loop, ast.While):
+        return None
+    node = loop.iter
+    if isinstance(node, ast.Call) and call_name(node) in ("enumerate", "zip", "reversed", "list") and node.args:
+        node = node.args[0]
+    if isinstance(node, ast.Call) and call_name(node) == "range":
+        bounds = [number(arg) for arg in node.args]
+        if bounds and all(isinstance(bound, int) for bound in bounds):
+            return len(range(*bounds))
+        return None
+    if isinstance(node, ast.Name) and node.id in assignments:
+        node = assignments[node.id]
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return len(node.elts)
+    return None
+
+
+def simple_assignments(function):
+    return {
+        node.targets[0].id: node.value
+        for node in ast.walk(function)
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+    }
+
+
+def play_run_time(call):
+    """Run time of a ``self.play``/``self.wait`` call if it is a constant, else ``None``."""
+    if call.func.attr == "wait":
+        duration = call.args[0] if call.args else keyword(call, "duration")
+        return 1.0 if duration is None else number(duration)
+    run_time = keyword(call, "run_time")
+    if run_time is not None:
+        return number(run_time)
+    times = [keyword(arg, "run_time") for arg in call.args if isinstance(arg, ast.Call)]
+    if any(node is not None for node in times):
+        values = [number(node) for node in times if node is not None]
+        return max(values) if all(value is not None for value in values) else None
+    return 1.0
+
+
+def collect_plays(source):
+    """The plays of ``construct`` in order, following helpers, with loop counts."""
+    plays = []
+
+    def walk(body, count, exact, line, assignments, active, loop=None):
+        for stmt in body:
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            if isinstance(stmt, (ast.For, ast.While)):
+                times = loop_count(stmt, assignments)
+                walk(stmt.body, count * (times or 1), exact and times is not None, line, assignments, active,
+                     (id(stmt), times or 1))
+            elif isinstance(stmt, ast.If):
+                walk(stmt.body, count, exact, line, assignments, active, loop)
+            elif isinstance(stmt, ast.Try):
+                walk(stmt.body + stmt.orelse + stmt.finalbody, count, exact, line, assignments, active, loop)
+            elif isinstance(stmt, ast.With):
+                walk(stmt.body, count, exact, line, assignments, active, loop)
+            else:
+                for call in calls_in(stmt):
+                    at = line or call.lineno
+                    if is_self_call(call, "play") or is_self_call(call, "wait"):
+                        run_time = play_run_time(call)
+                        first = call.args[0] if call.args and call.func.attr == "play" else None
+                        plays.append(StaticPlay(
+                            line=at, source_line=call.lineno, act=source.act_of(at), kind=call.func.attr,
+                            run_time=run_time, count=count, exact=exact and run_time is not None,
+                            subject=root_name(first) if isinstance(first, ast.Call) and ".animate" in ast.unparse(
+                                first.func) else None,
+                            loop=loop[0] if loop else None,
+                            repeat=loop[1] if loop else 1,
+                        ))
+                        continue
+                    helper = source.local_function(call)
+                    if helper is not None and helper.name not in active:
+                        walk(helper.body, count, exact, at, simple_assignments(helper), active | {helper.name}, loop)
+
+    walk(source.construct.body, 1, True, None, simple_assignments(source.construct), frozenset())
+    return plays
+
+
+def helper_calls(source):
+    """How often each helper runs, counting loops (unknown loops count twice)."""
+    calls = {}
+
+    def walk(node, count, assignments):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                continue
+            times = count
+            if isinstance(child, (ast.For, ast.While)):
+                times = count * (loop_count(child, assignments) or 2)
+            elif isinstance(child, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+                times = count * 2
+            if isinstance(child, ast.Call):
+                helper = source.local_function(child)
+                if helper is not None:
+                    calls[helper.name] = calls.get(helper.name, 0) + count
+            walk(child, times, assignments)
+
+    walk(source.construct, 1, simple_assignments(source.construct))
+    return calls
+
+
+# --- Rules ---
+def check_repeated_builds(source, findings):
+    reported = set()
+
+    def check(scope, varying, where):
+        for call in calls_in(scope):
+            name = call_name(call)
+            if name not in BUILD_CLASSES or id(call) in reported:
+                continue
+            if loaded_names(ast.Tuple(elts=build_args(call), ctx=ast.Load())) & varying:
+                continue
+            reported.add(id(call))
+            findings.append(Finding(
+                rule="repeated-build",
+                line=call.lineno,
+                act=source.act_of(call.lineno),
+                message=f"{short(call)} builds the same {name} {where}",
+                suggestion=f"build it once outside (template = {short(call, 50)}) and use template.copy() here; "
+                           f"each {name} costs {BUILD_CLASSES[name]}, a copy only copies points",
+            ))
+
+    for function in [source.construct, *source.functions.values()]:
+        for node in ast.walk(function):
+            if isinstance(node, (ast.For, ast.While)):
+                check(node, stored_names(node), f"on every pass of the loop at line {node.lineno}")
+            elif isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+                check(node, stored_names(node), f"for every item of the comprehension at line {node.lineno}")
+    for name, count in helper_calls(source).items():
+        if count < 2:
+            continue
+        function = source.functions[name]
+        varying = stored_names(function) | {arg.arg for arg in ast.walk(function.args) if isinstance(arg, ast.arg)}
+        check(function, varying, f"on every call of {name}() ({count} calls)")
+
+    # The same constant mobject built at several places
+    assigned = set()
+    for function in [source.construct, *source.functions.values()]:
+        assigned |= stored_names(function)
+    seen = {}
+    for call in [call for function in [source.construct, *source.functions.values()] for call in calls_in(function)]:
+        if call_name(call) not in BUILD_CLASSES or id(call) in reported:
+            continue
+        if loaded_names(ast.Tuple(elts=build_args(call), ctx=ast.Load())) & assigned:
+            continue
+        seen.setdefault(ast.dump(call), []).append(call)
+    for calls in seen.values():
+        lines = sorted({call.lineno for call in calls})
+        if len(lines) < 2:
+            continue
+        name = call_name(calls[0])
+        findings.append(Finding(
+            rule="repeated-build",
+            line=lines[0],
+            act=source.act_of(lines[0]),
+            message=f"{short(calls[0])} is built {len(lines)} times (lines {', '.join(map(str, lines))})",
+            suggestion=f"keep the first one and use .copy() of it at the other lines, "
+                       f"which skips {BUILD_CLASSES[name]}",
+        ))
+
+
+def is_micro(play):
+    return play.kind == "play" and play.run_time is not None and play.run_time < MICRO_PLAY_SECONDS
+
+
+def check_micro_plays(plays, findings, model):
+    # A loop only repeats a run of micro-plays if nothing else plays inside it
+    mixed = {play.loop for play in plays if play.loop is not None and not is_micro(play)}
+
+    def passes(play):
+        return play.count if play.loop not in mixed else play.count // play.repeat
+
+    def flush(run):
+        count = sum(passes(play) for play in run)
+        if count < MICRO_PLAY_RUN:
+            return
+        seconds = sum(play.run_time * passes(play) for play in run)
+        lengths = sorted({f"{play.run_time:g}s" for play in run})
+        subjects = {play.subject for play in run}
+        first = run[0]
+        if len(subjects) == 1 and None not in subjects:
+            subject = subjects.pop()
+            suggestion = (f"one play: self.play(Wiggle({subject}, scale_value=1, rotation_angle=0.05, "
+                          f"n_wiggles={max(count // 3, 1)}), run_time={seconds:.2g}), or one {subject}.animate "
+                          f"play with a wiggle rate_func")
+        else:
+            suggestion = "merge them into one play (Succession(...) or AnimationGroup(...))"
+        saving = (count - 1) * model.play_seconds if model is not None else None
+        findings.append(Finding(
+            rule="micro-plays",
+            line=first.source_line,
+            act=first.act,
+            message=f"{count} plays of {'/'.join(lengths)} in a row ({seconds:.2f}s of animation), "
+                    f"each hashed and encoded as its own partial movie file",
+            suggestion=suggestion,
+            saving=saving,
+        ))
+
+    run = []
+    for play in plays:
+        if is_micro(play):
+            run.append(play)
+            continue
+        flush(run)
+        run = []
+    flush(run)
+
+
+def check_fadeouts(source, findings, model):
+    functions = [source.construct, *source.functions.values()]
+    for function in functions:
+        for call in calls_in(function):
+            if not is_self_call(call, "play") or keyword(call, "lag_ratio") is not None:
+                continue
+            fadeouts = [arg for arg in call.args if isinstance(arg, ast.Call) and call_name(arg) == "FadeOut"]
+            for arg in call.args:
+                if not isinstance(arg, ast.Starred) or not isinstance(arg.value, (ast.ListComp, ast.GeneratorExp)):
+                    continue
+                comprehension = arg.value
+                element = comprehension.elt
+                if not (isinstance(element, ast.Call) and call_name(element) == "FadeOut" and element.args):
+                    continue
+                generator = comprehension.generators[0]
+                if generator.ifs:
+                    group = ast.unparse(ast.ListComp(elt=element.args[0], generators=comprehension.generators))
+                else:
+                    group = ast.unparse(generator.iter)
+                options = "".join(f", {ast.unparse(kw)}" for kw in element.keywords)
+                findings.append(Finding(
+                    rule="fadeout-each",
+                    line=call.lineno,
+                    act=source.act_of(call.lineno),
+                    message=f"one FadeOut per mobject: {short(arg)}",
+                    suggestion=f"FadeOut(Group(*{short(ast.parse(group, mode='eval').body, 60)}){options}) "
+                               f"fades them together as one animation",
+                ))
+            options = {tuple(ast.unparse(kw) for kw in fadeout.keywords) for fadeout in fadeouts}
+            if len(fadeouts) >= FADEOUT_ARGS and len(options) == 1 and all(fadeout.args for fadeout in fadeouts):
+                names = ", ".join(short(fadeout.args[0], 20) for fadeout in fadeouts)
+                extra = "".join(f", {option}" for option in options.pop())
+                findings.append(Finding(
+                    rule="fadeout-each",
+                    line=call.lineno,
+                    act=source.act_of(call.lineno),
+                    message=f"{len(fadeouts)} FadeOut animations in one play",
+                    suggestion=f"self.play(FadeOut(Group({names}){extra})) fades them together as one animation",
+                ))
+        # A loop with one fading play per pass
+        assignments = simple_assignments(function)
+        for loop in ast.walk(function):
+            if not isinstance(loop, ast.For) or not isinstance(loop.target, ast.Name):
+                continue
+            target = loop.target.id
+            plays = [call for call in calls_in(loop) if is_self_call(call, "play")]
+            if len(plays) != 1 or not any(
+                isinstance(arg, ast.Call) and call_name(arg) == "FadeOut" and arg.args
+                and isinstance(arg.args[0], ast.Name) and arg.args[0].id == target
+                for arg in plays[0].args
+            ):
+                continue
+            times = loop_count(loop, assignments)
+            saving = (times - 1) * model.play_seconds if model is not None and times else None
+            findings.append(Finding(
+                rule="fadeout-each",
+                line=loop.lineno,
+                act=source.act_of(loop.lineno),
+                message=f"one play per mobject to fade out {short(loop.iter, 40)}",
+                suggestion=f"self.play(FadeOut(Group(*{short(loop.iter, 40)}))) in a single play",
+                saving=saving,
+            ))
+
+
+def fades_to_zero(call):
+    """True for ``set_opacity(0)``, ``set_fill(opacity=0)`` and ``fade(1)``."""
+    name = call_name(call)
+    if name == "set_opacity":
+        value = call.args[0] if call.args else keyword(call, "opacity")
+        return value is not None and number(value) == 0
+    if name == "set_fill":
+        value = keyword(call, "opacity")
+        if value is None and len(call.args) > 1:
+            value = call.args[1]
+        return value is not None and number(value) == 0
+    if name == "fade":
+        value = call.args[0] if call.args else keyword(call, "darkness")
+        return value is not None and number(value) == 1
+    return False
+
+
+def removes(call, name):
+    """True if ``call`` takes ``name`` out of the scene (or clears everything)."""
+    if is_self_call(call, "clear"):
+        return True
+    if is_self_call(call, "remove"):
+        return any(name in loaded_names(arg) or "self.mobjects" in ast.unparse(arg) for arg in call.args)
+    if call_name(call) in REMOVERS and call.args:
+        return name in loaded_names(call.args[0])
+    return False
+
+
+def check_invisible(source, findings):
+    for function in [source.construct, *source.functions.values()]:
+        calls = calls_in(function)
+        clears = [
+            node.lineno for node in ast.walk(function)
+            if isinstance(node, (ast.ListComp, ast.GeneratorExp)) and isinstance(node.elt, ast.Call)
+            and call_name(node.elt) in REMOVERS and "self.mobjects" in ast.unparse(node.generators[0].iter)
+        ]
+        for call in calls:
+            if not fades_to_zero(call):
+                continue
+            name = root_name(call.func)
+            if name is None or name == "self":
+                continue
+            later = [other for other in calls if other.lineno > call.lineno]
+            if any(removes(other, name) for other in later) or any(line > call.lineno for line in clears):
+                continue
+            findings.append(Finding(
+                rule="invisible-left",
+                line=call.lineno,
+                act=source.act_of(call.lineno),
+                message=f"{name} is faded to opacity 0 ({short(call, 50)}) and never removed",
+                suggestion=f"FadeOut({name}) removes it at the end of the play, or self.remove({name}) after it; "
+                           f"invisible mobjects are still drawn and hashed",
+            ))
+
+
+def lint_source(source, plays, model=None):
+    findings = []
+    check_repeated_builds(source, findings)
+    check_micro_plays(plays, findings, model)
+    check_fadeouts(source, findings, model)
+    check_invisible(source, findings)
+    return sorted(findings, key=lambda finding: (finding.line, finding.rule))
+
+
+# --- Cost estimate ---
+@dataclass
+class CostModel:
+    pixel_seconds: float            # raster seconds per pixel per frame, all profiles
+    play_seconds: float             # per rendered play: hashing, opening and flushing the encoder
+    act_pixel_seconds: dict         # act -> raster seconds per pixel per frame in this scene's profile
+    act_construct_seconds: dict     # act -> construct seconds in this scene's profile
+    reports: int
+
+    def frame_seconds(self, act, pixels):
+        return self.act_pixel_seconds.get(act, self.pixel_seconds) * pixels
+
+
+def load_cost_model(scene_name, directory=None):
+    """A :class:`CostModel` from the ``--trace`` reports in ``directory``, or ``None`` if there are none."""
+    if directory is None:
+        from manim import config
+        directory = Path(config.media_dir) / "profile"
+    reports = [load_report(path) for path in sorted(Path(directory).glob("*.json")) if not path.name.endswith(".trace.json")]
+    raster = pixel_frames = 0.0
+    overheads = []
+    for report in reports:
+        pixels = report["pixel_width"] * report["pixel_height"]
+        for row in report["plays"]:
+            if row["status"] == "rendered" and row["frames"]:
+                raster += row["raster_seconds"]
+                pixel_frames += row["frames"] * pixels
+                overheads.append(max(row["wall_seconds"] - row["raster_seconds"], 0.0))
+    if not pixel_frames:
+        return None
+    act_pixel_seconds = {}
+    act_construct_seconds = {}
+    own = next((report for report in reports if report["scene"] == scene_name), None)
+    if own is not None:
+        pixels = own["pixel_width"] * own["pixel_height"]
+        for act in act_rows(own):
+            if act["frames"]:
+                act_pixel_seconds[act["act"]] = act["raster_seconds"] / (act["frames"] * pixels)
+            act_construct_seconds[act["act"]] = act["construct_seconds"]
+    return CostModel(
+        pixel_seconds=raster / pixel_frames,
+        play_seconds=statistics.median(overheads),
+        act_pixel_seconds=act_pixel_seconds,
+        act_construct_seconds=act_construct_seconds,
+        reports=len(reports),
+    )
+
+
+def render_settings(source, profile=None):
+    """(pixel width, pixel height, frame rate) the scene renders at, read from its module-level ``config``."""
+    from manim import config
+
+    settings = {key: source.module_config.get(key, config[key]) for key in CONFIG_KEYS}
+    if profile is None:
+        return int(settings["pixel_width"]), int(settings["pixel_height"]), settings["frame_rate"]
+    width, height = profile.pixel_size(settings["frame_width"], settings["frame_height"])
+    return width, height, settings["frame_rate"] / profile.ticks_per_frame(settings["frame_rate"])
+
+
+def static_act_costs(source, plays, settings, model=None):
+    """Per-act estimate from the run times in the source."""
+    width, height, frame_rate = settings
+    acts = {}
+    for play in plays:
+        act = acts.setdefault(play.act, {"act": play.act, "seconds": 0.0, "plays": 0, "frames": 0, "exact": True})
+        run_time = play.run_time if play.run_time is not None else 1.0
+        act["seconds"] += run_time * play.count
+        act["plays"] += play.count
+        act["frames"] += math.ceil(run_time * frame_rate - 1e-9) * play.count
+        act["exact"] = act["exact"] and play.exact
+    return finish_act_costs(source, acts, width * height, model)
+
+
+def dry_run_act_costs(source, entries, settings, model=None):
+    """Per-act estimate from the plays of a dry run."""
+    width, height, frame_rate = settings
+    acts = {}
+    for entry in entries:
+        act = acts.setdefault(entry.act, {"act": entry.act, "seconds": 0.0, "plays": 0, "frames": 0, "exact": True})
+        act["seconds"] += entry.end - entry.start
+        act["plays"] += 1
+        act["frames"] += math.ceil((entry.end - entry.start) * frame_rate - 1e-6)
+    return finish_act_costs(source, acts, width * height, model)
+
+
+def finish_act_costs(source, acts, pixels, model):
+    labels = {act.index: act for act in source.acts}
+    rows = []
+    for index in sorted(acts):
+        row = acts[index]
+        act = labels.get(index)
+        row["label"] = (f"{act.label}: {act.title}" if act.title else act.label) if act else "construct"
+        row["planned"] = [act.planned_start, act.planned_end] if act and act.planned_start is not None else None
+        if model is not None:
+            row["raster_seconds"] = row["frames"] * model.frame_seconds(index, pixels)
+            row["play_seconds"] = row["plays"] * model.play_seconds
+            row["construct_seconds"] = model.act_construct_seconds.get(index, 0.0)
+            row["total_seconds"] = row["raster_seconds"] + row["play_seconds"] + row["construct_seconds"]
+        rows.append(row)
+    return rows
+
+
+# --- Output ---
+def format_findings(path, findings, acts):
+    labels = {act.index: act.label for act in acts}
+    lines = []
+    for finding in findings:
+        where = f" [{labels[finding.act]}]" if finding.act in labels else ""
+        saving = f" (saves ~{finding.saving:.2g}s of render time)" if finding.saving else ""
+        lines.append(f"{path}:{finding.line}: {finding.rule}{where} {finding.message}")
+        lines.append(f"    -> {finding.suggestion}{saving}")
+    return "\n".join(lines)
+
+
+def format_costs(rows, settings, model, dry_run=False):
+    width, height, frame_rate = settings
+    source = "a dry run" if dry_run else "the run times in the source (~: loops or run times it can't count)"
+    if model is None:
+        basis = "no --trace reports in media/profile yet, so frames and plays only"
+    else:
+        basis = f"seconds per frame and per play from {model.reports} --trace report(s)"
+    lines = [
+        f"Estimated at {width}x{height}, {frame_rate:g}fps; plays from {source}",
+        f"Costs: {basis}",
+        f"{'act':<32} {'planned':>9} {'time':>8} {'plays':>6} {'frames':>7}"
+        + (f" {'raster':>8} {'plays':>7} {'construct':>9} {'total':>8}" if model is not None else ""),
+    ]
+    for row in rows:
+        mark = "" if row["exact"] else "~"
+        planned = f"{row['planned'][0]:g}-{row['planned'][1]:g}s" if row["planned"] else ""
+        line = (f"{row['label'][:32]:<32} {planned:>9} {mark + format(row['seconds'], '.1f') + 's':>8} "
+                f"{mark + str(row['plays']):>6} {mark + str(row['frames']):>7}")
+        if model is not None:
+            line += (f" {row['raster_seconds']:>7.1f}s {row['play_seconds']:>6.1f}s "
+                     f"{row['construct_seconds']:>8.1f}s {row['total_seconds']:>7.1f}s")
+        lines.append(line)
+    total = sum(row["seconds"] for row in rows)
+    summary = f"Scene length {total:.1f}s, {sum(row['frames'] for row in rows)} frames"
+    if model is not None:
+        summary += f", about {sum(row['total_seconds'] for row in rows) / 60:.1f} min to render"
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+@dataclass
+class LintReport:
+    source: SceneSource
+    findings: list
+    acts: list                  # per-act rows, see static_act_costs
+    settings: tuple             # (pixel width, pixel height, frame rate)
+    model: CostModel = None
+    dry_run: bool = False
+
+    def to_dict(self):
+        return {
+            "scene": self.source.class_name,
+            "file": str(self.source.path),
+            "findings": [asdict(finding) for finding in self.findings],
+            "acts": self.acts,
+            "pixel_size": list(self.settings[:2]),
+            "frame_rate": self.settings[2],
+            "dry_run": self.dry_run,
+            "model": asdict(self.model) if self.model is not None else None,
+        }
+
+    def format(self):
+        header = f"{self.source.class_name}: {len(self.findings)} finding(s)"
+        findings = format_findings(self.source.path.name, self.findings, self.source.acts)
+        costs = format_costs(self.acts, self.settings, self.model, self.dry_run)
+        return "\n\n".join(part for part in (header, findings, costs) if part)
+
+
+def lint_scene(path, class_name, profile=None, dry_run=None):
+    """Lint one scene; ``dry_run`` is a finished :class:`DryRunRenderer` of it."""
+    source = SceneSource(path, class_name)
+    plays = collect_plays(source)
+    model = load_cost_model(class_name)
+    findings = lint_source(source, plays, model)
+    settings = render_settings(source, profile)
+    if dry_run is None:
+        return LintReport(source, findings, static_act_costs(source, plays, settings, model), settings, model)
+    # The scene itself says what draws nothing; drop the guesses from the source
+    findings = [finding for finding in findings if finding.rule != "invisible-left"]
+    for act, labels in sorted(dry_run.invisible.items()):
+        if labels:
+            findings.append(Finding(
+                rule="invisible-left",
+                line=source.acts[act].line if act < len(source.acts) else source.construct.lineno,
+                act=act,
+                message=f"{len(labels)} mobject(s) in the scene draw nothing at the end of the act: "
+                        f"{', '.join(labels[:5])}{' ...' if len(labels) > 5 else ''}",
+                suggestion="FadeOut them or self.remove them; they are still drawn and hashed with every play",
+            ))
+    rows = dry_run_act_costs(source, dry_run.entries, settings, model)
+    return LintReport(source, findings, rows, settings, model, dry_run=True)
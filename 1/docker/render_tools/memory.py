@@ -0,0 +1,275 @@
+"""
+Memory use per act, with a budget for CI.
+
+Long scenes build hundreds of ``Text`` and ``SVGMobject`` s, and a mobject
+that is faded out but still referenced (kept in a list, held by an updater,
+captured by a closure) stays in memory until the end of the render. With
+``render.py scene --memory`` the renderer takes a sample at every act
+boundary, i.e. when the first play of the next act starts (mobjects built
+for that play still count towards the act before), and once more when the
+scene ends:
+
+* the resident set size, and its peak during the act (Linux resets the
+  peak through ``/proc/self/clear_refs``; elsewhere it is the process peak);
+* the Python heap traced by ``tracemalloc``, its peak during the act, and
+  the lines that allocated the most since the previous boundary, numpy
+  arrays included, each allocation counted at the nearest frame outside the
+  standard library and installed packages (the scene's call, not numpy's);
+* the live mobjects and their points, how many of them are in the scene and
+  how many are only retained by something else;
+* the largest live mobjects with their submobjects, in the scene or not.
+
+``--memory-budget SIZE`` flags the acts whose peak RSS goes over ``SIZE``
+and makes the command exit with status 1, so a CI job can render at the
+``draft-540p30`` profile and fail when an act's memory grows past what it
+used to need. Frame buffers scale with the resolution, so a draft's budget
+is lower than the final's. The report is written to
+``media/memory/<Scene>.json``.
+
+``tracemalloc`` slows Python down noticeably; ``--no-tracemalloc`` keeps
+the RSS and mobject counts only.
+"""
+
+import gc
+import json
+import resource
+import sys
+import sysconfig
+import time
+import tracemalloc
+from pathlib import Path
+
+from manim import config, logger
+from manim.mobject.mobject import Mobject
+
+from .store import format_size
+
+# Frames kept per allocation, enough to get from numpy or manim back to the scene's own code
+TRACEBACK_FRAMES = 16
+# tracemalloc's own bookkeeping, ours and the import machinery's aren't the scene's allocations
+ALLOCATION_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__, all_frames=True),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+LIBRARY_PATHS = tuple({sysconfig.get_paths()[name] for name in ("stdlib", "purelib", "platlib")})
+
+
+def read_rss():
+    """(current RSS, peak RSS) of this process in bytes; the current size is ``None`` where unknown."""
+    try:
+        status = Path("/proc/self/status").read_text()
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, KiB elsewhere
+        return None, peak if sys.platform == "darwin" else peak * 1024
+    values = {}
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "VmHWM"):
+            values[key] = int(value.split()[0]) * 1024
+    return values.get("VmRSS"), values.get("VmHWM")
+
+
+def reset_peak_rss():
+    """Restart the peak RSS from the current size; ``False`` where that isn't possible."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def allocation_site(traceback):
+    """The most recent frame of ``traceback`` outside the standard library and installed packages."""
+    frames = [frame for frame in traceback if not frame.filename.startswith(LIBRARY_PATHS)] or list(traceback)
+    # Oldest first
+    return f"{frames[-1].filename}:{frames[-1].lineno}"
+
+
+def mobject_bytes(mobject):
+    """Bytes of the arrays held by ``mobject`` itself (not its submobjects)."""
+    size = 0
+    for name in ("points", "pixel_array", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas"):
+        array = mobject.__dict__.get(name)
+        size += getattr(array, "nbytes", 0)
+    return size
+
+
+def mobject_label(mobject):
+    """A short description: the text of a ``Text``, the file of an SVG or image."""
+    label = getattr(mobject, "text", None) or getattr(mobject, "file_name", None) or getattr(mobject, "path", None)
+    if not isinstance(label, (str, Path)):
+        return type(mobject).__name__
+    label = " ".join(str(label).split())
+    return f"{type(mobject).__name__} {label[:40]!r}"
+
+
+class MemoryGuard:
+    """Samples memory at every act boundary; ``over_budget`` lists the acts above ``budget`` bytes."""
+
+    def __init__(self, budget=None, allocations=True, top=10, directory=None):
+        self.budget = budget
+        self.allocations = allocations
+        self.top = top
+        self.directory = Path(directory) if directory else Path(config.media_dir) / "memory"
+        self.samples = []
+        self.over_budget = []
+        self.started_tracing = False
+        self.snapshot = None
+
+    def start(self, renderer):
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEBACK_FRAMES)
+            self.started_tracing = True
+        if self.allocations:
+            tracemalloc.reset_peak()
+            self.snapshot = tracemalloc.take_snapshot().filter_traces(ALLOCATION_FILTERS)
+        self.peak_resets = reset_peak_rss()
+        self.previous_rss = read_rss()[0]
+        self.act_start = renderer.time
+
+    def sample(self, renderer, act):
+        """Record the act ``act`` that just ended."""
+        started = time.perf_counter()
+        gc.collect()
+        rss, peak_rss = read_rss()
+        sample = {
+            "act": act,
+            "label": self.act_label(renderer, act),
+            "start": round(self.act_start, 3),
+            "end": round(renderer.time, 3),
+            "rss": rss,
+            "peak_rss": peak_rss,
+            "rss_growth": rss - self.previous_rss if rss is not None and self.previous_rss is not None else None,
+            "peak_is_per_act": self.peak_resets,
+        }
+        if self.allocations:
+            sample.update(self.allocation_stats())
+        sample.update(self.mobject_stats(renderer.scene))
+        limit = peak_rss if peak_rss is not None else rss
+        sample["over_budget"] = self.budget is not None and limit is not None and limit > self.budget
+        sample["sample_seconds"] = round(time.perf_counter() - started, 3)
+        self.samples.append(sample)
+        if sample["over_budget"]:
+            self.over_budget.append(sample)
+        logger.info(format_sample(sample))
+        # The next act starts here
+        self.peak_resets = reset_peak_rss()
+        self.previous_rss = rss
+        self.act_start = renderer.time
+
+    def act_label(self, renderer, act):
+        for entry in renderer.acts:
+            if entry.index == act:
+                return f"{entry.label}: {entry.title}" if entry.title else entry.label
+        return f"act {act}"
+
+    def allocation_stats(self):
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(ALLOCATION_FILTERS)
+        sites = {}
+        for stat in snapshot.compare_to(self.snapshot, "traceback"):
+            site = sites.setdefault(allocation_site(stat.traceback), {"size_diff": 0, "size": 0, "count_diff": 0})
+            for key in site:
+                site[key] += getattr(stat, key)
+        self.snapshot = snapshot
+        tracemalloc.reset_peak()
+        growth = sorted(sites.items(), key=lambda item: item[1]["size_diff"], reverse=True)
+        return {
+            "python_bytes": current,
+            "python_peak": peak,
+            "allocations": [{"where": where, **site} for where, site in growth[:self.top] if site["size_diff"] > 0],
+        }
+
+    def mobject_stats(self, scene):
+        live = [obj for obj in gc.get_objects() if isinstance(obj, Mobject)]
+        in_scene = {id(mobject) for mobject in scene.get_mobject_family_members()}
+        children = {id(sub) for mobject in live for sub in mobject.submobjects}
+        sizes = {id(mobject): mobject_bytes(mobject) for mobject in live}
+        largest = []
+        for mobject in live:
+            if id(mobject) in children:
+                continue
+            family = mobject.get_family()
+            largest.append({
+                "mobject": mobject_label(mobject),
+                "bytes": sum(sizes.get(id(member), 0) for member in family),
+                "family": len(family),
+                "in_scene": id(mobject) in in_scene,
+            })
+        largest.sort(key=lambda entry: entry["bytes"], reverse=True)
+        retained = [mobject for mobject in live if id(mobject) not in in_scene]
+        return {
+            "mobjects": len(live),
+            "scene_mobjects": len(in_scene),
+            "retained_mobjects": len(retained),
+            "retained_bytes": sum(sizes[id(mobject)] for mobject in retained),
+            "points": sum(len(mobject.points) for mobject in live),
+            "mobject_bytes": sum(sizes.values()),
+            "largest": largest[:self.top],
+        }
+
+    def finish(self, renderer):
+        """Sample the last act, write the report and log the summary. Returns the report path."""
+        act = renderer.current_act
+        if renderer.last_act is not None:
+            # A render ended early by --last-act stops at the first play of the act after it
+            act = min(act, renderer.last_act)
+        if not any(sample["act"] == act for sample in self.samples):
+            self.sample(renderer, act)
+        if self.started_tracing:
+            tracemalloc.stop()
+        self.snapshot = None
+        report = {
+            "scene": type(renderer.scene).__name__,
+            "budget": self.budget,
+            "pixels": [config.pixel_width, config.pixel_height],
+            "acts": self.samples,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{report['scene']}.json"
+        path.write_text(json.dumps(report, indent=1), encoding="utf-8")
+        logger.info(f"Memory report written to {path}\n" + format_report(report))
+        return path
+
+
+# --- Tables ---
+def format_bytes(size):
+    return "-" if size is None else format_size(size)
+
+
+def format_sample(sample):
+    peak = f" (peak {format_bytes(sample['peak_rss'])})" if sample["peak_rss"] is not None else ""
+    return (
+        f"Memory after {sample['label']}: RSS {format_bytes(sample['rss'])}{peak}, "
+        f"{sample['mobjects']} mobjects ({sample['retained_mobjects']} outside the scene), "
+        f"{sample['points']} points"
+    )
+
+
+def format_report(report):
+    lines = [f"{'act':<32} {'RSS':>10} {'peak RSS':>10} {'growth':>10} {'py peak':>10} "
+             f"{'mobjects':>8} {'retained':>8} {'points':>9}"]
+    for sample in report["acts"]:
+        flag = "  OVER BUDGET" if sample["over_budget"] else ""
+        lines.append(
+            f"{sample['label'][:32]:<32} {format_bytes(sample['rss']):>10} {format_bytes(sample['peak_rss']):>10} "
+            f"{format_bytes(sample['rss_growth']):>10} {format_bytes(sample.get('python_peak')):>10} "
+            f"{sample['mobjects']:>8} {sample['retained_mobjects']:>8} {sample['points']:>9}{flag}"
+        )
+    for sample in report["acts"]:
+        if not sample["over_budget"]:
+            continue
+        lines.append(f"\n{sample['label']} is over the budget of {format_size(report['budget'])}; largest mobjects:")
+        for entry in sample["largest"]:
+            where = "in the scene" if entry["in_scene"] else "retained outside the scene"
+            lines.append(f"  {format_size(entry['bytes']):>10}  {entry['mobject']} "
+                         f"({entry['family']} in family, {where})")
+        if sample.get("allocations"):
+            lines.append("  Most allocated since the previous act:")
+            for stat in sample["allocations"]:
+                lines.append(f"  {format_size(stat['size_diff']):>10}  {stat['where']}")
+    return "\n".join(lines)
@@ -0,0 +1,128 @@
+"""
+Render every act of a scene in its own worker process and stitch the results.
+
+``construct`` is one Python function, so its execution point cannot be
+pickled and resumed elsewhere. Instead each worker replays ``construct`` with
+rasterization off up to its act boundary (cheap: no frames, no encoding),
+takes a snapshot of the scene state there (time offset, mobjects in z-order,
+sound cues so far), renders its own act and stops at the next boundary.
+
+The stitcher checks that the snapshot each worker took when leaving its act
+matches the snapshot the next worker took when entering it, then joins all
+partial movie files in order and mixes every sound cue once at its absolute
+scene time.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from manim import config, logger
+
+from .acts import find_acts_in_file
+from .encode import SoundCue, concat_movies, mix_cues, mux_audio
+from .runner import load_scene, render_scene
+
+
+def render_act(scene_file, scene_name, act_index, manifest_dir):
+    """Worker: render one act (``None``: the whole scene) and write its manifest. Returns the manifest path."""
+    scene_class = load_scene(scene_file, scene_name)
+    config.progress_bar = "none"
+    started = time.perf_counter()
+    renderer = render_scene(scene_class, first_act=act_index, last_act=act_index, defer_audio=True)
+    file_writer = renderer.file_writer
+    if act_index is None:
+        act = {"index": 0}
+    else:
+        act = renderer.acts[act_index].to_dict() if renderer.acts else {"index": 0}
+    manifest = {
+        "scene": scene_name,
+        "act": act,
+        "entry": renderer.window_start,
+        "exit": renderer.window_end,
+        "partial_movie_files": [path for path in file_writer.partial_movie_files if path],
+        "sound_cues": [
+            cue.to_dict() for cue in file_writer.sound_cues if act_index is None or cue.act == act_index
+        ],
+        "movie_file": str(file_writer.movie_file_path),
+        "render_seconds": round(time.perf_counter() - started, 3),
+    }
+    name = "scene.json" if act_index is None else f"act_{act_index:02d}.json"
+    path = Path(manifest_dir) / name
+    path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return str(path)
+
+
+def check_snapshots(manifests):
+    """Raise if consecutive acts don't agree on the scene state at their shared boundary."""
+    for before, after in zip(manifests, manifests[1:]):
+        leaving, entering = before["exit"], after["entry"]
+        if entering is None:
+            raise RuntimeError(f"Act {after['act']['index']} played no animations")
+        for key in ("time", "num_plays", "mobjects"):
+            if key == "time":
+                # rendered acts sum frame by frame, replayed ones multiply: allow float noise
+                mismatch = abs(leaving[key] - entering[key]) > 1e-3
+            else:
+                mismatch = leaving[key] != entering[key]
+            if mismatch:
+                raise RuntimeError(
+                    f"Acts {before['act']['index']} and {after['act']['index']} disagree on "
+                    f"'{key}' at their boundary ({leaving[key]!r} != {entering[key]!r}). "
+                    "Is construct deterministic (random_seed, no wall-clock input)?"
+                )
+
+
+def stitch_acts(manifests, output_file=None):
+    """Join per-act partial movie files and mix all sound cues into one movie."""
+    check_snapshots(manifests)
+    output_file = Path(output_file or manifests[0]["movie_file"])
+    partial_movie_files = [path for manifest in manifests for path in manifest["partial_movie_files"]]
+    if not partial_movie_files:
+        raise RuntimeError("No animations were rendered")
+    concat_movies(partial_movie_files, output_file)
+
+    cues = [SoundCue(**cue) for manifest in manifests for cue in manifest["sound_cues"]]
+    if cues:
+        duration = manifests[-1]["exit"]["time"]
+        mux_audio(output_file, mix_cues(sorted(cues, key=lambda cue: cue.time), duration=duration))
+    return output_file
+
+
+def render_acts_parallel(scene_file, scene_name, jobs=None, output_file=None):
+    """Render all acts of ``scene_name`` on a process pool and stitch them into one movie."""
+    acts = find_acts_in_file(scene_file, scene_name)
+    act_indices = list(range(len(acts))) or [0]
+    jobs = min(jobs or os.cpu_count() or 1, len(act_indices))
+    manifest_dir = Path(config.media_dir) / "acts" / scene_name
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Rendering {len(act_indices)} acts of {scene_name} on {jobs} processes")
+    started = time.perf_counter()
+    manifest_paths = {}
+    # spawn: every worker imports the scene module (and its config) fresh
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        futures = {
+            pool.submit(render_act, str(scene_file), scene_name, index, str(manifest_dir)): index
+            for index in act_indices
+        }
+        for future in as_completed(futures):
+            manifest_paths[futures[future]] = future.result()
+            logger.info(f"Act {futures[future]} done")
+
+    manifests = [
+        json.loads(Path(manifest_paths[index]).read_text(encoding="utf-8"))
+        for index in act_indices
+    ]
+    movie = stitch_acts(manifests, output_file)
+    slowest = max(manifests, key=lambda manifest: manifest["render_seconds"])
+    logger.info(
+        f"Stitched {movie} in {time.perf_counter() - started:.1f}s "
+        f"(slowest act: {slowest['act'].get('label', slowest['act']['index'])}, "
+        f"{slowest['render_seconds']:.1f}s)"
+    )
+    return movie
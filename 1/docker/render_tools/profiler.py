@@ -0,0 +1,387 @@
+"""
+Per-play render profile and Chrome trace.
+
+``render_log.txt`` only shows progress bars and "Using cached data" lines.
+With ``render.py scene --trace``, the renderer records the following for
+every ``play``/``wait``:
+
+* construct: Python time in ``construct`` since the previous play, which
+  builds the mobjects (``Text`` layout, SVG parsing...);
+* hash: time spent hashing the play for the cache;
+* raster: time spent drawing frames on the main thread, with the frame count;
+* encode: time the writer thread spent encoding and flushing its frames;
+* whether the play was rendered, taken from the cache, resumed from a
+  checkpoint, or skipped (outside the render window);
+* how many sound cues (``add_sound_safe``) were added since the previous play.
+
+The rows are written to ``media/profile/<Scene>.json``. A Chrome
+trace-event file ``<Scene>.trace.json`` sits next to it; load it in
+``chrome://tracing`` or https://ui.perfetto.dev. The trace has one track
+for construct, hashing and every drawn frame, one for the encoder, and one
+for the acts. At the end of the render the slowest plays and the time per
+act are printed, and ``render.py trace`` prints the table again, sorted by
+any column.
+
+``--log-plays`` replaces manim's progress bars with one log line per play.
+Without ``--trace`` it keeps only the sums per play (no single frames, no
+trace file), which costs a few dictionary updates per frame.
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# manim's logger. manim itself is imported where a render needs it, so `render.py trace`
+# and `render.py lint` read reports without loading it
+logger = logging.getLogger("manim")
+
+# Columns of the play table that can be sorted on, and the row value for each
+SORT_KEYS = {
+    "wall": lambda row: row["wall_seconds"],
+    "raster": lambda row: row["raster_seconds"],
+    "frame": lambda row: row["raster_seconds"] / row["frames"] if row["frames"] else 0.0,
+    "encode": lambda row: row["encode_seconds"],
+    "hash": lambda row: row["hash_seconds"],
+    "construct": lambda row: row["construct_seconds"],
+    "frames": lambda row: row["frames"],
+    "cues": lambda row: row["cues"],
+    "start": lambda row: -row["start"],
+}
+
+
+@dataclass
+class PlayRecord:
+    index: int
+    act: int
+    animations: str
+    start: float                # scene time
+    end: float
+    status: str                 # rendered, cached, resumed or skipped
+    frames: int
+    cues: int
+    construct_seconds: float
+    hash_seconds: float
+    raster_seconds: float
+    encode_seconds: float
+    wall_start: float           # seconds since the render started
+    wall_seconds: float         # the play itself, without construct
+
+
+def describe(animations):
+    names = [type(animation).__name__.lstrip("_") for animation in animations or []]
+    if len(names) > 3:
+        return f"{', '.join(names[:3])} +{len(names) - 3}"
+    return ", ".join(names)
+
+
+class RenderProfiler:
+    def __init__(self, trace=True, log_plays=False, directory=None):
+        self.trace = trace
+        self.log_plays = log_plays
+        if directory is None:
+            from manim import config
+            directory = Path(config.media_dir) / "profile"
+        self.directory = Path(directory)
+        self.records = []
+        self.spans = []             # (track, name, wall start, seconds, args) for the trace
+        self.timing = None
+        self.lock = threading.Lock()
+        self.combine_seconds = 0.0
+
+    # --- Instrumentation ---
+    def attach(self, renderer):
+        """Wrap the renderer's and its file writer's hot methods. Call once the file writer exists."""
+        self.origin = time.perf_counter()
+        self.last_end = self.origin
+        self.overhead_seconds = 0.0
+        self.cues_before = 0
+        self.reset()
+        renderer.render = self.timed(renderer.render, "raster")
+        renderer.update_frame = self.timed(renderer.update_frame, "raster")
+        file_writer = renderer.file_writer
+        file_writer.write_frame = self.counted(file_writer.write_frame)
+        file_writer.encode_and_write_frame = self.encoded(file_writer.encode_and_write_frame)
+        file_writer.close_partial_movie_stream = self.flushed(file_writer.close_partial_movie_stream)
+        file_writer.is_already_cached = self.cache_lookup(file_writer.is_already_cached)
+        file_writer.finish = self.combined(file_writer.finish)
+
+    @contextlib.contextmanager
+    def timing_hashes(self):
+        """Time every play hash while active (enter it after ``portable_hashing``)."""
+        from manim.renderer import cairo_renderer
+
+        original = cairo_renderer.get_hash_from_play_call
+        cairo_renderer.get_hash_from_play_call = self.timed(original, "hash")
+        try:
+            yield
+        finally:
+            cairo_renderer.get_hash_from_play_call = original
+
+    @contextlib.contextmanager
+    def overhead(self, name):
+        """Time the render tools' own work between plays (a memory sample...) as ``name``, not as construct."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.overhead_seconds += seconds
+            if self.trace:
+                self.spans.append(("scene", name, started, seconds, None))
+
+    def reset(self):
+        with self.lock:
+            self.seconds = {"hash": 0.0, "raster": 0.0, "encode": 0.0}
+        self.frames = 0
+        self.cached = False
+
+    def timed(self, function, kind):
+        """Main thread: time the outermost call of ``function`` as ``kind``."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if self.timing is not None:
+                return function(*args, **kwargs)
+            self.timing = kind
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.timing = None
+                seconds = time.perf_counter() - started
+                self.seconds[kind] += seconds
+                if self.trace:
+                    self.spans.append(("scene", kind, started, seconds, None))
+        return wrapper
+
+    def encoded(self, function):
+        """Writer thread (and the flush on the main thread): time as encode."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                with self.lock:
+                    self.seconds["encode"] += seconds
+                    if self.trace:
+                        self.spans.append(("encoder", "encode", started, seconds, None))
+        return wrapper
+
+    def flushed(self, close):
+        """Main thread: time closing a stream as encode, less the writer thread's encoding it waits for."""
+        @functools.wraps(close)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            encoded = self.seconds["encode"]
+            try:
+                return close(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                with self.lock:
+                    flush = max(0.0, seconds - (self.seconds["encode"] - encoded))
+                    self.seconds["encode"] += flush
+                    if self.trace:
+                        self.spans.append(("scene", "flush", started, seconds, None))
+        return wrapper
+
+    def counted(self, write_frame):
+        @functools.wraps(write_frame)
+        def wrapper(frame, num_frames=1):
+            self.frames += num_frames
+            return write_frame(frame, num_frames)
+        return wrapper
+
+    def cache_lookup(self, is_already_cached):
+        @functools.wraps(is_already_cached)
+        def wrapper(hash_invocation):
+            self.cached = is_already_cached(hash_invocation)
+            return self.cached
+        return wrapper
+
+    def combined(self, finish):
+        @functools.wraps(finish)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return finish(*args, **kwargs)
+            finally:
+                self.combine_seconds = time.perf_counter() - started
+                if self.trace:
+                    self.spans.append(("scene", "combine and mix", started, self.combine_seconds, None))
+        return wrapper
+
+    # --- Plays ---
+    def begin_play(self):
+        self.play_started = time.perf_counter()
+        self.construct_seconds = self.play_started - self.last_end - self.overhead_seconds
+        self.overhead_seconds = 0.0
+        if self.trace:
+            self.spans.append(("scene", "construct", self.last_end, self.construct_seconds, None))
+
+    def end_play(self, renderer, scene, start_time):
+        ended = time.perf_counter()
+        hash_animation = renderer.animations_hashes[-1]
+        if hash_animation is None:
+            status = "skipped"
+        elif renderer.resumed_entry is not None:
+            status = "resumed"
+        elif self.cached:
+            status = "cached"
+        else:
+            status = "rendered"
+        cues = len(renderer.file_writer.sound_cues)
+        record = PlayRecord(
+            index=renderer.num_plays - 1,
+            act=renderer.current_act,
+            animations=describe(scene.animations),
+            start=round(start_time, 6),
+            end=round(renderer.time, 6),
+            status=status,
+            frames=self.frames,
+            cues=cues - self.cues_before,
+            construct_seconds=round(self.construct_seconds, 6),
+            hash_seconds=round(self.seconds["hash"], 6),
+            raster_seconds=round(self.seconds["raster"], 6),
+            encode_seconds=round(self.seconds["encode"], 6),
+            wall_start=round(self.play_started - self.origin, 6),
+            wall_seconds=round(ended - self.play_started, 6),
+        )
+        self.records.append(record)
+        self.cues_before = cues
+        self.last_end = ended
+        if self.trace:
+            self.spans.append(("plays", f"{record.index} {record.animations}", self.play_started,
+                               ended - self.play_started, asdict(record)))
+        if self.log_plays:
+            logger.info(format_play(asdict(record)))
+        self.reset()
+
+    # --- Output ---
+    def report(self, renderer):
+        from manim import config
+
+        return {
+            "scene": type(renderer.scene).__name__,
+            "pixel_width": config.pixel_width,
+            "pixel_height": config.pixel_height,
+            "frame_rate": config.frame_rate,
+            "acts": [act.to_dict() for act in renderer.acts],
+            "plays": [asdict(record) for record in self.records],
+            "combine_seconds": round(self.combine_seconds, 6),
+            "wall_seconds": round(time.perf_counter() - self.origin, 6),
+        }
+
+    def finish(self, renderer):
+        """Write the report and the trace, and log the summary. Returns the report path."""
+        report = self.report(renderer)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{report['scene']}.json"
+        path.write_text(json.dumps(report, indent=1), encoding="utf-8")
+        if self.trace:
+            trace_path = self.directory / f"{report['scene']}.trace.json"
+            trace_path.write_text(json.dumps(self.trace_events(report)), encoding="utf-8")
+            logger.info(f"Chrome trace written to {trace_path}")
+        logger.info("\n" + format_table(report, top=15) + "\n\n" + format_acts(report))
+        return path
+
+    def trace_events(self, report):
+        tracks = {"acts": 1, "plays": 2, "scene": 3, "encoder": 4}
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+            for name, tid in tracks.items()
+        ]
+        events.append({"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": report["scene"]}})
+        for track, name, started, seconds, args in self.spans:
+            event = {
+                "name": name, "ph": "X", "pid": 1, "tid": tracks[track],
+                "ts": round((started - self.origin) * 1e6, 1), "dur": round(seconds * 1e6, 1),
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        for act in act_rows(report):
+            events.append({
+                "name": act["label"], "ph": "X", "pid": 1, "tid": tracks["acts"],
+                "ts": round(act["wall_start"] * 1e6, 1), "dur": round(act["wall_seconds"] * 1e6, 1),
+                "args": act,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+# --- Tables ---
+def format_play(row):
+    per_frame = f"{1000 * row['raster_seconds'] / row['frames']:.1f} ms/frame" if row["frames"] else "no frames"
+    cues = f", {row['cues']} cue{'s' if row['cues'] > 1 else ''}" if row["cues"] else ""
+    return (
+        f"Play {row['index']} (act {row['act']}, {row['status']}) {row['animations']} "
+        f"{row['start']:.2f}-{row['end']:.2f}s: {row['frames']} frames, {per_frame}, "
+        f"encode {1000 * row['encode_seconds']:.0f} ms, hash {1000 * row['hash_seconds']:.0f} ms, "
+        f"construct {1000 * row['construct_seconds']:.0f} ms{cues}"
+    )
+
+
+def format_table(report, sort="wall", top=None):
+    """The plays of ``report``, most expensive ``sort`` column first (``start``: in scene order)."""
+    rows = sorted(report["plays"], key=SORT_KEYS[sort], reverse=True)
+    if top:
+        rows = rows[:top]
+    lines = [
+        f"{'play':>5} {'act':>4} {'start':>8} {'len':>6} {'status':<8} {'frames':>6} {'construct':>9} "
+        f"{'hash':>7} {'raster':>8} {'ms/frame':>8} {'encode':>8} {'wall':>8} {'cues':>4}  animations"
+    ]
+    for row in rows:
+        per_frame = 1000 * row["raster_seconds"] / row["frames"] if row["frames"] else 0.0
+        lines.append(
+            f"{row['index']:>5} {row['act']:>4} {row['start']:>8.2f} {row['end'] - row['start']:>6.2f} "
+            f"{row['status']:<8} {row['frames']:>6} {row['construct_seconds']:>9.3f} {row['hash_seconds']:>7.3f} "
+            f"{row['raster_seconds']:>8.3f} {per_frame:>8.2f} {row['encode_seconds']:>8.3f} "
+            f"{row['wall_seconds']:>8.3f} {row['cues']:>4}  {row['animations']}"
+        )
+    return "\n".join(lines)
+
+
+def act_rows(report):
+    """Totals per act of ``report``, in scene order."""
+    labels = {act["index"]: f"{act['label']}: {act['title']}" if act["title"] else act["label"]
+              for act in report["acts"]}
+    acts = {}
+    for row in report["plays"]:
+        act = acts.setdefault(row["act"], {
+            "act": row["act"], "label": labels.get(row["act"], f"act {row['act']}"),
+            "plays": 0, "start": row["start"], "end": row["end"],
+            "wall_start": row["wall_start"] - row["construct_seconds"], "wall_seconds": 0.0,
+            "construct_seconds": 0.0, "raster_seconds": 0.0, "encode_seconds": 0.0, "frames": 0,
+        })
+        act["plays"] += 1
+        act["end"] = row["end"]
+        act["frames"] += row["frames"]
+        for key in ("construct_seconds", "raster_seconds", "encode_seconds"):
+            act[key] += row[key]
+        act["wall_seconds"] += row["wall_seconds"] + row["construct_seconds"]
+    return [acts[index] for index in sorted(acts)]
+
+
+def format_acts(report):
+    rows = act_rows(report)
+    total = sum(act["wall_seconds"] for act in rows) or 1.0
+    lines = [f"{'act':<32} {'scene time':>13} {'plays':>5} {'frames':>6} {'construct':>9} {'raster':>8} "
+             f"{'encode':>8} {'wall':>8} {'share':>6}"]
+    for act in rows:
+        span = f"{act['start']:.1f}-{act['end']:.1f}s"
+        lines.append(
+            f"{act['label'][:32]:<32} {span:>13} {act['plays']:>5} {act['frames']:>6} "
+            f"{act['construct_seconds']:>9.2f} {act['raster_seconds']:>8.2f} {act['encode_seconds']:>8.2f} "
+            f"{act['wall_seconds']:>8.2f} {100 * act['wall_seconds'] / total:>5.1f}%"
+        )
+    lines.append(f"Combine and mix: {report['combine_seconds']:.2f}s; render wall time {report['wall_seconds']:.1f}s")
+    return "\n".join(lines)
+
+
+def load_report(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
@@ -0,0 +1,149 @@
+"""
+Named render profiles: drafts and review copies with the final's timing.
+
+Every scene file sets 1080x1920 at 60fps when it is imported, so ``-ql``
+gives odd results and drafts meant editing those lines. A profile is picked
+with ``render.py scene --profile NAME`` (or ``RENDER_PROFILE=NAME``, which is
+what worker processes see) and is applied on top of the scene's geometry:
+the frame stays 9x16 scene units, and the profile's size is the short side
+in pixels, so ``draft-540p30`` renders at 540x960.
+
+The scene's own frame rate stays the clock. ``construct`` runs exactly as in
+the final: every play and wait takes the same number of 60fps ticks, and
+every sound cue lands at the same scene time, down to the float. A 30fps
+profile rasterizes and encodes only the ticks on its own grid (every other
+one); the ticks in between move the scene time without being drawn. A frame
+of the draft therefore shows exactly what the final shows at that time.
+
+Draft profiles also take rasterization shortcuts (see :class:`ProfileCamera`):
+faster cairo antialiasing, no vector mobjects fainter than a threshold (glow
+rings and halos while they fade, the background grid), and bilinear instead
+of bicubic resampling of ``ImageMobject`` s. Timing never depends on them.
+"""
+
+import contextlib
+import os
+from dataclasses import dataclass
+
+import cairo
+import numpy as np
+
+from manim import config
+from manim.constants import RESAMPLING_ALGORITHMS
+
+PROFILE_ENV = "RENDER_PROFILE"
+
+ANTIALIAS = {
+    "default": cairo.ANTIALIAS_DEFAULT,
+    "fast": cairo.ANTIALIAS_FAST,
+    "none": cairo.ANTIALIAS_NONE,
+}
+
+
+@dataclass
+class RenderProfile:
+    name: str
+    size: int                       # short side of the frame in pixels
+    frame_rate: float
+    antialias: str = "default"      # see ANTIALIAS
+    faint_opacity: float = 0.0      # vector mobjects less opaque than this aren't drawn
+    image_resampling: str = None    # RESAMPLING_ALGORITHMS name for ImageMobjects; None keeps theirs
+
+    @property
+    def shortcuts(self):
+        return self.antialias != "default" or self.faint_opacity > 0 or self.image_resampling is not None
+
+    def pixel_size(self, frame_width, frame_height):
+        """(pixel width, pixel height) for a frame of ``frame_width`` x ``frame_height`` scene units."""
+        long_side = 2 * round(self.size * max(frame_width, frame_height) / min(frame_width, frame_height) / 2)
+        if frame_width <= frame_height:
+            return self.size, long_side
+        return long_side, self.size
+
+    def ticks_per_frame(self, scene_frame_rate):
+        """Ticks of the scene's clock per output frame."""
+        step = scene_frame_rate / self.frame_rate
+        if step < 1 or abs(step - round(step)) > 1e-9:
+            raise ValueError(
+                f"Profile {self.name} needs a frame rate that divides the scene's {scene_frame_rate:g}fps"
+            )
+        return round(step)
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in [
+        RenderProfile("draft-540p30", 540, 30, antialias="fast", faint_opacity=0.15, image_resampling="bilinear"),
+        RenderProfile("review-720p60", 720, 60),
+        RenderProfile("final-1080p60", 1080, 60),
+    ]
+}
+
+
+def get_profile(name):
+    if name not in PROFILES:
+        raise ValueError(f"Unknown render profile '{name}' (known: {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+def current_profile():
+    """The profile named by ``RENDER_PROFILE``, or ``None``."""
+    name = os.environ.get(PROFILE_ENV)
+    return get_profile(name) if name else None
+
+
+def apply_profile(profile):
+    """Set the pixel size of ``profile`` (after the scene file has set its ``config``)."""
+    if profile is not None:
+        config.pixel_width, config.pixel_height = profile.pixel_size(config.frame_width, config.frame_height)
+
+
+@contextlib.contextmanager
+def output_frame_rate(frame_rate):
+    """Make manim open its video streams at ``frame_rate`` instead of the scene's rate."""
+    scene_frame_rate = config.frame_rate
+    config.frame_rate = frame_rate
+    try:
+        yield
+    finally:
+        config.frame_rate = scene_frame_rate
+
+
+# --- Shortcuts ---
+def max_opacity(vmobject):
+    """Highest fill or (drawn) stroke opacity of ``vmobject`` itself."""
+    opacities = [vmobject.get_fill_opacities()]
+    for background in (False, True):
+        if vmobject.get_stroke_width(background=background) > 0:
+            opacities.append(vmobject.get_stroke_opacities(background=background))
+    return max((float(np.max(values)) for values in opacities if len(values)), default=0.0)
+
+
+class ProfileCamera:
+    """Camera mixin for a profile's shortcuts; ``render_profile`` is set by the renderer."""
+
+    render_profile = None
+
+    def display_vectorized(self, vmobject, ctx):
+        profile = self.render_profile
+        if profile.faint_opacity and max_opacity(vmobject) < profile.faint_opacity:
+            return self
+        # Per mobject: the tiled and dirty-rect cameras make their own contexts
+        ctx.set_antialias(ANTIALIAS[profile.antialias])
+        return super().display_vectorized(vmobject, ctx)
+
+    def display_image_mobject(self, image_mobject, pixel_array):
+        profile = self.render_profile
+        if profile.image_resampling is None:
+            return super().display_image_mobject(image_mobject, pixel_array)
+        resampling = image_mobject.resampling_algorithm
+        image_mobject.resampling_algorithm = RESAMPLING_ALGORITHMS[profile.image_resampling]
+        try:
+            return super().display_image_mobject(image_mobject, pixel_array)
+        finally:
+            image_mobject.resampling_algorithm = resampling
+
+
+def profile_camera_class(camera_class):
+    """``camera_class`` with :class:`ProfileCamera` mixed in."""
+    return type(f"Profile{camera_class.__name__}", (ProfileCamera, camera_class), {})
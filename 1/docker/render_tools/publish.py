@@ -0,0 +1,437 @@
+"""
+Publish finished movies: the Python replacement for ``clean_media.sh``.
+
+For each final movie one pass over the file does everything at once:
+
+- the video packets are kept as they are (no re-encode) for the published
+  copy, which is written with the ``moov`` atom up front (fast start) so it
+  plays while it downloads;
+- the audio is decoded, its integrated loudness measured (ITU-R BS.1770:
+  K-weighting, 400ms blocks, absolute and relative gates) and normalized
+  to ``target_lufs`` without letting the peak go over ``peak_ceiling``;
+- the decoded frames go to a preview encoder thread (half size, low bitrate)
+  that also saves the poster frame.
+
+The published movie, ``<name>.jpg`` and ``<name>.preview.mp4`` land in
+``video/`` like the shell script did, and the source is removed from
+``media/videos``. A :class:`Publisher` takes movies as they are finished,
+so scenes rendered back to back are published while the next one renders.
+``video/publish.json`` records what was published from which source, so
+running ``render.py publish`` again only handles new renders.
+"""
+
+import heapq
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from pathlib import Path
+
+import av
+import numpy as np
+
+# manim's logger. manim itself is imported where its config or version is needed, so the
+# loudness measurement (and its tests) doesn't load it
+logger = logging.getLogger("manim")
+
+TARGET_LUFS = -14.0
+PEAK_CEILING = -1.0
+PREVIEW_WIDTH = 540
+PREVIEW_RATE = 30
+PREVIEW_BITRATE = 800_000
+PREVIEW_AUDIO_BITRATE = 64_000
+AUDIO_BITRATE = 192_000
+POSTER_TIME = 2.0
+
+# Ends the preview thread's queue
+CLOSE = object()
+
+
+# --- Loudness ---
+def biquad_response(b, a, frequencies, rate):
+    """Complex response of a biquad at ``frequencies`` (Hz)."""
+    z = np.exp(-1j * 2 * np.pi * frequencies / rate)
+    return (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+
+
+def k_weighting(frequencies, rate):
+    """Magnitude of the BS.1770 K-weighting filter at ``rate``.
+
+    The two stages (high shelf, then the RLB high pass) are computed for the
+    actual sample rate, as libebur128 does, instead of using the 48kHz table.
+    """
+    k = np.tan(np.pi * 1681.974450955533 / rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = biquad_response(
+        [(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0],
+        [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0],
+        frequencies, rate,
+    )
+    k = np.tan(np.pi * 38.13547087602444 / rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    high_pass = biquad_response([1.0, -2.0, 1.0], [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0],
+                                frequencies, rate)
+    return np.abs(shelf * high_pass)
+
+
+def integrated_loudness(samples, rate):
+    """Integrated loudness (LUFS) of float ``samples`` shaped (channels, n), ``None`` if silent.
+
+    The K-weighting is applied in the frequency domain: only the energy per
+    block matters, so its phase can be ignored.
+    """
+    count = samples.shape[1]
+    block = int(round(0.4 * rate))
+    if count < block:
+        return None
+    spectrum = np.fft.rfft(samples, axis=1)
+    spectrum *= k_weighting(np.fft.rfftfreq(count, 1 / rate), rate)
+    weighted = np.fft.irfft(spectrum, n=count, axis=1)
+    # Mean square per channel over 400ms blocks, every 100ms
+    energy = np.pad(np.cumsum(weighted ** 2, axis=1), ((0, 0), (1, 0)))
+    starts = np.arange(0, count - block + 1, int(round(0.1 * rate)))
+    power = ((energy[:, starts + block] - energy[:, starts]) / block).sum(axis=0)
+    with np.errstate(divide="ignore"):
+        loudness = -0.691 + 10 * np.log10(power)
+    gated = power[loudness > -70]
+    if not len(gated):
+        return None
+    relative = -0.691 + 10 * np.log10(gated.mean()) - 10
+    gated = power[(loudness > -70) & (loudness > relative)]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+def normalization_gain(samples, rate, target_lufs=TARGET_LUFS, peak_ceiling=PEAK_CEILING):
+    """(measured loudness, gain in dB) bringing ``samples`` to ``target_lufs``, peak at most ``peak_ceiling`` dBFS."""
+    loudness = integrated_loudness(samples, rate)
+    if loudness is None:
+        return None, 0.0
+    gain = target_lufs - loudness
+    peak = float(np.abs(samples).max())
+    if peak > 0:
+        gain = min(gain, peak_ceiling - 20 * np.log10(peak))
+    return loudness, gain
+
+
+# --- Muxing ---
+def encode_audio(stream, samples, rate, layout):
+    """Encode float ``samples`` (channels, n) with ``stream``'s encoder; returns the packets."""
+    frame_size = stream.codec_context.frame_size or 1024
+    samples = np.ascontiguousarray(samples, dtype=np.float32)
+    packets = []
+    for start in range(0, samples.shape[1], frame_size):
+        frame = av.AudioFrame.from_ndarray(
+            np.ascontiguousarray(samples[:, start:start + frame_size]), format="fltp", layout=layout
+        )
+        frame.sample_rate = rate
+        frame.pts = start
+        frame.time_base = Fraction(1, rate)
+        packets.extend(stream.encode(frame))
+    packets.extend(stream.encode(None))
+    return packets
+
+
+def packet_time(packet):
+    return float(packet.dts * packet.time_base) if packet.dts is not None else 0.0
+
+
+def mux_interleaved(container, *packet_lists):
+    """Mux packets of several streams in time order, so players can stream the file."""
+    for packet in heapq.merge(*packet_lists, key=packet_time):
+        container.mux(packet)
+
+
+def add_audio_stream(container, rate, layout, bit_rate):
+    stream = container.add_stream("aac", rate=rate)
+    stream.layout = layout
+    stream.bit_rate = bit_rate
+    return stream
+
+
+def open_output(path):
+    from manim import __version__
+
+    container = av.open(str(path), mode="w", options={"movflags": "+faststart"})
+    container.metadata["comment"] = f"Rendered with Manim Community v{__version__}"
+    return container
+
+
+class PreviewEncoder:
+    """Encodes the low-bitrate preview and saves the poster frame, on its own thread."""
+
+    def __init__(self, path, poster_path, width, height, poster_time=POSTER_TIME):
+        self.path = path
+        self.poster_path = poster_path
+        self.poster_time = poster_time
+        self.poster_saved = False
+        self.container = open_output(path)
+        # Decoded frames can come from a variable frame rate movie: bf=0 for the pts gaps,
+        # see ToolFileWriter.open_partial_movie_stream
+        self.stream = self.container.add_stream(
+            "libx264", rate=PREVIEW_RATE, options={"preset": "veryfast", "bf": "0"}
+        )
+        self.stream.pix_fmt = "yuv420p"
+        self.stream.width = width
+        self.stream.height = height
+        self.stream.bit_rate = PREVIEW_BITRATE
+        self.stream.codec_context.time_base = Fraction(1, PREVIEW_RATE)
+        self.packets = []
+        self.last_pts = -1
+        self.last_frame = None
+        self.error = None
+        self.queue = queue.Queue(maxsize=16)
+        self.thread = threading.Thread(target=self.encode_loop, name=f"preview-{path.stem}")
+        self.thread.start()
+
+    def put(self, frame):
+        self.queue.put(frame)
+
+    def encode_loop(self):
+        try:
+            while True:
+                frame = self.queue.get()
+                if frame is CLOSE:
+                    break
+                if not self.poster_saved and frame.time >= self.poster_time:
+                    self.save_poster(frame)
+                self.last_frame = frame
+                pts = int(frame.time * PREVIEW_RATE + 1e-6)
+                if pts <= self.last_pts:
+                    continue
+                small = frame.reformat(width=self.stream.width, height=self.stream.height,
+                                       format="yuv420p", interpolation="AREA")
+                small.pts = pts
+                small.time_base = self.stream.codec_context.time_base
+                self.packets.extend(self.stream.encode(small))
+                self.last_pts = pts
+            if not self.poster_saved and self.last_frame is not None:
+                # Shorter than the poster time: use the last frame
+                self.save_poster(self.last_frame)
+            self.packets.extend(self.stream.encode(None))
+        except Exception as error:
+            self.error = error
+            # Keep draining so the decoding side never blocks on a full queue
+            while self.queue.get() is not CLOSE:
+                pass
+
+    def save_poster(self, frame):
+        frame.to_image().save(self.poster_path, quality=90)
+        self.poster_saved = True
+
+    def finish(self, samples, rate, layout, gain):
+        """Wait for the video, then mux it with the normalized audio."""
+        self.queue.put(CLOSE)
+        self.thread.join()
+        if self.error is not None:
+            self.container.close()
+            raise self.error
+        audio_packets = []
+        if samples is not None:
+            audio = add_audio_stream(self.container, rate, layout, PREVIEW_AUDIO_BITRATE)
+            audio_packets = encode_audio(audio, samples * 10 ** (gain / 20), rate, layout)
+        mux_interleaved(self.container, self.packets, audio_packets)
+        self.container.close()
+
+
+# --- Publishing ---
+def source_signature(path):
+    stat = Path(path).stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def published_paths(movie_file, dest_dir):
+    stem = Path(movie_file).stem
+    dest_dir = Path(dest_dir)
+    return {
+        "movie": dest_dir / Path(movie_file).name,
+        "poster": dest_dir / f"{stem}.jpg",
+        "preview": dest_dir / f"{stem}.preview.mp4",
+    }
+
+
+def publish_movie(movie_file, dest_dir="video", target_lufs=TARGET_LUFS, peak_ceiling=PEAK_CEILING,
+                  poster_time=POSTER_TIME, preview=True, keep_source=False):
+    """Publish one movie into ``dest_dir``; returns its manifest entry."""
+    movie_file = Path(movie_file)
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    paths = published_paths(movie_file, dest_dir)
+    signature = source_signature(movie_file)
+    started = time.perf_counter()
+    temp_movie = paths["movie"].with_name(f".{paths['movie'].name}.tmp{movie_file.suffix}")
+    temp_preview = paths["preview"].with_name(f".{paths['preview'].name}.tmp.mp4")
+
+    with av.open(str(movie_file)) as source:
+        video_stream = source.streams.video[0]
+        audio_streams = source.streams.audio[:1]
+        video_stream.thread_type = "AUTO"
+        encoder = None
+        if preview:
+            width = PREVIEW_WIDTH
+            height = int(round(video_stream.codec_context.height * width / video_stream.codec_context.width / 2)) * 2
+            encoder = PreviewEncoder(temp_preview, paths["poster"], width, height, poster_time)
+
+        output = open_output(temp_movie)
+        output_video = output.add_stream(template=video_stream)
+        video_packets = []
+        chunks = []
+        rate = layout = None
+        resampler = None
+        try:
+            for packet in source.demux(video_stream, *audio_streams):
+                if packet.stream.type == "audio":
+                    for frame in packet.decode():
+                        if resampler is None:
+                            rate, layout = frame.sample_rate, frame.layout.name
+                            resampler = av.AudioResampler(format="fltp", layout=layout, rate=rate)
+                        for planar in resampler.resample(frame):
+                            chunks.append(planar.to_ndarray())
+                    continue
+                if encoder is not None:
+                    for frame in packet.decode():
+                        encoder.put(frame)
+                if packet.dts is None:
+                    continue
+                packet.stream = output_video
+                video_packets.append(packet)
+
+            samples = np.concatenate(chunks, axis=1) if chunks else None
+            loudness, gain = (None, 0.0)
+            audio_packets = []
+            if samples is not None:
+                loudness, gain = normalization_gain(samples, rate, target_lufs, peak_ceiling)
+                output_audio = add_audio_stream(output, rate, layout, AUDIO_BITRATE)
+                audio_packets = encode_audio(output_audio, samples * 10 ** (gain / 20), rate, layout)
+            mux_interleaved(output, video_packets, audio_packets)
+            output.close()
+            if encoder is not None:
+                encoder.finish(samples, rate, layout, gain)
+        except BaseException:
+            if encoder is not None and encoder.thread.is_alive():
+                encoder.queue.put(CLOSE)
+                encoder.thread.join()
+            temp_movie.unlink(missing_ok=True)
+            temp_preview.unlink(missing_ok=True)
+            raise
+
+    os.replace(temp_movie, paths["movie"])
+    if preview:
+        os.replace(temp_preview, paths["preview"])
+    if not keep_source:
+        movie_file.unlink()
+    entry = {
+        "source": str(movie_file),
+        **signature,
+        "outputs": {key: str(path) for key, path in paths.items() if preview or key == "movie"},
+        "loudness_lufs": None if loudness is None else round(loudness, 2),
+        "gain_db": round(gain, 2),
+        "seconds": round(time.perf_counter() - started, 3),
+        "published": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    level = "silent" if loudness is None else f"{loudness:.1f} LUFS, {gain:+.1f} dB"
+    logger.info(f"Published {paths['movie']} ({level}) in {entry['seconds']:.1f}s")
+    return entry
+
+
+class Publisher:
+    """Publishes movies on a thread pool as they are submitted.
+
+    Several scenes finishing back to back are published side by side, and a
+    movie whose source was already published unchanged is skipped.
+    """
+
+    def __init__(self, dest_dir="video", jobs=2, **options):
+        self.dest_dir = Path(dest_dir)
+        self.options = options
+        self.manifest_path = self.dest_dir / "publish.json"
+        self.manifest = {}
+        if self.manifest_path.exists():
+            self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="publish")
+        self.futures = []
+
+    def is_published(self, movie_file):
+        entry = self.manifest.get(Path(movie_file).name)
+        if entry is None or entry["source"] != str(movie_file):
+            return False
+        if {"size": entry["size"], "mtime_ns": entry["mtime_ns"]} != source_signature(movie_file):
+            return False
+        return all(Path(path).exists() for path in entry["outputs"].values())
+
+    def submit(self, movie_file):
+        """Queue ``movie_file``; returns the future, or ``None`` if it is already published."""
+        movie_file = Path(movie_file)
+        if self.is_published(movie_file):
+            logger.info(f"{movie_file} is already published")
+            return None
+        future = self.executor.submit(self.publish, movie_file)
+        self.futures.append(future)
+        return future
+
+    def publish(self, movie_file):
+        entry = publish_movie(movie_file, self.dest_dir, **self.options)
+        with self.lock:
+            self.manifest[movie_file.name] = entry
+            temp = self.manifest_path.with_suffix(".json.tmp")
+            temp.write_text(json.dumps(self.manifest, indent=2), encoding="utf-8")
+            os.replace(temp, self.manifest_path)
+        return entry
+
+    def close(self):
+        """Wait for every submitted movie; returns their manifest entries (raises the first failure)."""
+        self.executor.shutdown()
+        return [future.result() for future in self.futures]
+
+
+def final_movies(media_dir=None):
+    """Final movies under ``media/videos`` (not partial movie files or output variants' temp files)."""
+    from manim import config
+
+    videos = Path(media_dir or config.media_dir) / "videos"
+    if not videos.exists():
+        return []
+    return sorted(
+        path for path in videos.rglob("*.mp4")
+        if not is_partial_movie_path(path) and not path.name.startswith(".")
+    )
+
+
+def is_partial_movie_path(path):
+    """True under ``partial_movie_files`` or a variant's ``partial_movie_files.<variant>`` folder."""
+    return any(part.startswith("partial_movie_files") for part in Path(path).parts)
+
+
+def clean_media(media_dir=None):
+    """Remove what ``clean_media.sh`` removed: partial movie files, the text cache, temp files.
+
+    With a media store (store.py) the caches are trimmed to its budget instead
+    of being deleted, so the entries the next render needs survive.
+    """
+    from manim import config
+
+    from .store import MediaStore, format_size
+
+    media_dir = Path(media_dir or config.media_dir)
+    store = MediaStore(media_dir)
+    removed = [Path("videos/partial_movie_files"), Path("videos/temp_files"), Path("__pycache__")]
+    if store.index_path.exists():
+        report = store.gc()
+        logger.info(f"Media store: evicted {report['evicted']} objects, {format_size(report['size'])} kept")
+    else:
+        if (media_dir / "videos").exists():
+            removed += [path for path in (media_dir / "videos").rglob("partial_movie_files*") if path.is_dir()]
+        removed.append(media_dir / "texts")
+    for path in removed:
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+            logger.info(f"Removed {path}")
@@ -0,0 +1,262 @@
+"""
+Remote render cache shared between machines.
+
+Partial movie files are looked up by their path under ``media/``, e.g.
+``videos/laravel_with_docker/1920p60/partial_movie_files/LaravelDockerStory/<hash>.mp4``.
+With portable play hashes (hashing.py) that key is the same on every
+machine rendering the same scene source at the same resolution, frame rate
+and render variant. On a local cache miss the renderer fetches the file from
+the remote before rendering the play. A partial movie file rendered locally
+is uploaded after it is written, on a background thread.
+
+Two backends, picked by :func:`open_remote_cache`:
+
+* a directory (an NFS/SMB share, a synced folder), used as-is;
+* an ``http://`` URL with GET/HEAD/PUT, e.g. ``render.py cache serve`` on one
+  machine of the local network.
+
+Both write through a temporary name and rename, so a reader never sees half
+a file.
+"""
+
+import http.client
+import logging
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path, PurePosixPath
+
+# manim's logger. Fetching and uploading don't need manim itself; renders have loaded it
+# already, and serve_cache loads it for its log handler
+logger = logging.getLogger("manim")
+
+
+def check_key(key):
+    """``key`` as a relative posix path without ``..`` parts; raises ``ValueError`` otherwise."""
+    path = PurePosixPath(key)
+    if path.is_absolute() or ".." in path.parts or not path.parts:
+        raise ValueError(f"Bad cache key '{key}'")
+    return path.as_posix()
+
+
+class DirectoryCache:
+    """Remote cache in a shared directory."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def __str__(self):
+        return str(self.root)
+
+    def fetch(self, key, path):
+        source = self.root / check_key(key)
+        if not source.is_file():
+            return False
+        temp = Path(path).with_name(f".{Path(path).name}.{os.getpid()}.fetch")
+        try:
+            shutil.copyfile(source, temp)
+            os.replace(temp, path)
+        finally:
+            temp.unlink(missing_ok=True)
+        return True
+
+    def upload(self, key, path):
+        target = self.root / check_key(key)
+        if target.exists():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.upload")
+        shutil.copyfile(path, temp)
+        os.replace(temp, target)
+        return True
+
+
+class HttpCache:
+    """Remote cache behind a plain HTTP server with GET/HEAD/PUT (see :func:`serve_cache`)."""
+
+    def __init__(self, url, timeout=30):
+        self.url = url.rstrip("/") + "/"
+        self.timeout = timeout
+
+    def __str__(self):
+        return self.url
+
+    def key_url(self, key):
+        return self.url + urllib.parse.quote(check_key(key))
+
+    def fetch(self, key, path):
+        temp = Path(path).with_name(f".{Path(path).name}.{os.getpid()}.fetch")
+        try:
+            with urllib.request.urlopen(self.key_url(key), timeout=self.timeout) as response, open(temp, "wb") as fp:
+                shutil.copyfileobj(response, fp)
+                length = response.headers.get("Content-Length")
+            # A connection cut short must not leave a truncated partial movie file in the cache
+            if length is not None and temp.stat().st_size != int(length):
+                raise OSError(f"Got {temp.stat().st_size} of {length} bytes")
+            os.replace(temp, path)
+        except urllib.error.HTTPError as error:
+            if error.code == 404:
+                return False
+            raise
+        finally:
+            temp.unlink(missing_ok=True)
+        return True
+
+    def upload(self, key, path):
+        head = urllib.request.Request(self.key_url(key), method="HEAD")
+        try:
+            urllib.request.urlopen(head, timeout=self.timeout).close()
+            return False
+        except urllib.error.HTTPError as error:
+            if error.code != 404:
+                raise
+        data = Path(path).read_bytes()
+        request = urllib.request.Request(self.key_url(key), data=data, method="PUT")
+        urllib.request.urlopen(request, timeout=self.timeout).close()
+        return True
+
+
+def open_remote_cache(spec):
+    """A :class:`HttpCache` for an ``http(s)://`` URL, a :class:`DirectoryCache` for anything else."""
+    if spec.startswith(("http://", "https://")):
+        return HttpCache(spec)
+    return DirectoryCache(spec)
+
+
+class RemoteCacheClient:
+    """What a render does with the remote: fetch on a miss, upload in the background, count both."""
+
+    def __init__(self, backend, media_dir, upload=True, jobs=2):
+        self.backend = backend
+        self.media_dir = Path(media_dir)
+        self.upload_enabled = upload
+        self.executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="cache-upload")
+        self.futures = []
+        self.fetched = 0
+        self.fetched_bytes = 0
+        self.uploaded = 0
+        self.failures = 0
+
+    def key(self, path):
+        return Path(path).resolve().relative_to(self.media_dir.resolve()).as_posix()
+
+    def fetch(self, path):
+        """Try to fill the missing cache file ``path`` from the remote."""
+        try:
+            found = self.backend.fetch(self.key(path), path)
+        except (OSError, ValueError, http.client.HTTPException) as error:
+            # urllib errors are OSErrors, a dropped response is an HTTPException: either only costs a render
+            self.failures += 1
+            logger.warning(f"Remote cache fetch of {Path(path).name} failed: {error}")
+            return False
+        if found:
+            self.fetched += 1
+            self.fetched_bytes += Path(path).stat().st_size
+        return found
+
+    def upload(self, path):
+        if self.upload_enabled:
+            self.futures.append(self.executor.submit(self.upload_now, Path(path)))
+
+    def upload_now(self, path):
+        try:
+            if self.backend.upload(self.key(path), path):
+                self.uploaded += 1
+        except (OSError, ValueError, http.client.HTTPException) as error:
+            self.failures += 1
+            logger.warning(f"Remote cache upload of {path.name} failed: {error}")
+
+    def close(self):
+        """Wait for the uploads still running."""
+        self.executor.shutdown()
+
+    def summary(self):
+        return (
+            f"Remote cache {self.backend}: {self.fetched} partial files fetched "
+            f"({self.fetched_bytes / 2**20:.1f} MiB), {self.uploaded} uploaded, {self.failures} failures"
+        )
+
+
+# --- Local HTTP stand-in ---
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """GET/HEAD/PUT of files under the server's ``root``."""
+
+    def target(self):
+        try:
+            key = check_key(urllib.parse.unquote(urllib.parse.urlsplit(self.path).path.lstrip("/")))
+        except ValueError:
+            self.send_error(400)
+            return None
+        return self.server.root / key
+
+    def do_HEAD(self):
+        self.send_file(body=False)
+
+    def do_GET(self):
+        self.send_file(body=True)
+
+    def send_file(self, body):
+        target = self.target()
+        if target is None:
+            return
+        if not target.is_file():
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(target.stat().st_size))
+        self.end_headers()
+        if body:
+            with open(target, "rb") as fp:
+                shutil.copyfileobj(fp, self.wfile)
+
+    def do_PUT(self):
+        target = self.target()
+        if target is None:
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f".{target.name}.{threading.get_ident()}.upload")
+        with open(temp, "wb") as fp:
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(remaining, 1 << 20))
+                if not chunk:
+                    break
+                fp.write(chunk)
+                remaining -= len(chunk)
+        if remaining:
+            temp.unlink(missing_ok=True)
+            self.send_error(400, "Incomplete upload")
+            return
+        os.replace(temp, target)
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def serve_cache(root, host="127.0.0.1", port=8765):
+    """Serve ``root`` as a remote cache until interrupted; only to this machine unless ``host`` says otherwise."""
+    import manim  # noqa: F401  (sets up the logger's handler)
+
+    server = ThreadingHTTPServer((host, port), CacheRequestHandler)
+    if host not in ("127.0.0.1", "localhost", "::1"):
+        logger.warning(f"The render cache accepts uploads from anyone who can reach {host}:{port}; "
+                       "there is no authentication")
+    server.root = Path(root)
+    server.root.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Serving the render cache in {server.root} on http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,428 @@
+"""
+CairoRenderer used by the render tools.
+
+It knows which act of ``construct`` each ``play``/``wait`` belongs to (see
+``acts.py``) and can restrict rasterization to a window of acts, or to
+everything from a scene time on. Everything outside the window still runs
+through ``construct`` so the scene state is exact, but nothing is
+rasterized, hashed, encoded or mixed for it.
+"""
+
+import contextlib
+import os
+
+import numpy as np
+
+from manim import logger
+from manim.camera.camera import Camera
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.exceptions import EndSceneEarlyException
+from manim.utils.file_ops import write_to_movie
+from manim.utils.iterables import list_update
+
+from .acts import act_at_line, construct_line, find_acts
+from .adaptive import blend_frames, choose_frame_step
+from .dirty import DirtyRectCamera
+from .encode import restore_cfr
+from .file_writer import ToolFileWriter
+from .hashing import portable_hashing, portable_state_hash
+from .pipeline import FramePool, PooledCamera
+from .profiles import ProfileCamera, current_profile, profile_camera_class
+from .store import track_text_cache
+from .tiles import TiledCamera
+from .tuning import load_profile
+
+
+def cache_variant(vfr=False, adaptive_rate=False, max_frame_step=2, frame_fill="blend", encoder_profile=None):
+    """Name for renders whose partial movie files differ from a plain render's, or ``None``."""
+    parts = []
+    if encoder_profile is not None:
+        parts.append(encoder_profile.key())
+    if vfr:
+        parts.append("vfr")
+    if adaptive_rate:
+        parts.append(f"adaptive-{max_frame_step}-{frame_fill}")
+    return ".".join(parts) or None
+
+
+class ToolRenderer(CairoRenderer):
+    def __init__(self, first_act=None, last_act=None, from_time=None, defer_audio=False,
+                 sharder=None, checkpoint=None, frame_pool_size=0, tiles=0, dirty_rects=False,
+                 variants=(), vfr=False, cfr_output=False, adaptive_rate=False, max_frame_step=2, frame_fill="blend",
+                 encoder_profile="auto", encoder_threads=0, publisher=None, store=None, remote_cache=None, hls=None,
+                 profile="auto", profiler=None, memory_guard=None, file_writer_class=ToolFileWriter, **kwargs):
+        if dirty_rects:
+            kwargs.setdefault("camera_class", DirtyRectCamera)
+        elif tiles > 1:
+            kwargs.setdefault("camera_class", TiledCamera)
+        elif frame_pool_size:
+            kwargs.setdefault("camera_class", PooledCamera)
+        # Render profile from ``--profile``/``RENDER_PROFILE`` (profiles.py); load_scene applied its size
+        if profile == "auto":
+            profile = current_profile()
+        self.profile = profile
+        if profile is not None and profile.shortcuts:
+            kwargs["camera_class"] = profile_camera_class(kwargs.get("camera_class") or Camera)
+        super().__init__(file_writer_class=file_writer_class, **kwargs)
+        if isinstance(self.camera, ProfileCamera):
+            self.camera.render_profile = profile
+        # Ticks of the scene's clock per written frame, and the rate the movie is written at
+        self.ticks_per_frame = profile.ticks_per_frame(self.camera.frame_rate) if profile is not None else 1
+        self.output_frame_rate = self.camera.frame_rate / self.ticks_per_frame
+        # Optional tile-parallel rasterization (tiles.py)
+        if tiles > 1 and isinstance(self.camera, TiledCamera):
+            self.camera.set_tiles(tiles)
+        # Optional incremental rendering (dirty.py)
+        self.dirty_rects = dirty_rects
+        # x264 settings from ``render.py tune-encoder`` (tuning.py), if there are any
+        if encoder_profile == "auto":
+            encoder_profile = load_profile()
+        self.encoder_profile = encoder_profile
+        # Cap on libx264 threads, for several renders sharing the machine (batch.py); 0: x264 decides
+        self.encoder_threads = encoder_threads
+        # Extra outputs encoded from the same frames (variants.py, FanOutFileWriter)
+        self.variants = list(variants)
+        # Encode runs of identical frames once (ToolFileWriter), optionally
+        # re-expanded to a constant frame rate in the final movie
+        self.vfr = vfr
+        self.cfr_output = cfr_output
+        self.held_frames = 0
+        # Rasterize slow plays at a fraction of the frame rate and fill in the rest (adaptive.py)
+        self.adaptive_rate = adaptive_rate
+        self.max_frame_step = max_frame_step
+        self.frame_fill = frame_fill
+        self.frame_step = 1
+        self.filled_frames = 0
+        # Optional FramePool (pipeline.py): rasterize into reusable buffers handed to the writer thread
+        self.frame_pool = None
+        if frame_pool_size:
+            pixels = self.camera.pixel_array
+            self.frame_pool = FramePool(frame_pool_size, pixels.shape, pixels.dtype)
+        self.first_act = first_act
+        self.last_act = last_act
+        # Render from the first play starting at or after this scene time
+        self.from_time = from_time
+        # Leave sound mixing to whoever assembles the final movie (per-act workers)
+        self.defer_audio = defer_audio
+        # Optional FrameSharder (sharding.py) for long plays
+        self.sharder = sharder
+        self.sharded = False
+        # Optional Checkpoint (checkpoint.py): record every play, reuse a previous run's
+        self.checkpoint = checkpoint
+        self.resumed_entry = None
+        # Optional MediaStore (store.py): content-addressed cache with a disk budget
+        self.store = store
+        # Optional RemoteCacheClient (remote.py): partial movie files shared with other machines
+        self.remote_cache = remote_cache
+        self.patches = contextlib.ExitStack()
+        # Optional HlsSegmenter (hls.py): finished plays become live preview segments
+        self.hls = hls
+        # Optional Publisher (publish.py): hand the finished movie over as soon as it is written
+        self.publisher = publisher
+        # Optional RenderProfiler (profiler.py): timings of every play, Chrome trace
+        self.profiler = profiler
+        # Optional MemoryGuard (memory.py): RSS, allocations and live mobjects at every act boundary
+        self.memory_guard = memory_guard
+        self.acts = []
+        self.current_act = 0
+        self.window_start = None
+        self.window_end = None
+
+    def cache_variant(self):
+        return cache_variant(
+            self.vfr, self.adaptive_rate, self.max_frame_step, self.frame_fill, self.encoder_profile
+        )
+
+    def init_scene(self, scene):
+        self.scene = scene
+        self.acts = find_acts(type(scene))
+        # Same play hashes on every machine (hashing.py), so caches can be shared
+        self.patches.enter_context(portable_hashing())
+        if self.store is not None:
+            self.patches.enter_context(track_text_cache(self.store))
+        if self.profiler is not None:
+            self.patches.enter_context(self.profiler.timing_hashes())
+        super().init_scene(scene)
+        if self.profiler is not None:
+            self.profiler.attach(self)
+        if self.memory_guard is not None:
+            self.memory_guard.start(self)
+
+    # --- Acts ---
+    def locate_act(self):
+        line = construct_line(self.scene)
+        if line is None:
+            return self.current_act
+        return act_at_line(self.acts, line)
+
+    def snapshot(self):
+        """Scene state at the current play boundary."""
+        return {
+            "act": self.current_act,
+            "time": round(self.time, 6),
+            "num_plays": self.num_plays,
+            "mobjects": [[type(m).__name__, m.z_index] for m in self.scene.mobjects],
+            # Catches changes the type list above can't, e.g. a recoloured mobject (watch.py)
+            "state": portable_state_hash(self.scene, self.scene.mobjects),
+            "sound_cues": len(self.file_writer.sound_cues),
+        }
+
+    def window_offset(self):
+        """Scene time at which the rendered part starts."""
+        return self.window_start["time"] if self.window_start else 0.0
+
+    def cue_in_window(self, cue):
+        if self.first_act is not None and cue.act < self.first_act:
+            return False
+        if self.last_act is not None and cue.act > self.last_act:
+            return False
+        if self.from_time is not None and cue.time < self.window_offset() - 1e-6:
+            return False
+        return True
+
+    # --- Playing ---
+    def play(self, scene, *args, **kwargs):
+        previous_act = self.current_act
+        self.current_act = self.locate_act()
+        if self.memory_guard is not None and self.current_act != previous_act:
+            with self.profiler.overhead("memory sample") if self.profiler is not None else contextlib.nullcontext():
+                self.memory_guard.sample(self, previous_act)
+        self.sharded = False
+        self.resumed_entry = None
+        start_time = self.time
+        if self.profiler is not None:
+            self.profiler.begin_play()
+        if self.ticks_per_frame > 1:
+            # Which ticks of the play are written depends on where it starts; part of the camera's hash
+            self.camera.tick_phase = self.tick() % self.ticks_per_frame
+        super().play(scene, *args, **kwargs)
+        if self.skip_animations:
+            # Skipped and cached plays advance by the frames a render would
+            # have written, not by the raw run_time, so later sound cues land
+            # exactly where they do in a full render.
+            self.time = start_time + self.frame_count(scene) / self.camera.frame_rate
+        if self.hls is not None:
+            self.add_to_hls(start_time)
+        if self.checkpoint is not None:
+            if self.resumed_entry is not None:
+                self.check_resumed_play()
+            self.checkpoint.record(self)
+        if self.profiler is not None:
+            self.profiler.end_play(self, scene, start_time)
+        # Back to the original state between plays: manim drops add_sound
+        # calls made while the previous play was skipped.
+        self.skip_animations = self._original_skipping_status
+
+    def add_to_hls(self, start_time):
+        """Hand the partial movie file of the play that just finished to the HLS segmenter."""
+        files = self.file_writer.partial_movie_files
+        path = files[self.num_plays - 1] if len(files) >= self.num_plays else None
+        if path is None:
+            # Skipped: outside the render window
+            return
+        offset = self.window_offset()
+        cues = [
+            (cue.time - offset, cue.path, cue.gain)
+            for cue in self.file_writer.sound_cues if self.cue_in_window(cue)
+        ]
+        self.hls.add(path, start_time - offset, self.current_act, cues)
+
+    def update_skipping_status(self):
+        super().update_skipping_status()
+        if self.last_act is not None and self.current_act > self.last_act:
+            self.window_end = self.snapshot()
+            self.skip_animations = True
+            raise EndSceneEarlyException()
+        if self.before_window():
+            self.skip_animations = True
+        elif self.window_start is None:
+            self.window_start = self.snapshot()
+        if self.checkpoint is not None and not self.skip_animations:
+            entry = self.checkpoint.resumed_entry(self.num_plays)
+            if entry is not None and entry["partial_movie_file"] is not None:
+                # Reuse the checkpointed partial file (see ToolFileWriter.add_partial_movie_file)
+                self.resumed_entry = entry
+                self.skip_animations = True
+
+    def check_resumed_play(self):
+        """Make sure replaying construct still matches the checkpointed run."""
+        if abs(self.time - self.resumed_entry["time"]) > 1e-3:
+            raise RuntimeError(
+                f"Animation {self.num_plays - 1} ends at {self.time:.3f}s but the checkpoint "
+                f"says {self.resumed_entry['time']:.3f}s; render again without --resume"
+            )
+        self.animations_hashes[-1] = self.resumed_entry["hash"]
+
+    def before_window(self):
+        if self.first_act is not None and self.current_act < self.first_act:
+            return True
+        return self.from_time is not None and self.time < self.from_time - 1e-6
+
+    def frame_count(self, scene):
+        """Number of frames ``scene``'s current play writes when rendered."""
+        dt = 1 / self.camera.frame_rate
+        if scene.is_current_animation_frozen_frame():
+            return int(scene.duration / dt)
+        return len(np.arange(0, scene.duration, dt))
+
+    def scene_finished(self, scene):
+        if self.window_end is None:
+            self.window_end = self.snapshot()
+        if self.sharder is not None:
+            self.sharder.close()
+        if self.memory_guard is not None:
+            # The last act, before combining the movie adds its own buffers
+            self.memory_guard.finish(self)
+        if self.hls is not None:
+            # Before the movie is combined from the segments
+            self.hls.finish(self.time - self.window_offset())
+        super().scene_finished(scene)
+        if isinstance(self.camera, TiledCamera):
+            self.camera.close()
+        if self.frame_pool is not None:
+            logger.info(self.frame_pool.summary())
+        if self.dirty_rects:
+            logger.info(self.camera.summary())
+        if self.adaptive_rate:
+            logger.info(f"Adaptive frame rate: {self.filled_frames} frames filled in by {self.frame_fill}")
+        if self.vfr:
+            logger.info(f"Variable frame rate: {self.held_frames} repeated frames not encoded")
+            if self.cfr_output and write_to_movie() and not self.defer_audio:
+                restore_cfr(
+                    self.file_writer.movie_file_path, self.camera.frame_rate, self.encoder_profile, self.encoder_threads
+                )
+        if self.checkpoint is not None:
+            self.checkpoint.write(self, complete=True)
+        if self.profiler is not None:
+            self.profiler.finish(self)
+        self.patches.close()
+        if self.remote_cache is not None:
+            self.remote_cache.close()
+            logger.info(self.remote_cache.summary())
+        if self.store is not None:
+            self.store.commit(type(scene).__name__)
+        if self.publisher is not None and write_to_movie() and not self.defer_audio:
+            self.publisher.submit(self.file_writer.movie_file_path)
+
+    # --- No rasterization while skipping ---
+    def update_frame(self, scene, *args, **kwargs):
+        if self.skip_animations:
+            return
+        super().update_frame(scene, *args, **kwargs)
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        # Called right after the animations of a play have begun
+        self.frame_step = 1
+        if self.skip_animations:
+            self.static_image = None
+            return None
+        if (self.adaptive_rate and scene.stop_condition is None
+                and not scene.is_current_animation_frozen_frame()):
+            self.frame_step = choose_frame_step(scene, self.camera, max_step=self.max_frame_step)
+            self.step_index = 0
+            self.step_last = self.frame_count(scene) - 1
+            self.step_key = None
+            self.step_pending = 0
+        return super().save_static_frame_data(scene, static_mobjects)
+
+    def render(self, scene, time, moving_mobjects=None):
+        if self.skip_animations or self.sharded:
+            return
+        if self.sharder is not None and self.sharder.wants(scene):
+            self.add_sharded_frames(scene)
+            return
+        if self.tick() % self.ticks_per_frame:
+            # Between two frames of a lower rate profile: the clock moves on, nothing is drawn
+            self.time += 1 / self.camera.frame_rate
+            return
+        if self.frame_step > 1:
+            self.add_stepped_frame(scene, moving_mobjects)
+            return
+        if self.dirty_rects:
+            self.rasterize(scene, moving_mobjects)
+            self.add_frame_copy(self.camera.pixel_array)
+            return
+        if self.frame_pool is not None:
+            self.add_pooled_frame(scene, moving_mobjects)
+            return
+        super().render(scene, time, moving_mobjects)
+
+    def tick(self):
+        """Index of the current frame at the scene's frame rate."""
+        return round(self.time * self.camera.frame_rate)
+
+    def add_frame(self, frame, num_frames=1):
+        if self.ticks_per_frame == 1 or self.skip_animations:
+            super().add_frame(frame, num_frames)
+            return
+        # Write the ticks on the profile's grid; the scene time moves exactly as in a full rate render
+        first = self.tick()
+        written = -(-(first + num_frames) // self.ticks_per_frame) - -(-first // self.ticks_per_frame)
+        self.time += num_frames * (1 / self.camera.frame_rate)
+        if written:
+            self.file_writer.write_frame(frame, num_frames=written)
+        elif self.frame_pool is not None:
+            self.frame_pool.release(frame)
+
+    def rasterize(self, scene, moving_mobjects):
+        """Draw the current frame into the camera's own pixel array."""
+        if self.dirty_rects:
+            # Same fallbacks as CairoRenderer.update_frame
+            mobjects = moving_mobjects or list_update(scene.mobjects, scene.foreground_mobjects)
+            background = self.static_image if self.static_image is not None else self.camera.background
+            self.camera.capture_dirty(background, mobjects)
+        else:
+            self.update_frame(scene, moving_mobjects)
+
+    def add_frame_copy(self, frame):
+        if self.frame_pool is not None:
+            buffer = self.frame_pool.acquire()
+            np.copyto(buffer, frame)
+            self.add_frame(buffer)
+        else:
+            self.add_frame(np.array(frame))
+
+    def add_stepped_frame(self, scene, moving_mobjects):
+        """Rasterize every ``frame_step``-th frame (and the last) and fill in the frames between."""
+        index = self.step_index
+        self.step_index += 1
+        if index % self.frame_step and index != self.step_last:
+            self.step_pending += 1
+            return
+        self.rasterize(scene, moving_mobjects)
+        key = self.get_frame()
+        if self.step_pending:
+            if self.frame_fill == "blend":
+                for frame in blend_frames(self.step_key, key, self.step_pending):
+                    self.add_frame(frame)
+            else:
+                self.add_frame(self.step_key, num_frames=self.step_pending)
+            self.filled_frames += self.step_pending
+            self.step_pending = 0
+        self.add_frame(key)
+        self.step_key = key
+
+    def add_pooled_frame(self, scene, moving_mobjects):
+        """Rasterize into a free pool buffer and queue that buffer itself for the writer."""
+        buffer = self.frame_pool.acquire()
+        own_pixels = self.camera.pixel_array
+        self.camera.pixel_array = buffer
+        self.update_frame(scene, moving_mobjects)
+        # The camera must never draw into a buffer the writer thread still owns
+        self.camera.pixel_array = own_pixels
+        self.add_frame(buffer)
+
+    def add_sharded_frames(self, scene):
+        """Write every frame of the current play, rasterized by the sharder's workers."""
+        frames_path = self.sharder.render_play(self, scene)
+        frames = np.load(frames_path, mmap_mode="r")
+        for frame in frames:
+            self.add_frame(np.array(frame))
+        del frames
+        os.remove(frames_path)
+        self.sharded = True
+
+    def freeze_current_frame(self, duration):
+        if self.skip_animations:
+            return
+        super().freeze_current_frame(duration)
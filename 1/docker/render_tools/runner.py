@@ -0,0 +1,36 @@
+"""
+Load scene classes from a scene file and render them with :class:`ToolRenderer`.
+"""
+
+from pathlib import Path
+
+from manim import config
+from manim.utils.module_ops import scene_classes_from_file
+
+from .profiles import apply_profile, current_profile
+from .renderer import ToolRenderer
+
+
+def load_scene(scene_file, scene_name):
+    """Import ``scene_file`` (which also applies its module-level ``config``) and return the scene class.
+
+    The render profile in ``RENDER_PROFILE``, if any, is applied on top of that ``config``.
+    """
+    scene_file = Path(scene_file)
+    # Same media layout as the manim CLI: media/videos/<module>/<quality>/
+    config.input_file = scene_file
+    classes = scene_classes_from_file(scene_file, full_list=True)
+    apply_profile(current_profile())
+    for scene_class in classes:
+        if scene_class.__name__ == scene_name:
+            return scene_class
+    names = ", ".join(scene_class.__name__ for scene_class in classes)
+    raise ValueError(f"No scene named '{scene_name}' in {scene_file} (found: {names})")
+
+
+def render_scene(scene_class, **renderer_kwargs):
+    """Render ``scene_class`` once and return the renderer for inspection."""
+    renderer = ToolRenderer(**renderer_kwargs)
+    scene = scene_class(renderer=renderer)
+    scene.render()
+    return renderer
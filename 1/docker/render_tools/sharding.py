@@ -0,0 +1,111 @@
+"""
+Frame sharding: rasterize the frames of one long ``play`` on several processes.
+
+When a play is at least ``min_seconds`` long, the main render hands it to a
+pool of workers. Every worker replays ``construct`` without rasterizing up to
+that play, then steps through the play exactly like a normal render
+(``interpolate(alpha)`` and updaters for every frame, so dt-based updaters
+stay correct) but only rasterizes its own contiguous share of the frames.
+Frames go into a shared ``.npy`` memmap; the main process then feeds them to
+its encoder in order, so the partial movie file is encoded exactly as in a
+serial render.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from manim import config, logger
+
+from .renderer import ToolRenderer
+from .runner import load_scene
+
+
+class ShardRenderer(ToolRenderer):
+    """Worker side: rasterize frames ``[start, stop)`` of play ``play_index`` into ``frames_path``."""
+
+    def __init__(self, play_index, start, stop, frames_path, **kwargs):
+        super().__init__(defer_audio=True, **kwargs)
+        self.play_index = play_index
+        self.start = start
+        self.stop = stop
+        self.frames = np.load(frames_path, mmap_mode="r+")
+        self.frame_index = 0
+
+    def render(self, scene, time, moving_mobjects=None):
+        if self.skip_animations:
+            return
+        if self.start <= self.frame_index < self.stop:
+            self.update_frame(scene, moving_mobjects)
+            self.frames[self.frame_index] = self.camera.pixel_array
+        self.frame_index += 1
+
+    def scene_finished(self, scene):
+        self.frames.flush()
+
+
+def render_shard(scene_file, scene_name, play_index, start, stop, frames_path):
+    """Worker entry point."""
+    scene_class = load_scene(scene_file, scene_name)
+    config.progress_bar = "none"
+    config.disable_caching = True
+    config.write_to_movie = False
+    config.from_animation_number = play_index
+    config.upto_animation_number = play_index
+    renderer = ShardRenderer(play_index, start, stop, frames_path)
+    scene_class(renderer=renderer).render()
+    return stop - start
+
+
+class FrameSharder:
+    """Main-process side, passed to :class:`ToolRenderer` as ``sharder``."""
+
+    def __init__(self, processes, min_seconds=1.0):
+        self.processes = processes
+        self.min_seconds = min_seconds
+        self.pool = None
+
+    def wants(self, scene):
+        return self.processes > 1 and scene.duration >= self.min_seconds
+
+    def render_play(self, renderer, scene):
+        """Rasterize every frame of the current play on the pool and return them in order."""
+        if self.pool is None:
+            # spawn: every worker imports the scene module (and its config) fresh
+            context = multiprocessing.get_context("spawn")
+            self.pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=context)
+
+        num_frames = renderer.frame_count(scene)
+        shape = renderer.camera.pixel_array.shape
+        frames_path = Path(renderer.file_writer.partial_movie_directory) / (
+            f"shard_{os.getpid()}_{renderer.num_plays:05}.npy"
+        )
+        frames = np.lib.format.open_memmap(
+            frames_path, mode="w+", dtype=renderer.camera.pixel_array.dtype,
+            shape=(num_frames,) + shape,
+        )
+        del frames  # header written; workers open it themselves
+
+        bounds = np.linspace(0, num_frames, self.processes + 1).astype(int)
+        logger.info(
+            f"Animation {renderer.num_plays} : sharding {num_frames} frames "
+            f"across {self.processes} processes"
+        )
+        futures = [
+            self.pool.submit(
+                render_shard, str(config.input_file), type(scene).__name__,
+                renderer.num_plays, int(start), int(stop), str(frames_path),
+            )
+            for start, stop in zip(bounds, bounds[1:]) if stop > start
+        ]
+        for future in futures:
+            future.result()
+        return frames_path
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
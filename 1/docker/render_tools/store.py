@@ -0,0 +1,389 @@
+"""
+Content-addressed media store for the render cache.
+
+manim keeps three caches under ``media/``: partial movie files (one per
+play, named by the play's hash), text SVGs (named by a hash of the text
+settings) and, with the render tools, sound files converted to wav
+(``media/audio``, named by a hash of the source file). manim's only
+eviction is a file count per scene, and ``clean_media.sh`` used to delete
+all of it.
+
+With the store every cache file is a hard link to an object in
+``media/store/objects`` named by the sha256 of its content, so identical
+files (the same play cached under two render variants, say) take the space
+once. ``media/store/index.json`` records each object's size, last use and
+use count, which cache paths point at it, which keys the last renders of
+each scene used, and hit/miss counts per kind.
+
+When the store is over its budget, the least recently used objects (or the
+least used ones, ``policy="lfu"``) are deleted together with their cache
+paths, so manim simply sees a miss. Objects used by the last
+``keep_renders`` renders of any scene are never evicted.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+# manim's logger. manim itself is imported where it is needed, so `render.py cache` and the
+# tests don't pay for loading it
+logger = logging.getLogger("manim")
+
+SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?$", re.IGNORECASE)
+SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+KINDS = ("partial", "text", "audio")
+
+
+def parse_size(text):
+    """``"20G"``, ``"512M"``, ``"1.5GiB"`` or a plain byte count."""
+    match = SIZE_RE.match(text.strip())
+    if match is None:
+        raise ValueError(f"Can't parse size '{text}' (e.g. 20G, 512M)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_kind(key):
+    """Cache a media-relative ``key`` belongs to, or ``None``."""
+    parts = key.split("/")
+    if parts[0] == "texts":
+        return "text"
+    if parts[0] == "audio":
+        return "audio"
+    if parts[0] == "videos" and any(part.startswith("partial_movie_files") for part in parts):
+        return "partial"
+    return None
+
+
+def empty_index():
+    return {
+        "settings": {"budget": None, "policy": "lru", "keep_renders": 2},
+        "objects": {},
+        "entries": {},
+        "scenes": {},
+        "stats": {kind: {"hits": 0, "misses": 0} for kind in KINDS},
+    }
+
+
+class MediaStore:
+    """The store under ``media/store``.
+
+    Lookups and new files are recorded in memory while a scene renders and
+    merged into the index by :meth:`commit`, under a file lock, so parallel
+    renders can share one store.
+    """
+
+    def __init__(self, media_dir=None, budget=None, policy=None, keep_renders=None):
+        if media_dir is None:
+            from manim import config
+            media_dir = config.media_dir
+        self.media_dir = Path(media_dir)
+        self.root = self.media_dir / "store"
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        # Only what was given explicitly is saved into the index settings
+        self.settings = {
+            key: value for key, value in
+            (("budget", budget), ("policy", policy), ("keep_renders", keep_renders))
+            if value is not None
+        }
+        self.new_objects = {}
+        self.new_entries = {}
+        self.uses = {}
+        self.used_keys = set()
+        self.hits = {kind: 0 for kind in KINDS}
+        self.misses = {kind: 0 for kind in KINDS}
+
+    # --- Paths ---
+    def key(self, path):
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.media_dir.resolve()).as_posix()
+        except ValueError:
+            return None
+
+    def object_path(self, digest, suffix=""):
+        return self.objects_dir / digest[:2] / f"{digest}{suffix}"
+
+    # --- Recording ---
+    def record(self, path, hit):
+        """A cache lookup of ``path``; a hit counts as a use of its object."""
+        key = self.key(path)
+        kind = key and cache_kind(key)
+        if kind is None:
+            return
+        if hit:
+            self.hits[kind] += 1
+            self.use(path)
+        else:
+            self.misses[kind] += 1
+
+    def use(self, path):
+        key = self.key(path)
+        if key is None:
+            return
+        self.used_keys.add(key)
+        self.uses[key] = self.uses.get(key, 0) + 1
+
+    def link_object(self, path):
+        """Make the cache file ``path`` a link to its content-addressed object; (key, digest, meta) or ``None``."""
+        path = Path(path)
+        key = self.key(path)
+        if key is None or cache_kind(key) is None or not path.is_file():
+            return None
+        digest = file_digest(path)
+        target = self.object_path(digest, path.suffix)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, target)
+        except FileExistsError:
+            # Same content is already stored: point the cache path at it instead
+            if not os.path.samefile(path, target):
+                temp = path.with_name(f".{path.name}.{os.getpid()}.link")
+                os.link(target, temp)
+                os.replace(temp, path)
+        meta = {"suffix": path.suffix, "size": target.stat().st_size, "kind": cache_kind(key)}
+        return key, digest, meta
+
+    def ingest(self, path):
+        """Store a cache file this render just wrote."""
+        stored = self.link_object(path)
+        if stored is None:
+            return None
+        key, digest, meta = stored
+        self.new_objects[digest] = meta
+        self.new_entries[key] = digest
+        self.use(path)
+        return digest
+
+    # --- Index ---
+    @contextlib.contextmanager
+    def locked_index(self):
+        """The index, loaded and saved under an exclusive lock."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / "index.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            index = self.load()
+            yield index
+            temp = self.index_path.with_suffix(".json.tmp")
+            temp.write_text(json.dumps(index, indent=1), encoding="utf-8")
+            os.replace(temp, self.index_path)
+
+    def load(self):
+        if not self.index_path.exists():
+            return empty_index()
+        return json.loads(self.index_path.read_text(encoding="utf-8"))
+
+    def commit(self, scene_name=None, collect=True):
+        """Merge what this process recorded into the index, then trim to the budget."""
+        now = time.time()
+        with self.locked_index() as index:
+            index["settings"].update(self.settings)
+            for digest, meta in self.new_objects.items():
+                stored = index["objects"].setdefault(digest, {**meta, "created": now, "last_used": now, "uses": 0})
+                stored["last_used"] = now
+            index["entries"].update(self.new_entries)
+            # Adopt the cache files this render wrote before counting hits on them
+            self.sync(index)
+            for key, count in self.uses.items():
+                digest = index["entries"].get(key)
+                if digest in index["objects"]:
+                    index["objects"][digest]["last_used"] = now
+                    index["objects"][digest]["uses"] += count
+            for kind in KINDS:
+                stats = index["stats"].setdefault(kind, {"hits": 0, "misses": 0})
+                stats["hits"] += self.hits[kind]
+                stats["misses"] += self.misses[kind]
+            if scene_name is not None:
+                history = index["scenes"].setdefault(scene_name, [])
+                history.insert(0, sorted(key for key in self.used_keys if key in index["entries"]))
+                del history[index["settings"]["keep_renders"]:]
+            report = None
+            if collect and index["settings"]["budget"] is not None:
+                report = self.collect(index, index["settings"]["budget"], index["settings"]["policy"])
+        self.new_objects.clear()
+        self.new_entries.clear()
+        self.uses.clear()
+        self.used_keys.clear()
+        self.hits = {kind: 0 for kind in KINDS}
+        self.misses = {kind: 0 for kind in KINDS}
+        if report and report["evicted"]:
+            logger.info(
+                f"Media store: evicted {report['evicted']} objects ({format_size(report['freed'])}), "
+                f"{format_size(report['size'])} of {format_size(report['budget'])} used"
+            )
+        return report
+
+    def cache_files(self):
+        """Every file in the caches the store manages."""
+        videos = self.media_dir / "videos"
+        if videos.exists():
+            for directory in videos.rglob("partial_movie_files*"):
+                if directory.is_dir():
+                    yield from (path for path in directory.rglob("*") if path.is_file())
+        for name in ("texts", "audio"):
+            directory = self.media_dir / name
+            if directory.exists():
+                yield from (path for path in directory.iterdir() if path.is_file())
+
+    def sync(self, index):
+        """Drop entries whose cache path is gone or replaced; adopt cache files the store doesn't know."""
+        for key, digest in list(index["entries"].items()):
+            path = self.media_dir / key
+            meta = index["objects"].get(digest)
+            if meta is None or not path.exists() or not os.path.samefile(path, self.object_path(digest, meta["suffix"])):
+                del index["entries"][key]
+        now = time.time()
+        for path in self.cache_files():
+            name = path.name
+            if name.startswith(".") or ".tmp" in path.suffixes or name == "partial_movie_file_list.txt":
+                continue
+            key = self.key(path)
+            if key in index["entries"]:
+                continue
+            stored = self.link_object(path)
+            if stored is None:
+                continue
+            key, digest, meta = stored
+            # Files from before the store, or from renders that didn't use it: last used when written
+            mtime = min(path.stat().st_mtime, now)
+            stored = index["objects"].setdefault(digest, {**meta, "created": mtime, "last_used": mtime, "uses": 0})
+            stored["last_used"] = max(stored["last_used"], mtime)
+            index["entries"][key] = digest
+
+    # --- Eviction ---
+    def protected(self, index):
+        """Objects used by the most recent renders of each scene."""
+        return {
+            index["entries"][key]
+            for history in index["scenes"].values()
+            for keys in history
+            for key in keys
+            if key in index["entries"]
+        }
+
+    def referenced(self, index):
+        return set(index["entries"].values())
+
+    def collect(self, index, budget, policy="lru", dry_run=False):
+        """Delete orphaned objects, then evict by ``policy`` until the store fits ``budget`` bytes."""
+        referenced = self.referenced(index)
+        protected = self.protected(index)
+        orphans = [digest for digest in index["objects"] if digest not in referenced]
+        if policy == "lfu":
+            order = lambda digest: (index["objects"][digest]["uses"], index["objects"][digest]["last_used"])
+        else:
+            order = lambda digest: index["objects"][digest]["last_used"]
+        candidates = sorted((digest for digest in referenced if digest not in protected and digest in index["objects"]),
+                            key=order)
+        size = sum(meta["size"] for meta in index["objects"].values())
+        victims = list(orphans)
+        size -= sum(index["objects"][digest]["size"] for digest in orphans)
+        for digest in candidates:
+            if size <= budget:
+                break
+            victims.append(digest)
+            size -= index["objects"][digest]["size"]
+        freed = sum(index["objects"][digest]["size"] for digest in victims)
+        if not dry_run:
+            victim_set = set(victims)
+            for key, digest in list(index["entries"].items()):
+                if digest in victim_set:
+                    (self.media_dir / key).unlink(missing_ok=True)
+                    del index["entries"][key]
+            for digest in victims:
+                meta = index["objects"].pop(digest)
+                self.object_path(digest, meta["suffix"]).unlink(missing_ok=True)
+        return {"evicted": len(victims), "freed": freed, "size": size, "budget": budget,
+                "over_budget": max(0, size - budget)}
+
+    def gc(self, budget=None, policy=None, dry_run=False):
+        """Trim the store to ``budget`` (default: the saved budget) now."""
+        with self.locked_index() as index:
+            index["settings"].update(self.settings)
+            self.sync(index)
+            budget = budget if budget is not None else index["settings"]["budget"]
+            if budget is None:
+                budget = sum(meta["size"] for meta in index["objects"].values())
+            return self.collect(index, budget, policy or index["settings"]["policy"], dry_run=dry_run)
+
+    # --- Reporting ---
+    def summary(self):
+        """Per-kind sizes and hit rates, plus what an eviction down to the protected set would free."""
+        with self.locked_index() as index:
+            self.sync(index)
+        protected = self.protected(index)
+        referenced = self.referenced(index)
+        kinds = {}
+        for kind in KINDS:
+            objects = {digest: meta for digest, meta in index["objects"].items() if meta["kind"] == kind}
+            stats = index["stats"].get(kind, {"hits": 0, "misses": 0})
+            lookups = stats["hits"] + stats["misses"]
+            linked = sum(objects[digest]["size"] for key, digest in index["entries"].items() if digest in objects)
+            kinds[kind] = {
+                "objects": len(objects),
+                "size": sum(meta["size"] for meta in objects.values()),
+                "deduplicated": linked - sum(meta["size"] for digest, meta in objects.items() if digest in referenced),
+                "hits": stats["hits"],
+                "misses": stats["misses"],
+                "hit_rate": stats["hits"] / lookups if lookups else None,
+                "reclaimable": sum(meta["size"] for digest, meta in objects.items() if digest not in protected),
+            }
+        size = sum(meta["size"] for meta in index["objects"].values())
+        budget = index["settings"]["budget"]
+        return {
+            "settings": index["settings"],
+            "size": size,
+            "over_budget": max(0, size - budget) if budget is not None else 0,
+            "kinds": kinds,
+            "scenes": {scene: len(history[0]) if history else 0 for scene, history in index["scenes"].items()},
+        }
+
+
+@contextlib.contextmanager
+def track_text_cache(store):
+    """Record every text SVG lookup of ``Text``/``MarkupText`` in ``store`` while active."""
+    from manim import config
+    from manim.mobject.text.text_mobject import MarkupText, Text
+
+    originals = {cls: cls.__dict__["_text2svg"] for cls in (Text, MarkupText)}
+
+    def tracked(original):
+        def _text2svg(self, color):
+            path = config.get_dir("text_dir") / (self._text2hash(color) + ".svg")
+            hit = path.exists()
+            svg_file = original(self, color)
+            store.record(path, hit)
+            if not hit:
+                store.ingest(path)
+            return svg_file
+        return _text2svg
+
+    for cls, original in originals.items():
+        cls._text2svg = tracked(original)
+    try:
+        yield
+    finally:
+        for cls, original in originals.items():
+            cls._text2svg = original
+
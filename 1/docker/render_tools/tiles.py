@@ -0,0 +1,143 @@
+"""
+Tile-parallel rasterization of the tall 9:16 frames.
+
+The frame is split into horizontal bands. Each band gets its own cairo
+surface over the same pixel memory, with the serial camera's exact transform
+and a clip to the band's pixel rows, and is drawn on a thread pool with only
+the VMobjects whose bounding box reaches into it. cairo releases the GIL
+while it fills and strokes, which is where most of the time goes at
+1080x1920.
+
+Because every band uses the serial transform and the clip is pixel aligned,
+each pixel is computed exactly as it is by the serial camera; the bands only
+decide who computes it. Images, point clouds and background-colored
+VMobjects are still drawn serially, in order, between the tiled batches.
+``render.py bench-tiles`` (bench.py) checks this frame by frame on a real
+scene.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import cairo
+import numpy as np
+
+from manim.mobject.types.vectorized_mobject import VMobject
+
+from .pipeline import PooledCamera
+
+
+def split_rows(height, tiles):
+    """``tiles`` (start, stop) pixel row ranges covering ``height`` rows."""
+    edges = np.linspace(0, height, tiles + 1).round().astype(int)
+    return [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+
+
+def pixel_bounds(camera, mobject):
+    """(left, top, right, bottom) pixels ``mobject`` may touch, including stroke and miter joins.
+
+    Bezier curves stay inside the hull of their control points, so the box of
+    the points is conservative. ``None`` for a mobject without points.
+    """
+    points = mobject.points
+    if len(points) == 0:
+        return None
+    if not np.isfinite(points).all():
+        return 0, 0, camera.pixel_width, camera.pixel_height
+    x_scale = camera.pixel_width / camera.frame_width
+    y_scale = camera.pixel_height / camera.frame_height
+    x_center = camera.pixel_width / 2 - camera.frame_center[0] * x_scale
+    y_center = camera.pixel_height / 2 + camera.frame_center[1] * y_scale
+    margin = 2
+    if isinstance(mobject, VMobject):
+        width = max(mobject.get_stroke_width(), mobject.get_stroke_width(background=True))
+        # Half the line width times cairo's default miter limit (10), plus antialiasing
+        margin += 5 * width * camera.cairo_line_width_multiple * max(x_scale, y_scale)
+    return (
+        math.floor(x_center + points[:, 0].min() * x_scale - margin),
+        math.floor(y_center - points[:, 1].max() * y_scale - margin),
+        math.ceil(x_center + points[:, 0].max() * x_scale + margin),
+        math.ceil(y_center - points[:, 1].min() * y_scale + margin),
+    )
+
+
+class TiledCamera(PooledCamera):
+    """Camera that draws VMobject batches band by band on a thread pool.
+
+    The pixel array is reset in place (see :class:`PooledCamera`) so the
+    per-band cairo contexts stay valid from frame to frame.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.tiles = 1
+        self.executor = None
+        self.tile_contexts = {}
+        super().__init__(*args, **kwargs)
+
+    def set_tiles(self, tiles):
+        self.tiles = tiles
+        self.bands = split_rows(self.pixel_height, tiles)
+        if self.executor is None and tiles > 1:
+            self.executor = ThreadPoolExecutor(max_workers=tiles, thread_name_prefix="tile")
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def get_tile_contexts(self, pixel_array):
+        key = (id(pixel_array), self.tiles)
+        contexts = self.tile_contexts.get(key)
+        if contexts is not None:
+            return contexts
+        pw, ph = self.pixel_width, self.pixel_height
+        fw, fh = self.frame_width, self.frame_height
+        fc = self.frame_center
+        contexts = []
+        for start, stop in self.bands:
+            surface = cairo.ImageSurface.create_for_data(pixel_array.data, cairo.FORMAT_ARGB32, pw, ph)
+            ctx = cairo.Context(surface)
+            # Clip in device space, before the scene transform
+            ctx.rectangle(0, start, pw, stop - start)
+            ctx.clip()
+            # Same matrix as Camera.get_cairo_context
+            ctx.set_matrix(cairo.Matrix(
+                (pw / fw), 0, 0, -(ph / fh),
+                (pw / 2) - fc[0] * (pw / fw),
+                (ph / 2) + fc[1] * (ph / fh),
+            ))
+            contexts.append(ctx)
+        self.tile_contexts[key] = contexts
+        return contexts
+
+    def row_span(self, vmobject):
+        bounds = pixel_bounds(self, vmobject)
+        if bounds is None:
+            return None
+        return bounds[1], bounds[3]
+
+    def display_multiple_non_background_colored_vmobjects(self, vmobjects, pixel_array):
+        if self.tiles <= 1:
+            super().display_multiple_non_background_colored_vmobjects(vmobjects, pixel_array)
+            return
+        per_band = [[] for _ in self.bands]
+        for vmobject in vmobjects:
+            span = self.row_span(vmobject)
+            if span is None:
+                continue
+            top, bottom = span
+            for index, (start, stop) in enumerate(self.bands):
+                if top < stop and bottom > start:
+                    per_band[index].append(vmobject)
+        contexts = self.get_tile_contexts(pixel_array)
+        futures = [
+            self.executor.submit(self.display_band, ctx, band)
+            for ctx, band in zip(contexts, per_band) if band
+        ]
+        for future in futures:
+            future.result()
+
+    def display_band(self, ctx, vmobjects):
+        for vmobject in vmobjects:
+            self.display_vectorized(vmobject, ctx)
+        ctx.get_target().flush()
@@ -0,0 +1,177 @@
+"""
+Scene timelines from a dry run, checked against the duration budget.
+
+``guideline.md`` asks for 120 seconds in four acts (0-30s, 30-75s, 75-110s
+and 110-120s), and the act banners carry the times their author hoped for,
+e.g. ``SCENE 3: Laravel API Working Setup (18-28s)``. ``render.py timeline``
+runs ``construct`` with the :class:`~render_tools.dryrun.DryRunRenderer`, so
+nothing is drawn or encoded, and takes the timeline straight from the
+renderer's clock: the same frame-exact times a render would give. It
+includes every play and wait, where every act starts and ends, and every
+sound cue with its gain.
+
+The timeline is written to ``media/timeline/<Scene>.json`` and checked
+against:
+
+* the budget's total length;
+* the budget's act spans, when the scene has as many acts as the budget;
+* the planned times in the act banners.
+
+Anything further off than the tolerance is reported, and the command exits
+with status 1.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class Budget:
+    duration: float
+    acts: list              # [(start, end), ...] in seconds, may be empty
+
+    @classmethod
+    def parse(cls, duration, acts=None):
+        """``acts`` as on the command line: ``"0-30,30-75,75-110,110-120"``."""
+        spans = []
+        for span in (acts or "").split(","):
+            if span.strip():
+                start, _, end = span.partition("-")
+                spans.append((float(start), float(end)))
+        return cls(float(duration), spans)
+
+
+# The 4-act structure of guideline.md
+GUIDELINE_BUDGET = Budget(120.0, [(0.0, 30.0), (30.0, 75.0), (75.0, 110.0), (110.0, 120.0)])
+
+
+def cue_path(path):
+    """Sound paths relative to the scene folder where possible, so timelines compare across machines."""
+    try:
+        return os.path.relpath(path)
+    except ValueError:
+        return path
+
+
+def scene_timeline(renderer):
+    """The timeline of a finished :class:`DryRunRenderer`."""
+    events = [
+        {
+            "index": entry.index,
+            "kind": entry.kind,
+            "act": entry.act,
+            "start": entry.start,
+            "end": entry.end,
+            "duration": round(entry.end - entry.start, 6),
+            "animations": entry.animations,
+            "line": entry.line,
+        }
+        for entry in renderer.entries
+    ]
+    cues = [
+        {"time": round(cue.time, 6), "path": cue_path(cue.path), "gain": cue.gain, "act": cue.act}
+        for cue in renderer.file_writer.sound_cues
+    ]
+    acts = []
+    for act in renderer.acts or []:
+        played = [event for event in events if event["act"] == act.index]
+        acts.append({
+            **act.to_dict(),
+            "start": played[0]["start"] if played else None,
+            "end": played[-1]["end"] if played else None,
+            "plays": sum(event["kind"] == "play" for event in played),
+            "waits": sum(event["kind"] == "wait" for event in played),
+            "cues": sum(cue["act"] == act.index for cue in cues),
+        })
+    return {
+        "scene": type(renderer.scene).__name__,
+        "frame_rate": renderer.camera.frame_rate,
+        "duration": round(renderer.time, 6),
+        "acts": acts,
+        "events": events,
+        "cues": cues,
+    }
+
+
+def check_timeline(timeline, budget=GUIDELINE_BUDGET, tolerance=1.0):
+    """Misses of the budget and of the planned act times, as messages."""
+    issues = []
+    duration = timeline["duration"]
+    if budget is not None and abs(duration - budget.duration) > tolerance:
+        word = "short" if duration < budget.duration else "long"
+        issues.append(f"The scene is {duration:.2f}s, {abs(duration - budget.duration):.2f}s too {word} "
+                      f"for the {budget.duration:g}s budget")
+    acts = [act for act in timeline["acts"] if act["start"] is not None]
+    checked = set()
+    if budget is not None and budget.acts and len(acts) == len(budget.acts):
+        for act, (start, end) in zip(acts, budget.acts):
+            issues.extend(check_span(act, start, end, tolerance, "the budget's"))
+            checked.add((act["index"], start, end))
+    for act in acts:
+        planned = (act["index"], act["planned_start"], act["planned_end"])
+        if act["planned_start"] is not None and planned not in checked:
+            issues.extend(check_span(act, act["planned_start"], act["planned_end"], tolerance, "its planned"))
+    return issues
+
+
+def check_span(act, start, end, tolerance, whose):
+    name = act["label"]
+    misses = []
+    if abs(act["start"] - start) > tolerance:
+        misses.append(f"starts at {act['start']:.2f}s ({act['start'] - start:+.2f}s)")
+    if abs(act["end"] - end) > tolerance:
+        misses.append(f"ends at {act['end']:.2f}s ({act['end'] - end:+.2f}s)")
+    if not misses:
+        return []
+    return [f"{name} {' and '.join(misses)} against {whose} {start:g}-{end:g}s"]
+
+
+def write_timeline(timeline, directory=None):
+    if directory is None:
+        from manim import config
+        directory = Path(config.media_dir) / "timeline"
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{timeline['scene']}.json"
+    path.write_text(json.dumps(timeline, indent=1), encoding="utf-8")
+    return path
+
+
+def format_timeline(timeline, budget=None, events=False):
+    lines = [f"{'act':<40} {'planned':>9} {'budget':>9} {'start':>8} {'end':>8} {'length':>7} "
+             f"{'plays':>5} {'waits':>5} {'cues':>4}"]
+    spans = budget.acts if budget is not None else []
+    played = [act for act in timeline["acts"] if act["start"] is not None]
+    for act in timeline["acts"]:
+        label = f"{act['label']}: {act['title']}" if act["title"] else act["label"]
+        planned = f"{act['planned_start']:g}-{act['planned_end']:g}s" if act["planned_start"] is not None else ""
+        span = ""
+        if len(spans) == len(played) and act in played:
+            start, end = spans[played.index(act)]
+            span = f"{start:g}-{end:g}s"
+        if act["start"] is None:
+            lines.append(f"{label[:40]:<40} {planned:>9} {span:>9} {'no plays':>8}")
+            continue
+        lines.append(
+            f"{label[:40]:<40} {planned:>9} {span:>9} {act['start']:>7.2f}s {act['end']:>7.2f}s "
+            f"{act['end'] - act['start']:>6.2f}s {act['plays']:>5} {act['waits']:>5} {act['cues']:>4}"
+        )
+    lines.append(f"{timeline['scene']}: {timeline['duration']:.2f}s, {len(timeline['events'])} plays and waits, "
+                 f"{len(timeline['cues'])} sound cues")
+    if events:
+        lines.append("")
+        cues = sorted(timeline["cues"], key=lambda cue: cue["time"])
+        for event in timeline["events"]:
+            while cues and cues[0]["time"] <= event["start"] + 1e-6:
+                lines.append(format_cue(cues.pop(0)))
+            lines.append(f"  {event['start']:>8.3f}s {event['end']:>8.3f}s  {event['kind']:<4} act {event['act']:<3} "
+                         f"line {event['line'] or '?':<5} {event['animations']}")
+        lines.extend(format_cue(cue) for cue in cues)
+    return "\n".join(lines)
+
+
+def format_cue(cue):
+    gain = f" {cue['gain']:+g} dB" if cue["gain"] is not None else ""
+    return f"  {cue['time']:>8.3f}s {'':>9}  cue  act {cue['act']:<3} {Path(cue['path']).name}{gain}"
@@ -0,0 +1,229 @@
+"""
+Encoder settings tuned on our own footage.
+
+``render.py tune-encoder MOVIE`` takes a few seconds of a rendered scene and
+encodes them with every combination of x264 preset, tune and CRF on a
+process pool, measuring file size and SSIM/PSNR of the luma plane against
+the source frames (numpy, no extra tools). Encodes running side by side
+slow each other down, so the candidates that meet the quality threshold are
+then encoded once more, one after another, for their encode time. The
+fastest of them (ties go to the smaller file) is written to
+``media/encoder_profile.json``.
+
+Every render then picks up that profile for its libx264 streams, as long as
+the profile was tuned at the same resolution and frame rate. Partial movie
+files encoded with a profile are cached apart from the default ones (see
+``cache_variant`` in renderer.py), so a movie is never concatenated from
+differently encoded pieces.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from itertools import product
+from pathlib import Path
+
+import av
+import numpy as np
+
+# manim's logger. manim itself is imported where its config is needed, so the benchmark's
+# worker processes (and the tests of the quality metrics) don't load it
+logger = logging.getLogger("manim")
+
+PRESETS = ["ultrafast", "superfast", "veryfast", "faster", "fast", "medium"]
+TUNES = ["none", "animation", "stillimage"]
+CRFS = [18, 21, 23, 26]
+
+
+@dataclass
+class EncoderProfile:
+    preset: str
+    tune: str
+    crf: int
+
+    def options(self):
+        options = {"preset": self.preset, "crf": str(self.crf)}
+        if self.tune != "none":
+            options["tune"] = self.tune
+        return options
+
+    def key(self):
+        return f"x264-{self.preset}-{self.tune}-crf{self.crf}"
+
+
+def profile_path():
+    from manim import config
+
+    return Path(config.media_dir) / "encoder_profile.json"
+
+
+def load_profile(path=None):
+    """The tuned profile for the current resolution and frame rate, or ``None``."""
+    from manim import config
+
+    path = Path(path) if path else profile_path()
+    if not path.exists():
+        return None
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if (data["pixel_width"], data["pixel_height"], data["frame_rate"]) != (
+        config.pixel_width, config.pixel_height, config.frame_rate
+    ):
+        logger.info(f"Ignoring {path}: tuned for {data['pixel_width']}x{data['pixel_height']}@{data['frame_rate']:g}")
+        return None
+    return EncoderProfile(**data["profile"])
+
+
+# --- Quality metrics ---
+def box_mean(image, size):
+    """Mean over every ``size`` x ``size`` window (valid positions only), via an integral image."""
+    integral = np.pad(image, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    total = (
+        integral[size:, size:] - integral[:-size, size:]
+        - integral[size:, :-size] + integral[:-size, :-size]
+    )
+    return total / (size * size)
+
+
+def ssim(reference, distorted, size=8):
+    """Mean SSIM of two 8-bit planes, with a uniform window instead of the usual Gaussian."""
+    x = reference.astype(np.float64)
+    y = distorted.astype(np.float64)
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    mu_x = box_mean(x, size)
+    mu_y = box_mean(y, size)
+    var_x = box_mean(x * x, size) - mu_x ** 2
+    var_y = box_mean(y * y, size) - mu_y ** 2
+    cov = box_mean(x * y, size) - mu_x * mu_y
+    value = ((2 * mu_x * mu_y + c1) * (2 * cov + c2)) / ((mu_x ** 2 + mu_y ** 2 + c1) * (var_x + var_y + c2))
+    return float(value.mean())
+
+
+def psnr(reference, distorted):
+    mse = np.mean((reference.astype(np.float64) - distorted.astype(np.float64)) ** 2)
+    if mse == 0:
+        return float("inf")
+    return float(10 * np.log10(255 ** 2 / mse))
+
+
+# --- Benchmark ---
+def extract_segment(movie_file, output_file, start=0.0, seconds=4.0):
+    """Decode ``seconds`` of ``movie_file`` from ``start`` into a yuv420p .npy stack. Returns the frame rate."""
+    with av.open(str(movie_file)) as container:
+        stream = container.streams.video[0]
+        frames = []
+        for frame in container.decode(stream):
+            if frame.time < start:
+                continue
+            if frame.time >= start + seconds:
+                break
+            frames.append(frame.reformat(format="yuv420p").to_ndarray())
+        rate = stream.average_rate
+    if not frames:
+        raise ValueError(f"No frames in {movie_file} between {start:g}s and {start + seconds:g}s")
+    np.save(output_file, np.stack(frames))
+    return rate
+
+
+def encode_segment(frames, rate, profile, output):
+    """Encode the yuv420p stack ``frames`` to ``output`` with ``profile``; returns the seconds it took."""
+    started = time.perf_counter()
+    with av.open(str(output), mode="w") as container:
+        stream = container.add_stream("libx264", rate=rate, options=profile.options())
+        stream.pix_fmt = "yuv420p"
+        stream.width = frames.shape[2]
+        stream.height = frames.shape[1] * 2 // 3
+        for planes in frames:
+            for packet in stream.encode(av.VideoFrame.from_ndarray(np.asarray(planes), format="yuv420p")):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    return time.perf_counter() - started
+
+
+def encode_candidate(frames_path, rate, profile, work_dir):
+    """Worker: encode the segment with ``profile`` and measure it; the time is only indicative, under load."""
+    frames = np.load(frames_path, mmap_mode="r")
+    height = frames.shape[1] * 2 // 3
+    output = Path(work_dir) / f"{profile.key()}.mp4"
+    encode_seconds = encode_segment(frames, rate, profile, output)
+
+    ssims = []
+    psnrs = []
+    with av.open(str(output)) as container:
+        for index, frame in enumerate(container.decode(video=0)):
+            luma = frame.reformat(format="yuv420p").to_ndarray()[:height]
+            reference = frames[index][:height]
+            ssims.append(ssim(reference, luma))
+            psnrs.append(psnr(reference, luma))
+    result = {
+        "profile": asdict(profile),
+        "encode_seconds": round(encode_seconds, 3),
+        "size_bytes": output.stat().st_size,
+        "ssim": round(min(ssims), 5),
+        "psnr": round(min(psnrs), 2),
+        "timed_alone": False,
+    }
+    output.unlink()
+    return result
+
+
+def tune_encoder(movie_file, start=0.0, seconds=4.0, presets=PRESETS, tunes=TUNES, crfs=CRFS,
+                 min_ssim=0.98, jobs=None, write=True):
+    """Benchmark every preset/tune/CRF combination and return (results, best)."""
+    candidates = [EncoderProfile(preset, tune, crf) for preset, tune, crf in product(presets, tunes, crfs)]
+    jobs = jobs or max(1, (os.cpu_count() or 1) // 4)
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        frames_path = Path(work_dir) / "segment.npy"
+        rate = extract_segment(movie_file, frames_path, start, seconds)
+        frames = np.load(frames_path, mmap_mode="r")
+        width, height = frames.shape[2], frames.shape[1] * 2 // 3
+        logger.info(f"Encoding {len(candidates)} candidates on {jobs} processes")
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+            futures = [
+                pool.submit(encode_candidate, str(frames_path), rate, profile, work_dir)
+                for profile in candidates
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+        # Side by side, the encodes compete for the CPUs: time the ones in the running alone
+        passing = [result for result in results if result["ssim"] >= min_ssim]
+        logger.info(f"Timing {len(passing)} candidates with SSIM >= {min_ssim} one after another")
+        output = Path(work_dir) / "timing.mp4"
+        for result in passing:
+            seconds = encode_segment(frames, rate, EncoderProfile(**result["profile"]), output)
+            result["encode_seconds"] = round(seconds, 3)
+            result["timed_alone"] = True
+            output.unlink()
+        del frames
+
+    results.sort(key=lambda result: (not result["timed_alone"], result["encode_seconds"], result["size_bytes"]))
+    passing.sort(key=lambda result: (result["encode_seconds"], result["size_bytes"]))
+    best = None
+    if passing:
+        fastest = passing[0]["encode_seconds"]
+        # Within 5% of the fastest, prefer the smaller file
+        close = [result for result in passing if result["encode_seconds"] <= fastest * 1.05]
+        best = min(close, key=lambda result: result["size_bytes"])
+    if best is not None and write:
+        path = profile_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "pixel_width": width,
+            "pixel_height": height,
+            "frame_rate": float(rate),
+            "source": str(movie_file),
+            "min_ssim": min_ssim,
+            "profile": best["profile"],
+            "measured": {key: best[key] for key in ("encode_seconds", "size_bytes", "ssim", "psnr")},
+        }, indent=2), encoding="utf-8")
+        logger.info(f"Encoder profile written to {path}")
+    return results, best
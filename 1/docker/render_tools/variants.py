@@ -0,0 +1,226 @@
+"""
+Render once, encode many.
+
+The scene is rasterized once at the master resolution (the ``config`` set
+in the scene file, 1080x1920). Every frame goes to the master encoder and
+is converted once per variant (crop, then scale straight to yuv420p) for
+the variant's own encoder thread, so draft, square and bitrate variants all
+come out of the same render. The sound cues are mixed once and muxed into
+every output.
+
+Variants are given as a comma separated list of preset names or specs::
+
+    draft-720p                  preset (see PRESETS)
+    540x960                     downscale
+    1080x1080+0+420             crop WxH at X,Y of the master frame
+    1080x1080+0+420/720x720     crop, then scale
+    ...@crf30 / ...@4M          quality (CRF) or bitrate, default crf 23
+"""
+
+import queue
+import re
+import threading
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+
+import av
+import numpy as np
+
+from manim import config, logger
+from manim.scene.scene_file_writer import to_av_frame_rate
+
+from .direct import DirectFileWriter
+from .encode import mux_audio
+
+PRESETS = {
+    # 720p draft for review
+    "draft-720p": "720x1280@crf28",
+    # Square crop around the middle of the frame, where the scenes keep the VSCode window
+    "square": "1080x1080+0+420",
+    # Lower bitrate copy of the master for slow connections
+    "master-2m": "1080x1920@2M",
+}
+
+SPEC_RE = re.compile(
+    r"^(?:(?P<cw>\d+)x(?P<ch>\d+)\+(?P<cx>\d+)\+(?P<cy>\d+)/)?"
+    r"(?P<w>\d+)x(?P<h>\d+)(?:\+(?P<x>\d+)\+(?P<y>\d+))?"
+    r"(?:@(?:crf(?P<crf>\d+)|(?P<rate>\d+(?:\.\d+)?)(?P<unit>[kKmM])))?$"
+)
+
+
+@dataclass
+class Variant:
+    name: str
+    width: int
+    height: int
+    crop: tuple = None  # (x, y, width, height) in master pixels
+    crf: int = 23
+    bitrate: int = None
+
+    def output_path(self, movie_file):
+        movie_file = Path(movie_file)
+        return movie_file.with_name(f"{movie_file.stem}.{self.name}{movie_file.suffix}")
+
+
+def parse_variant(text):
+    name = text.strip()
+    spec = PRESETS.get(name, name)
+    match = SPEC_RE.match(spec)
+    if match is None:
+        raise ValueError(f"Can't parse output variant '{text}' (presets: {', '.join(PRESETS)})")
+    groups = match.groupdict()
+    width, height = int(groups["w"]), int(groups["h"])
+    crop = None
+    if groups["cw"] is not None:
+        # crop/scale form
+        crop = tuple(int(groups[key]) for key in ("cx", "cy", "cw", "ch"))
+    elif groups["x"] is not None:
+        # crop only: the output is the crop
+        crop = (int(groups["x"]), int(groups["y"]), width, height)
+    if crop is not None:
+        x, y, crop_width, crop_height = crop
+        if x + crop_width > config.pixel_width or y + crop_height > config.pixel_height:
+            raise ValueError(f"Output variant '{text}' crops outside the {config.pixel_width}x{config.pixel_height} frame")
+    if width % 2 or height % 2:
+        raise ValueError(f"Output variant '{text}' needs an even width and height for yuv420p")
+    variant = Variant(name=re.sub(r"[^\w.-]+", "_", name), width=width, height=height, crop=crop)
+    if groups["crf"] is not None:
+        variant.crf = int(groups["crf"])
+    elif groups["rate"] is not None:
+        scale = 1_000_000 if groups["unit"] in "mM" else 1_000
+        variant.bitrate = int(float(groups["rate"]) * scale)
+    return variant
+
+
+def parse_variants(text):
+    return [parse_variant(part) for part in text.split(",") if part.strip()]
+
+
+# Tells a VariantEncoder thread to finish its file
+CLOSE = object()
+
+
+class VariantEncoder:
+    """One output variant, encoded on its own thread."""
+
+    def __init__(self, variant, movie_file, frame_rate, vfr=False, encoder_profile=None):
+        self.variant = variant
+        self.path = variant.output_path(movie_file)
+        self.vfr = vfr
+        self.container = av.open(str(self.path), mode="w")
+        options = {"an": "1"}
+        if encoder_profile is not None:
+            options.update(encoder_profile.options())
+            # The variant decides the quality
+            del options["crf"]
+        if variant.bitrate is None:
+            options["crf"] = str(variant.crf)
+        if vfr:
+            # See ToolFileWriter.open_partial_movie_stream
+            options["bf"] = "0"
+        self.stream = self.container.add_stream("libx264", rate=to_av_frame_rate(frame_rate), options=options)
+        self.stream.pix_fmt = "yuv420p"
+        self.stream.width = variant.width
+        self.stream.height = variant.height
+        if variant.bitrate is not None:
+            self.stream.bit_rate = variant.bitrate
+        self.stream.codec_context.time_base = 1 / Fraction(self.stream.codec_context.framerate)
+        self.next_pts = 0
+        self.last_pts = -1
+        self.held = None
+        self.queue = queue.Queue(maxsize=8)
+        self.thread = threading.Thread(target=self.encode_loop, name=f"variant-{variant.name}")
+        self.thread.start()
+
+    def convert(self, source):
+        """``source`` (a master-size rgba VideoFrame, or its array for a crop) at this variant's size."""
+        if self.variant.crop is not None:
+            x, y, width, height = self.variant.crop
+            source = av.VideoFrame.from_ndarray(np.ascontiguousarray(source[y:y + height, x:x + width]), format="rgba")
+        return source.reformat(
+            width=self.variant.width, height=self.variant.height, format="yuv420p", interpolation="AREA"
+        )
+
+    def put(self, frame, num_frames):
+        """Queue a converted frame; ``None`` repeats the previous one (VFR renders)."""
+        self.queue.put((frame, num_frames))
+
+    def encode_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is CLOSE:
+                break
+            frame, num_frames = item
+            if self.vfr:
+                if frame is not None:
+                    self.encode(frame, self.next_pts)
+                    self.held = frame.to_ndarray()
+                self.next_pts += num_frames
+                continue
+            self.encode(frame, self.next_pts)
+            self.next_pts += 1
+            if num_frames > 1:
+                planes = frame.to_ndarray()
+                for _ in range(num_frames - 1):
+                    # A VideoFrame can't be encoded twice, see SceneFileWriter.encode_and_write_frame
+                    self.encode(av.VideoFrame.from_ndarray(planes, format="yuv420p"), self.next_pts)
+                    self.next_pts += 1
+        if self.vfr and self.held is not None and self.next_pts - 1 > self.last_pts:
+            self.encode(av.VideoFrame.from_ndarray(self.held, format="yuv420p"), self.next_pts - 1)
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+    def encode(self, frame, pts):
+        frame.pts = pts
+        frame.time_base = self.stream.codec_context.time_base
+        for packet in self.stream.encode(frame):
+            self.container.mux(packet)
+        self.last_pts = pts
+
+    def close(self):
+        self.queue.put(CLOSE)
+        self.thread.join()
+
+
+class FanOutFileWriter(DirectFileWriter):
+    """DirectFileWriter that also feeds every frame to the output variants."""
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        self.variant_encoders = []
+        super().__init__(renderer, scene_name, **kwargs)
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        opening = not self.stream_open
+        super().begin_animation(allow_write, file_path)
+        if opening and self.stream_open:
+            self.variant_encoders = [
+                VariantEncoder(variant, self.movie_file_path, self.renderer.output_frame_rate, vfr=self.renderer.vfr,
+                               encoder_profile=self.renderer.encoder_profile)
+                for variant in self.renderer.variants
+            ]
+
+    def encode_and_write_frame(self, frame, num_frames):
+        super().encode_and_write_frame(frame, num_frames)
+        if not self.variant_encoders:
+            return
+        if self.renderer.vfr and self.frame_repeated:
+            for encoder in self.variant_encoders:
+                encoder.put(None, num_frames)
+            return
+        # Converted here, before the frame pool takes the buffer back
+        master = av.VideoFrame.from_ndarray(frame, format="rgba")
+        for encoder in self.variant_encoders:
+            source = frame if encoder.variant.crop is not None else master
+            encoder.put(encoder.convert(source), num_frames)
+
+    def finish(self):
+        for encoder in self.variant_encoders:
+            encoder.close()
+        super().finish()
+        track = self.mixed_track()
+        for encoder in self.variant_encoders:
+            if track is not None:
+                mux_audio(encoder.path, track)
+            logger.info(f"Output variant {encoder.variant.name} written to {encoder.path}")
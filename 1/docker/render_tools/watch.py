@@ -0,0 +1,316 @@
+"""
+Re-render only the acts a source edit touched, every time the scene file is saved.
+
+Each act is rendered like a ``--parallel-acts`` worker (parallel.py) into
+``media/watch/<Scene>/``, and the acts are stitched into a preview movie
+that is replaced in one rename, so a player can simply reload it. On every
+save the scene source is compared with the version each act was rendered
+from, by AST (comments, blank lines and moved lines don't count):
+
+* a changed top-level statement of ``construct`` marks its act, and every
+  later act that reads a local variable or ``self.<attribute>`` the changed
+  statements mention;
+* a changed method of the scene class (or of a base class in the same file)
+  marks every act that calls it, directly or through other methods;
+* anything else (imports, module constants, act markers added or removed)
+  marks every act.
+
+After an act is rendered again, its exit snapshot is compared with the
+entry snapshot of the next act. A different scene time, play count or
+number of cues marks every later act (their cues moved); different
+mobjects mark the next act, and so on. The other acts keep their manifests
+and partial movie files, and an act that is rendered again still gets
+manim's cache hits for its unchanged plays.
+"""
+
+import ast
+import copy
+import hashlib
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from manim import config, logger
+
+from .acts import act_at_line, find_acts_in_file
+from .jobqueue import read_json, write_json
+from .parallel import render_act, stitch_acts
+from .profiles import current_profile
+
+
+def digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+# --- Fingerprints ---
+def names_in(node):
+    """(names mentioned, names assigned) in ``node``: local variables and ``self.<attribute>``."""
+    mentioned, assigned = set(), set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and child.id != "self":
+            mentioned.add(child.id)
+            if isinstance(child.ctx, (ast.Store, ast.Del)):
+                assigned.add(child.id)
+        elif (isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name)
+              and child.value.id == "self"):
+            mentioned.add(f"self.{child.attr}")
+            if isinstance(child.ctx, (ast.Store, ast.Del)):
+                assigned.add(f"self.{child.attr}")
+    return mentioned, assigned
+
+
+def scene_classes(tree, scene_name):
+    """The class ``scene_name`` and its base classes defined in the same module, bases first."""
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    chain = []
+    name = scene_name
+    while name in classes and classes[name] not in chain:
+        node = classes[name]
+        chain.insert(0, node)
+        bases = [base.id for base in node.bases if isinstance(base, ast.Name)]
+        name = bases[0] if bases else None
+    return chain
+
+
+def source_fingerprint(path, scene_name):
+    """What :func:`dirty_acts` compares: digests of the scene source, per act and per method."""
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    acts = find_acts_in_file(path, scene_name)
+    methods = {}
+    for node in scene_classes(tree, scene_name):
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                # A subclass method overrides its base's
+                methods[item.name] = item
+    construct = methods.pop("construct", None)
+    if construct is None:
+        raise ValueError(f"No construct in {scene_name} of {path}")
+
+    statements = [[] for _ in acts or [None]]
+    local_names = set()
+    for statement in construct.body:
+        mentioned, assigned = names_in(statement)
+        local_names |= assigned
+        entry = [digest(ast.dump(statement)), sorted(mentioned)]
+        # A statement spanning a marker belongs to every act it spans
+        first = act_at_line(acts, statement.lineno)
+        last = act_at_line(acts, statement.end_lineno)
+        for index in range(first, last + 1):
+            statements[index].append(entry)
+
+    rest = copy.deepcopy(tree)
+    for node in scene_classes(rest, scene_name):
+        node.body = [item for item in node.body if not isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    return {
+        "labels": [act.label for act in acts],
+        "rest": digest(ast.dump(rest)),
+        "methods": {
+            name: [digest(ast.dump(node)), sorted(names_in(node)[0])] for name, node in methods.items()
+        },
+        "locals": sorted(local_names),
+        "acts": [
+            {"digest": digest("\n".join(entry[0] for entry in entries)), "statements": entries}
+            for entries in statements
+        ],
+    }
+
+
+def changed_methods(old, new):
+    """Methods that were added, removed or edited."""
+    names = set(old["methods"]) | set(new["methods"])
+    return {name for name in names if old["methods"].get(name, [None])[0] != new["methods"].get(name, [None])[0]}
+
+
+def callers_of(fingerprint, methods):
+    """``methods`` and the methods that call them, directly or through other methods."""
+    callers = set(methods)
+    while True:
+        found = {
+            name for name, (_, mentioned) in fingerprint["methods"].items()
+            if name not in callers and any(f"self.{method}" in mentioned for method in callers)
+        }
+        if not found:
+            return callers
+        callers |= found
+
+
+def reachable_methods(fingerprint):
+    """Methods ``construct`` calls, directly or through other methods."""
+    mentioned = {name for act in fingerprint["acts"] for _, names in act["statements"] for name in names}
+    reached = {name for name in fingerprint["methods"] if f"self.{name}" in mentioned}
+    while True:
+        found = {
+            name for name in fingerprint["methods"]
+            if name not in reached
+            and any(f"self.{name}" in fingerprint["methods"][caller][1] for caller in reached)
+        }
+        if not found:
+            return reached
+        reached |= found
+
+
+def dirty_acts(old, new):
+    """Indices of the acts of ``new`` to render again, given the fingerprint they were rendered from."""
+    everything = set(range(len(new["acts"])))
+    if old is None or old["labels"] != new["labels"] or old["rest"] != new["rest"]:
+        return everything
+    local_names = set(new["locals"])
+    edited = changed_methods(old, new)
+    if edited - reachable_methods(new):
+        # Called by manim itself (setup), or not at all: can't tell which acts it affects
+        return everything
+    methods = {f"self.{name}" for name in callers_of(new, edited)}
+    dirty = set()
+    touched = set()
+    for index, act in enumerate(new["acts"]):
+        mentioned = {name for _, names in act["statements"] for name in names}
+        if touched & mentioned or methods & mentioned:
+            dirty.add(index)
+        previous = old["acts"][index]
+        if previous is not None and previous["digest"] == act["digest"]:
+            continue
+        dirty.add(index)
+        if previous is None:
+            changed = act["statements"]
+        else:
+            before = {entry[0] for entry in previous["statements"]}
+            after = {entry[0] for entry in act["statements"]}
+            changed = [entry for entry in act["statements"] + previous["statements"]
+                       if (entry[0] in before) != (entry[0] in after)]
+        touched |= {name for _, names in changed for name in names} & local_names
+    return dirty
+
+
+# --- Boundaries ---
+def boundary_change(leaving, entering):
+    """How an act's exit differs from the next act's entry: "timing", "state" or ``None``."""
+    if leaving is None or entering is None:
+        return "timing"
+    if (abs(leaving["time"] - entering["time"]) > 1e-3 or leaving["num_plays"] != entering["num_plays"]
+            or leaving["sound_cues"] != entering["sound_cues"]):
+        return "timing"
+    if leaving["mobjects"] != entering["mobjects"] or leaving.get("state") != entering.get("state"):
+        return "state"
+    return None
+
+
+class SceneWatcher:
+    def __init__(self, scene_file, scene_name, jobs=None, preview_file=None):
+        self.scene_file = Path(scene_file)
+        self.scene_name = scene_name
+        self.jobs = jobs or os.cpu_count() or 1
+        profile = current_profile()
+        # Acts rendered with another profile can't go into this preview
+        self.work_dir = Path(config.media_dir) / "watch" / (f"{scene_name}.{profile.name}" if profile else scene_name)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.record_path = self.work_dir / "watch.json"
+        self.preview_file = Path(preview_file) if preview_file else self.work_dir / f"preview{config.movie_file_extension}"
+
+    def act_argument(self, fingerprint, index):
+        # A scene without acts is rendered whole
+        return index if fingerprint["labels"] else None
+
+    def manifest(self, fingerprint, index):
+        act = self.act_argument(fingerprint, index)
+        name = "scene.json" if act is None else f"act_{act:02d}.json"
+        return read_json(self.work_dir / name)
+
+    def render(self, fingerprint, indices):
+        """Render ``indices`` at once, in fresh processes. Returns the indices that failed."""
+        failed = set()
+        # spawn: every render imports the scene module as it is now
+        context = multiprocessing.get_context("spawn")
+        workers = min(self.jobs, len(indices))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as pool:
+            futures = {
+                pool.submit(render_act, str(self.scene_file), self.scene_name,
+                            self.act_argument(fingerprint, index), str(self.work_dir)): index
+                for index in sorted(indices)
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception:
+                    failed.add(futures[future])
+                    logger.error(f"Act {futures[future]} failed:\n{traceback.format_exc(limit=3)}")
+        return failed
+
+    def update(self):
+        """Render what changed since the last update and refresh the preview. Returns the rendered acts."""
+        started = time.perf_counter()
+        fingerprint = source_fingerprint(self.scene_file, self.scene_name)
+        previous = (read_json(self.record_path) or {}).get("fingerprint")
+        count = len(fingerprint["acts"])
+        pending = dirty_acts(previous, fingerprint)
+        pending |= {index for index in range(count) if self.manifest(fingerprint, index) is None}
+        # What every act was rendered from; None until it has been rendered from this version
+        record = {**fingerprint, "acts": list(fingerprint["acts"])}
+        if previous is not None and previous["labels"] == fingerprint["labels"]:
+            record["acts"] = [
+                act if previous["acts"][index] is not None else None
+                for index, act in enumerate(fingerprint["acts"])
+            ]
+        rendered = set()
+        while pending:
+            labels = ", ".join(fingerprint["labels"][index] if fingerprint["labels"] else "scene"
+                               for index in sorted(pending))
+            logger.info(f"Rendering {labels}")
+            for index in pending:
+                record["acts"][index] = None
+            write_json(self.record_path, {"fingerprint": record})
+            failed = self.render(fingerprint, pending)
+            if failed:
+                raise RuntimeError(f"{len(failed)} acts failed; fix the scene and save again")
+            for index in pending:
+                record["acts"][index] = fingerprint["acts"][index]
+            write_json(self.record_path, {"fingerprint": record})
+            rendered |= pending
+            pending = set()
+            for index in range(count - 1):
+                change = boundary_change(
+                    self.manifest(fingerprint, index)["exit"], self.manifest(fingerprint, index + 1)["entry"]
+                )
+                if change == "timing":
+                    pending |= set(range(index + 1, count))
+                    break
+                if change == "state":
+                    pending.add(index + 1)
+            pending -= rendered
+        if rendered or not self.preview_file.exists():
+            self.refresh_preview(fingerprint)
+        if rendered:
+            logger.info(
+                f"{len(rendered)} of {count} acts rendered in {time.perf_counter() - started:.1f}s; "
+                f"preview at {self.preview_file}"
+            )
+        return sorted(rendered)
+
+    def refresh_preview(self, fingerprint):
+        manifests = [self.manifest(fingerprint, index) for index in range(len(fingerprint["acts"]))]
+        temp = self.preview_file.with_name(f".{self.preview_file.stem}.tmp{self.preview_file.suffix}")
+        stitch_acts(manifests, temp)
+        os.replace(temp, self.preview_file)
+
+    def watch(self, poll_seconds=0.5):
+        """Update on every save until interrupted."""
+        logger.info(f"Watching {self.scene_file} for changes to {self.scene_name}")
+        seen = None
+        while True:
+            mtime = self.scene_file.stat().st_mtime_ns
+            if mtime == seen:
+                time.sleep(poll_seconds)
+                continue
+            # Let an editor finish writing the file
+            time.sleep(poll_seconds)
+            if self.scene_file.stat().st_mtime_ns != mtime:
+                continue
+            seen = mtime
+            try:
+                self.update()
+            except SyntaxError as error:
+                logger.warning(f"{self.scene_file}: {error}; waiting for the next save")
+            except Exception as error:
+                logger.error(f"Update failed: {error}")
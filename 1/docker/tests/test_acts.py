@@ -0,0 +1,108 @@
+from render_tools.acts import (
+    act_at_line, find_acts_in_file, parse_acts, parse_sections, scene_names_in_file, select_act,
+)
+
+CONSTRUCT = '''\
+    def construct(self):
+        title = Text("Docker")
+        # ==========================
+        # SCENE 1: The Problem (0-30s)
+        # ==========================
+        self.play(Write(title))
+        # SCENE 4B: Dockerfile Explanation Part 2 (40s - 50.5s)
+        self.wait()
+        # ENDING: Outro
+        self.play_outro()
+'''
+
+
+def test_parse_acts_reads_banners():
+    acts = parse_acts(CONSTRUCT.splitlines(), first_line=10)
+    assert [(act.index, act.label, act.title, act.line) for act in acts] == [
+        (0, "SCENE 1", "The Problem", 13),
+        (1, "SCENE 4B", "Dockerfile Explanation Part 2", 16),
+        (2, "ENDING", "Outro", 18),
+    ]
+    assert [(act.planned_start, act.planned_end) for act in acts] == [(0, 30), (40, 50.5), (None, None)]
+    assert [act.key for act in acts] == ["1", "4B", "ENDING"]
+
+
+def test_lines_map_to_acts():
+    acts = parse_acts(CONSTRUCT.splitlines(), first_line=10)
+    # Code above the first banner belongs to the first act
+    assert [act_at_line(acts, line) for line in (11, 13, 15, 16, 17, 19)] == [0, 0, 0, 1, 1, 2]
+    assert act_at_line([], 42) == 0
+
+
+def test_select_act():
+    acts = parse_acts(CONSTRUCT.splitlines())
+    assert select_act(acts, "4b").label == "SCENE 4B"
+    assert select_act(acts, "scene  4B").label == "SCENE 4B"
+    assert select_act(acts, "ending").label == "ENDING"
+    assert select_act(acts, 0).label == "SCENE 1"
+    try:
+        select_act(acts, "7")
+    except ValueError as error:
+        assert "Known acts: 1, 4B, ENDING" in str(error)
+    else:
+        raise AssertionError("select_act accepted an unknown act")
+
+
+def test_find_acts_in_file_reads_only_the_scene(tmp_path):
+    path = tmp_path / "scene.py"
+    path.write_text(
+        "# SCENE 0: Module comment\n"
+        "class Base(Scene):\n"
+        "    def helper(self):\n"
+        "        # SCENE 9: In a helper\n"
+        "        pass\n"
+        "\n"
+        "class Story(Base):\n"
+        + CONSTRUCT,
+        encoding="utf-8",
+    )
+    assert [act.label for act in find_acts_in_file(path, "Story")] == ["SCENE 1", "SCENE 4B", "ENDING"]
+    assert find_acts_in_file(path, "Base") == []
+    assert scene_names_in_file(path) == ["Story"]
+
+
+SECTIONS = '''\
+    def construct(self):
+        title = Text("Docker")
+        self.next_section("Intro")
+        self.play(Write(title))
+        self.next_section(name="Compose", skip_animations=False)
+        self.wait()
+        self.next_section()
+'''
+
+
+def test_parse_sections_one_act_per_call():
+    acts = parse_sections(SECTIONS.splitlines(keepends=True), first_line=10)
+    assert [(act.index, act.label, act.title, act.line) for act in acts] == [
+        (0, "SECTION 1", "Intro", 12),
+        (1, "SECTION 2", "Compose", 14),
+        (2, "SECTION 3", "", 16),
+    ]
+    assert [act_at_line(acts, line) for line in (11, 13, 14, 16)] == [0, 0, 1, 2]
+
+
+def test_parse_sections_without_calls():
+    assert parse_sections(["    def construct(self):\n", "        self.wait()\n"]) == []
+
+
+def test_banners_win_over_sections(tmp_path):
+    path = tmp_path / "scene.py"
+    path.write_text(
+        "class Story(Scene):\n"
+        "    def construct(self):\n"
+        "        # SCENE 1: Setup (0-30s)\n"
+        "        self.next_section('ignored')\n"
+        "        self.wait()\n"
+        "\n"
+        "class Plain(Scene):\n"
+        + SECTIONS,
+        encoding="utf-8",
+    )
+    assert [act.label for act in find_acts_in_file(path, "Story")] == ["SCENE 1"]
+    assert [act.title for act in find_acts_in_file(path, "Plain")] == ["Intro", "Compose", ""]
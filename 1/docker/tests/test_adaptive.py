@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from render_tools.adaptive import blend_frames, choose_frame_step, max_rate_slope  # noqa: E402
+
+
+def test_blend_frames_are_evenly_spaced():
+    first = np.zeros((1, 1, 4), np.uint8)
+    second = np.full((1, 1, 4), 255, np.uint8)
+    frames = blend_frames(first, second, 3)
+    assert [int(frame[0, 0, 0]) for frame in frames] == [64, 128, 191]
+    assert all(frame.dtype == np.uint8 for frame in frames)
+
+
+def test_blend_of_equal_frames_is_the_frame():
+    frame = np.arange(16, dtype=np.uint8).reshape(2, 2, 4)
+    assert all(np.array_equal(blended, frame) for blended in blend_frames(frame, frame, 2))
+
+
+def test_max_rate_slope():
+    assert max_rate_slope(lambda t: t) == pytest.approx(1.0)
+    assert max_rate_slope(lambda t: t * t) == pytest.approx(2.0, abs=0.01)
+
+
+def play(animations, moving_mobjects=()):
+    return SimpleNamespace(animations=animations, moving_mobjects=list(moving_mobjects))
+
+
+def camera():
+    return SimpleNamespace(frame_rate=60, pixel_height=1920, frame_height=14.2)
+
+
+def test_declared_render_fps_wins():
+    assert choose_frame_step(play([SimpleNamespace(render_fps=30)]), camera(), max_step=4) == 2
+    assert choose_frame_step(play([SimpleNamespace(render_fps=20), SimpleNamespace(render_fps=30)]),
+                             camera(), max_step=4) == 3
+
+
+def test_updaters_and_unknown_motion_get_every_frame():
+    ticking = SimpleNamespace(get_family_updaters=lambda: [lambda mobject, dt: None])
+    assert choose_frame_step(play([], [ticking]), camera()) == 1
+    # No motion model for this animation
+    assert choose_frame_step(play([SimpleNamespace(run_time=1.0)]), camera()) == 1
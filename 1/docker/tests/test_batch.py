@@ -0,0 +1,57 @@
+from render_tools.batch import BatchJob, batch_jobs, discover_scenes, format_summary, plan_pool
+
+SCENES = [("docker.py", "Intro"), ("docker.py", "Outro"), ("laravel.py", "Story")]
+
+
+def test_plan_pool_defaults_to_two_encoder_threads():
+    assert plan_pool(cpus=12) == (4, 2)
+    assert plan_pool(cpus=2) == (1, 2)
+
+
+def test_plan_pool_shares_cpus_between_given_jobs():
+    assert plan_pool(jobs=3, cpus=12) == (3, 3)
+    assert plan_pool(jobs=16, cpus=12) == (16, 1)
+    assert plan_pool(encoder_threads=5, cpus=12) == (2, 5)
+
+
+def test_drafts_start_before_finals():
+    jobs = batch_jobs(SCENES, ("draft", "final"))
+    assert [job.quality for job in jobs] == ["draft"] * 3 + ["final"] * 3
+    assert [job.scene for job in jobs[:3]] == ["Intro", "Outro", "Story"]
+
+
+def test_slowest_jobs_start_first():
+    timings = {"final/docker.Outro": 300.0, "final/laravel.Story": 120.0, "draft/laravel.Story": 20.0}
+    jobs = batch_jobs(SCENES, ("final", "draft"), timings)
+    assert [(job.quality, job.name) for job in jobs] == [
+        ("draft", "laravel.Story"), ("draft", "docker.Intro"), ("draft", "docker.Outro"),
+        ("final", "docker.Outro"), ("final", "laravel.Story"), ("final", "docker.Intro"),
+    ]
+    assert batch_jobs(SCENES, ("final",))[0].quality == "final"
+
+
+def test_every_job_has_its_own_media_folder(tmp_path):
+    job = BatchJob("draft", "scenes/docker.py", "Intro")
+    assert job.media_dir(tmp_path) == tmp_path / "draft" / "docker.Intro"
+
+
+def test_discover_scenes_skips_broken_files(tmp_path):
+    (tmp_path / "scene.py").write_text(
+        "class TikTokScene(Scene):\n    pass\n\n"
+        "class Intro(TikTokScene):\n    def construct(self):\n        pass\n"
+    )
+    (tmp_path / "broken.py").write_text("def (:\n")
+    assert discover_scenes(tmp_path) == [(str(tmp_path / "scene.py"), "Intro")]
+
+
+def test_format_summary():
+    rows = [
+        {"quality": "draft", "scene_file": "docker.py", "scene": "Intro", "status": "ok", "seconds": 12.0,
+         "plays": 40, "cached": 38, "duration": 61.5, "movie_file": "media/batch/draft/docker.Intro/Intro.mp4"},
+        {"quality": "final", "scene_file": "docker.py", "scene": "Intro", "status": "failed",
+         "error": "ValueError: boom"},
+    ]
+    summary = format_summary(rows, 6.0)
+    assert "ValueError: boom" in summary
+    assert "1 of 2 jobs rendered in 6.0s (12.0s of render time, 2.0x)" in summary
+    assert summary.endswith("  media/batch/draft/docker.Intro/Intro.mp4")
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import config  # noqa: E402
+
+from render_tools.checkpoint import Checkpoint  # noqa: E402
+from render_tools.encode import SoundCue  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def media_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "media_dir", str(tmp_path / "media"))
+    monkeypatch.setattr(config, "movie_file_extension", ".mp4", raising=False)
+
+
+@pytest.fixture
+def scene_file(tmp_path):
+    path = tmp_path / "docker_scene.py"
+    path.write_text("class Intro: pass\n")
+    return path
+
+
+def run(checkpoint, tmp_path, plays):
+    """Record ``plays`` (partial file contents, None for a play without a file) like a render would."""
+    renderer = SimpleNamespace(
+        num_plays=0, current_act=0, time=0.0, animations_hashes=[],
+        file_writer=SimpleNamespace(partial_movie_files=[], sound_cues=[SoundCue("ding.wav", 0.5)]),
+    )
+    for index, content in enumerate(plays):
+        renderer.num_plays += 1
+        renderer.time += 1.0
+        renderer.animations_hashes.append(f"hash{index}")
+        if content is not None:
+            partial = tmp_path / f"play{index}.mp4"
+            partial.write_bytes(content)
+            renderer.file_writer.partial_movie_files.append(str(partial))
+        checkpoint.record(renderer)
+    return renderer
+
+
+def test_resume_reuses_intact_plays(scene_file, tmp_path):
+    run(Checkpoint(scene_file, "Intro"), tmp_path, [b"one", b"two", None, b"four"])
+    resumed = Checkpoint(scene_file, "Intro", resume=True)
+    assert [entry["hash"] for entry in resumed.resumable] == ["hash0", "hash1", "hash2", "hash3"]
+    assert resumed.resumed_entry(2)["partial_movie_file"] is None
+    assert resumed.resumed_entry(4) is None
+
+
+def test_resume_stops_at_a_damaged_segment(scene_file, tmp_path):
+    run(Checkpoint(scene_file, "Intro"), tmp_path, [b"one", b"two", b"three"])
+    (tmp_path / "play1.mp4").write_bytes(b"tw")
+    resumed = Checkpoint(scene_file, "Intro", resume=True)
+    assert [entry["index"] for entry in resumed.resumable] == [0]
+
+
+def test_resume_ignores_a_stale_checkpoint(scene_file, tmp_path):
+    run(Checkpoint(scene_file, "Intro", window={"from_act": None}), tmp_path, [b"one"])
+    assert Checkpoint(scene_file, "Intro", window={"from_act": "3"}, resume=True).resumable == []
+    scene_file.write_text("class Intro: pass  # edited\n")
+    assert Checkpoint(scene_file, "Intro", window={"from_act": None}, resume=True).resumable == []
+
+
+def test_manifest_is_replaced_whole(scene_file, tmp_path):
+    checkpoint = Checkpoint(scene_file, "Intro")
+    renderer = run(checkpoint, tmp_path, [b"one"])
+    checkpoint.write(renderer, complete=True)
+    assert [path.name for path in checkpoint.path.parent.iterdir()] == [checkpoint.path.name]
+    manifest = checkpoint.path.read_text(encoding="utf-8")
+    assert '"complete": true' in manifest and '"ding.wav"' in manifest
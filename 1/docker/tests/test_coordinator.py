@@ -0,0 +1,63 @@
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip("manim")
+
+from render_tools.coordinator import job_id, report_job, submit_renders  # noqa: E402
+from render_tools.jobqueue import JobQueue  # noqa: E402
+
+
+def finished(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+def test_report_job_completes(tmp_path):
+    queue = JobQueue(tmp_path)
+    queue.submit("0000-Story-scene", {"scene": "Story"})
+    lease = queue.claim("node-a")
+    assert report_job(queue, lease, finished({"render_seconds": 1.0})) == 1
+    assert queue.ids("done") == ["0000-Story-scene"]
+
+
+def test_report_job_requeues_a_failed_render(tmp_path):
+    queue = JobQueue(tmp_path)
+    queue.submit("0000-Story-scene", {"scene": "Story"})
+    lease = queue.claim("node-a")
+    assert report_job(queue, lease, finished(error=RuntimeError("boom"))) == 0
+    assert queue.ids("pending") == ["0000-Story-scene"]
+
+
+def test_report_job_with_a_lost_lease(tmp_path):
+    queue = JobQueue(tmp_path)
+    queue.submit("0000-Story-scene", {"scene": "Story"})
+    lease = queue.claim("node-a")
+    queue.reap()
+    assert report_job(queue, lease, finished({"render_seconds": 1.0})) == 0
+    assert queue.ids("done") == []
+
+
+def test_submit_gives_each_scene_consecutive_orders(tmp_path):
+    scene_file = tmp_path / "scene.py"
+    scene_file.write_text(
+        "class Intro(Scene):\n"
+        "    def construct(self):\n"
+        "        # SCENE 1: One\n"
+        "        self.wait()\n"
+        "        # SCENE 2: Two\n"
+        "        self.wait()\n"
+        "\n"
+        "class Outro(Scene):\n"
+        "    def construct(self):\n"
+        "        self.wait()\n",
+        encoding="utf-8",
+    )
+    queue = JobQueue(tmp_path / "queue")
+    assert submit_renders(queue, scene_file) == [job_id(0, "Intro", 0), job_id(1, "Intro", 1), job_id(2, "Outro", None)]
+    # The same file again is a new submission
+    assert submit_renders(queue, scene_file, ["Outro"]) == ["0003-Outro-scene"]
@@ -0,0 +1,69 @@
+import io
+import multiprocessing
+import os
+
+import pytest
+
+from render_tools.daemon import RenderDaemon, run_in_daemon, send
+
+# Changed by every job; a job that sees it changed ran in a process another job used
+STATE = {"jobs": 0}
+
+
+def handler(argv):
+    STATE["jobs"] += 1
+    line = f"jobs={STATE['jobs']} cwd={os.getcwd()} RENDER_PROFILE={os.environ.get('RENDER_PROFILE')}\n"
+    # To the client connection itself: under pytest, sys.stdout isn't file descriptor 1
+    os.write(1, line.encode())
+    return int(argv[1]) if argv[0] == "exit" else 0
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    path = tmp_path / "d.sock"
+    monkeypatch.setenv("RENDER_PROFILE", "set-in-the-daemon")
+    # The daemon forks its jobs, so it can't run on a pytest thread
+    process = multiprocessing.get_context("fork").Process(target=RenderDaemon(path, handler, max_jobs=2).serve)
+    process.start()
+    for _ in range(200):
+        if path.exists():
+            break
+        process.join(0.01)
+    yield path
+    send(path, {"command": "stop"})
+    process.join(10)
+    assert process.exitcode == 0
+
+
+def run(path, argv, cwd, env):
+    output = io.BytesIO()
+    reply = send(path, {"argv": argv, "cwd": str(cwd), "env": env}, output)
+    return reply["exit"], output.getvalue().decode()
+
+
+def test_jobs_start_from_the_same_state(daemon, tmp_path):
+    first = run(daemon, ["render"], tmp_path, {})
+    second = run(daemon, ["render"], tmp_path, {})
+    assert first == second == (0, f"jobs=1 cwd={tmp_path} RENDER_PROFILE=None\n")
+
+
+def test_jobs_take_the_client_environment(daemon, tmp_path):
+    scene_dir = tmp_path / "scenes"
+    scene_dir.mkdir()
+    assert run(daemon, ["render"], scene_dir, {"RENDER_PROFILE": "draft-540p30"})[1].endswith(
+        f"cwd={scene_dir} RENDER_PROFILE=draft-540p30\n"
+    )
+    # Unset in the client is unset in the job, even where the daemon has it
+    assert run(daemon, ["render"], scene_dir, {})[1].endswith("RENDER_PROFILE=None\n")
+
+
+def test_exit_status_reaches_the_client(daemon, tmp_path, monkeypatch):
+    assert run(daemon, ["exit", "3"], tmp_path, {})[0] == 3
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RENDER_PROFILE", "proxy")
+    assert run_in_daemon(["exit", "0"], daemon) == 0
+
+
+def test_status(daemon):
+    status = send(daemon, {"command": "status"})
+    assert status["jobs"] == [] and status["waiting"] == 0
@@ -0,0 +1,72 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from pydub import AudioSegment
+
+pytest.importorskip("manim")
+
+from render_tools import direct, encode  # noqa: E402
+from render_tools.direct import DirectFileWriter  # noqa: E402
+from render_tools.encode import SoundCue  # noqa: E402
+
+
+@pytest.fixture
+def writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(direct, "write_to_movie", lambda: True)
+    monkeypatch.setattr(encode, "get_full_sound_file_path", Path)
+    writer = object.__new__(DirectFileWriter)
+    writer.stream_open = False
+    writer.mixed = None
+    writer.sound_cues = []
+    writer.subcaptions = []
+    writer.movie_file_path = tmp_path / "Intro.mp4"
+    writer.renderer = SimpleNamespace(
+        time=0.0, store=None, window_offset=lambda: 0.0, cue_in_window=lambda cue: True,
+    )
+    writer.opened = []
+    writer.closed = 0
+
+    def open_partial_movie_stream(file_path=None):
+        writer.opened.append(file_path)
+
+    def close_partial_movie_stream():
+        writer.closed += 1
+
+    writer.open_partial_movie_stream = open_partial_movie_stream
+    writer.close_partial_movie_stream = close_partial_movie_stream
+    writer.print_file_ready_message = lambda path: None
+    return writer
+
+
+def test_one_stream_for_every_play(writer):
+    for _ in range(3):
+        writer.begin_animation(allow_write=True)
+        writer.end_animation(allow_write=True)
+    # A skipped play doesn't open anything
+    writer.begin_animation(allow_write=False)
+    assert writer.opened == [writer.movie_file_path]
+    writer.finish()
+    assert writer.closed == 1
+
+
+def test_cues_are_mixed_into_one_track(writer, tmp_path, monkeypatch):
+    ding = tmp_path / "ding.wav"
+    AudioSegment.silent(200, frame_rate=44100).export(ding, format="wav")
+    writer.sound_cues = [SoundCue(str(ding), 0.5), SoundCue(str(ding), 1.9)]
+    writer.renderer.time = 2.0
+    muxed = []
+    monkeypatch.setattr(direct, "mux_audio", lambda movie, track: muxed.append((movie, track)))
+    writer.begin_animation(allow_write=True)
+    writer.finish()
+    [(movie, track)] = muxed
+    assert movie == writer.movie_file_path
+    # The last cue runs past the end of the video
+    assert track.duration_seconds == pytest.approx(2.1, abs=0.01)
+
+
+def test_no_cues_no_audio(writer, monkeypatch):
+    monkeypatch.setattr(direct, "mux_audio", lambda movie, track: pytest.fail("muxed a silent track"))
+    writer.begin_animation(allow_write=True)
+    writer.finish()
+    assert writer.closed == 1
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+pytest.importorskip("cairo")
+
+from manim import RIGHT, UP, Camera, Circle, Square, Text  # noqa: E402
+
+from render_tools.dirty import DirtyRectCamera  # noqa: E402
+
+
+def bare_camera(family):
+    camera = object.__new__(DirtyRectCamera)
+    camera.pixel_width, camera.pixel_height = 100, 200
+    camera.drawn_order = [id(mobject) for mobject in family]
+    return camera
+
+
+def test_changed_box_covers_old_and_new_places():
+    still, moved = family = [object(), object()]
+    camera = bare_camera(family)
+    previous = {id(still): ("a", (10, 10, 20, 20)), id(moved): ("b", (50, 50, 60, 60))}
+    current = {id(still): ("a", (10, 10, 20, 20)), id(moved): ("b2", (55, 70, 65, 80))}
+    assert camera.changed_box(previous, current, family) == (50, 50, 65, 80)
+    assert camera.changed_box(previous, previous, family) is False
+    # A reordered family can't be patched in place
+    assert camera.changed_box(previous, current, family[::-1]) is None
+
+
+def test_large_changes_redraw_the_whole_frame():
+    appeared = object()
+    camera = bare_camera([])
+    assert camera.changed_box({}, {id(appeared): ("new", (0, 0, 100, 150))}, [appeared]) is None
+
+
+def test_incremental_frames_match_full_redraws():
+    size = {"pixel_width": 216, "pixel_height": 384}
+    dirty = DirtyRectCamera(**size)
+    serial = Camera(**size)
+    serial.reset()
+    background = serial.pixel_array.copy()
+    title = Text("Dockerfile").shift(UP * 5)
+    static = Square(side_length=3, fill_opacity=0.4)
+    cursor = Circle(radius=0.2, fill_opacity=1)
+    for frame in range(12):
+        cursor.move_to(RIGHT * (frame * 0.1 - 0.6))
+        if frame == 6:
+            title.set_color("#FF8800")
+        mobjects = [static, title, cursor]
+        dirty.capture_dirty(background, mobjects)
+        serial.reset()
+        serial.capture_mobjects(mobjects)
+        assert np.array_equal(dirty.pixel_array, serial.pixel_array), f"frame {frame}"
+    assert dirty.full_frames == 1
+    assert dirty.frames - dirty.full_frames - dirty.unchanged_frames == 11
@@ -0,0 +1,56 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+av = pytest.importorskip("av")
+
+from render_tools.encode import has_held_frames, restore_cfr  # noqa: E402
+from render_tools.tuning import EncoderProfile  # noqa: E402
+
+
+def write_movie(path, frame_pts, rate=10):
+    """A small movie with one grey frame at each of ``frame_pts`` (in frames at ``rate``)."""
+    with av.open(str(path), mode="w") as container:
+        stream = container.add_stream("libx264", rate=rate, options={"bf": "0"})
+        stream.width, stream.height = 64, 128
+        stream.pix_fmt = "yuv420p"
+        stream.codec_context.time_base = Fraction(1, rate)
+        for index, pts in enumerate(frame_pts):
+            frame = av.VideoFrame.from_ndarray(np.full((128, 64, 3), 40 * index, dtype=np.uint8), format="rgb24")
+            frame.pts = pts
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    return path
+
+
+def frame_times(path):
+    with av.open(str(path)) as movie:
+        return sorted(round(frame.time, 3) for frame in movie.decode(video=0))
+
+
+def test_held_frames_are_repeated(tmp_path):
+    movie = write_movie(tmp_path / "vfr.mp4", [0, 3, 4, 6])
+    assert has_held_frames(movie, 10)
+    restore_cfr(movie, 10)
+    assert frame_times(movie) == [round(index / 10, 3) for index in range(7)]
+    assert not has_held_frames(movie, 10)
+
+
+def test_uses_encoder_profile_and_threads(tmp_path):
+    movie = write_movie(tmp_path / "vfr.mp4", [0, 5, 6])
+    restore_cfr(movie, 10, EncoderProfile(preset="veryfast", tune="none", crf=26), threads=2)
+    # x264 records its settings in the stream
+    settings = movie.read_bytes()
+    assert b"crf=26.0" in settings
+    assert b"threads=2" in settings
+
+
+def test_constant_rate_movie_is_left_alone(tmp_path):
+    movie = write_movie(tmp_path / "cfr.mp4", range(5))
+    before = movie.read_bytes()
+    restore_cfr(movie, 10)
+    assert movie.read_bytes() == before
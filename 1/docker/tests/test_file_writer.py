@@ -0,0 +1,57 @@
+from fractions import Fraction
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+av = pytest.importorskip("av")
+
+from render_tools.file_writer import ToolFileWriter  # noqa: E402
+
+
+def frame(value):
+    return np.full((16, 16, 4), value, dtype=np.uint8)
+
+
+def vfr_writer(path, rate=10):
+    writer = object.__new__(ToolFileWriter)
+    writer.renderer = SimpleNamespace(vfr=True, held_frames=0)
+    writer.video_container = av.open(str(path), mode="w")
+    writer.video_stream = writer.video_container.add_stream("libx264", rate=rate, options={"bf": "0"})
+    writer.video_stream.width = writer.video_stream.height = 16
+    writer.video_stream.pix_fmt = "yuv420p"
+    writer.video_stream.codec_context.time_base = Fraction(1, rate)
+    writer.held_frame = None
+    writer.next_pts = 0
+    writer.last_pts = -1
+    return writer
+
+
+def frame_times(path):
+    with av.open(str(path)) as movie:
+        return sorted(round(frame.time, 3) for frame in movie.decode(video=0))
+
+
+def test_repeated_frames_are_held(tmp_path):
+    writer = vfr_writer(tmp_path / "vfr.mp4")
+    for value, count in [(0, 1), (0, 2), (200, 1), (200, 1), (100, 1)]:
+        writer.encode_and_write_frame(frame(value), count)
+    writer.end_held_frame()
+    for packet in writer.video_stream.encode():
+        writer.video_container.mux(packet)
+    writer.video_container.close()
+    assert writer.renderer.held_frames == 3
+    assert frame_times(tmp_path / "vfr.mp4") == [0, 0.3, 0.5]
+
+
+def test_last_hold_keeps_its_length(tmp_path):
+    writer = vfr_writer(tmp_path / "vfr.mp4")
+    writer.encode_and_write_frame(frame(0), 1)
+    writer.encode_and_write_frame(frame(0), 4)
+    writer.end_held_frame()
+    for packet in writer.video_stream.encode():
+        writer.video_container.mux(packet)
+    writer.video_container.close()
+    assert frame_times(tmp_path / "vfr.mp4") == [0, 0.4]
+    assert writer.last_pts == 4
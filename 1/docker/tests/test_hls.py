@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+av = pytest.importorskip("av")
+
+from render_tools.hls import HlsSegmenter  # noqa: E402
+
+
+def write_partial(path, seconds, rate=10, keyframe_every=10):
+    with av.open(str(path), mode="w") as container:
+        stream = container.add_stream("libx264", rate=rate, options={"scenecut": "0"})
+        stream.width, stream.height, stream.pix_fmt = 64, 128, "yuv420p"
+        stream.codec_context.gop_size = keyframe_every
+        for index in range(int(seconds * rate)):
+            frame = av.VideoFrame.from_ndarray(np.full((128, 64, 3), 4 * index, np.uint8), format="rgb24")
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    return path
+
+
+def playlist_entries(directory):
+    lines = (directory / "playlist.m3u8").read_text().splitlines()
+    return [(float(line[8:-1]), name) for line, name in zip(lines, lines[1:]) if line.startswith("#EXTINF:")], lines
+
+
+def test_segments_follow_keyframes_and_acts(tmp_path):
+    first = write_partial(tmp_path / "play0.mp4", 3.0)
+    second = write_partial(tmp_path / "play1.mp4", 2.0)
+    hls = HlsSegmenter("Intro", segment_seconds=2.0, directory=tmp_path / "hls")
+    hls.add(first, 0.0, 0, [])
+    hls.add(second, 3.0, 1, [])
+    hls.finish(5.0)
+    entries, lines = playlist_entries(tmp_path / "hls")
+    # A cut at the first keyframe after 2s, and at the start of act 1
+    assert entries == [(2.0, "segment_00000.ts"), (1.0, "segment_00001.ts"), (2.0, "segment_00002.ts")]
+    assert lines[-1] == "#EXT-X-ENDLIST"
+    assert "#EXT-X-TARGETDURATION:2" in lines
+    assert (tmp_path / "hls" / "index.html").exists()
+    frames = 0
+    for path in hls.segment_paths():
+        with av.open(str(path)) as segment:
+            assert len(segment.streams.audio) == 1
+            frames += sum(1 for _ in segment.decode(video=0))
+    assert frames == 50
+
+
+def test_playlist_is_open_until_the_render_finishes(tmp_path):
+    hls = HlsSegmenter("Intro", segment_seconds=1.0, directory=tmp_path / "hls")
+    hls.add(write_partial(tmp_path / "play0.mp4", 2.0), 0.0, 0, [])
+    # Wait for the cut without ending the playlist
+    hls.futures[-1].result()
+    _, lines = playlist_entries(tmp_path / "hls")
+    assert "#EXT-X-ENDLIST" not in lines
+    assert "#EXT-X-PLAYLIST-TYPE:EVENT" in lines
+    hls.finish(2.0)
+
+
+def test_stale_segments_are_removed(tmp_path):
+    directory = tmp_path / "hls"
+    directory.mkdir()
+    (directory / "segment_00007.ts").write_bytes(b"old")
+    (directory / "playlist.m3u8").write_text("#EXTM3U\n")
+    HlsSegmenter("Intro", directory=directory).finish(0.0)
+    assert sorted(path.name for path in directory.iterdir()) == ["index.html"]
@@ -0,0 +1,106 @@
+import os
+
+from render_tools.jobqueue import JobQueue, read_json, write_json
+
+
+def queue_with(tmp_path, *job_ids, **options):
+    queue = JobQueue(tmp_path / "queue", **options)
+    for job_id in job_ids:
+        assert queue.submit(job_id, {"scene": "Story"})
+    return queue
+
+
+def test_submit_ignores_a_queued_job(tmp_path):
+    queue = queue_with(tmp_path, "0000-Story-act00")
+    assert not queue.submit("0000-Story-act00", {"scene": "Story"})
+    assert queue.counts() == {"pending": 1, "running": 0, "done": 0, "failed": 0}
+
+
+def test_claim_takes_jobs_in_order_once(tmp_path):
+    queue = queue_with(tmp_path, "0001-Story-act01", "0000-Story-act00")
+    first = queue.claim("node-a")
+    second = queue.claim("node-b")
+    assert (first["id"], first["worker"]) == ("0000-Story-act00", "node-a")
+    assert (second["id"], second["worker"]) == ("0001-Story-act01", "node-b")
+    assert queue.claim("node-c") is None
+    assert queue.owns(first) and queue.owns(second)
+
+
+def test_complete_needs_the_lease(tmp_path):
+    queue = queue_with(tmp_path, "0000-Story-scene")
+    lease = queue.claim("node-a")
+    assert not queue.complete({**lease, "worker": "node-b"}, {"movie": "x.mp4"})
+    assert queue.complete(lease, {"movie": "x.mp4"})
+    assert queue.ids("done") == ["0000-Story-scene"]
+    assert queue.result("0000-Story-scene") == {"movie": "x.mp4"}
+
+
+def test_release_requeues_until_out_of_attempts(tmp_path):
+    queue = queue_with(tmp_path, "0000-Story-scene", max_attempts=2)
+    lease = queue.claim("node-a")
+    assert queue.fail(lease, "boom")
+    assert read_json(queue.path("pending", "0000-Story-scene")) == {"attempt": 1, "errors": ["boom"]}
+    lease = queue.claim("node-a")
+    assert lease["attempt"] == 1
+    assert queue.fail(lease, "boom again")
+    assert queue.ids("pending") == []
+    assert read_json(queue.path("failed", "0000-Story-scene")) == {"attempt": 2, "errors": ["boom", "boom again"]}
+    # Nothing left half-released
+    assert os.listdir(queue.root / "running") == []
+
+
+def test_reap_requeues_jobs_of_a_stopped_heartbeat(tmp_path):
+    queue = queue_with(tmp_path, "0000-Story-act00", "0001-Story-act01", lease_seconds=0)
+    alive = queue.claim("node-a")
+    dead = queue.claim("node-b")
+    queue.heartbeat("node-a", 1)
+    queue.heartbeat("node-b", 1)
+    # First look: both counters are new
+    assert queue.reap() == []
+    queue.heartbeat("node-a", 2)
+    assert queue.reap() == [dead["id"]]
+    assert queue.ids("pending") == [dead["id"]]
+    assert read_json(queue.path("pending", dead["id"]))["errors"] == ["lease of node-b expired"]
+    assert queue.owns(alive)
+    assert not (queue.root / "heartbeats" / "node-b").exists()
+
+
+def test_reap_requeues_jobs_of_a_worker_without_heartbeat(tmp_path):
+    queue = queue_with(tmp_path, "0000-Story-scene")
+    lease = queue.claim("node-a")
+    assert queue.reap() == [lease["id"]]
+    assert not queue.owns(lease)
+
+
+def test_reserve_skips_taken_orders(tmp_path):
+    queue = queue_with(tmp_path)
+    assert queue.reserve(3) == 0
+    # Another submitter took order 4 meanwhile
+    write_json(queue.root / "orders" / "000004", {})
+    assert queue.reserve(2) == 5
+    assert queue.reserve(1) == 7
+
+
+def test_complete_after_a_reap_drops_the_result(tmp_path):
+    queue = queue_with(tmp_path, "0000-Story-scene")
+    lease = queue.claim("node-a")
+    # node-a has no heartbeat: another node requeues its job
+    assert queue.reap() == [lease["id"]]
+    assert not queue.complete(lease, {"movie": "late.mp4"})
+    assert queue.result(lease["id"]) is None
+    assert queue.ids("pending") == [lease["id"]]
+
+
+def test_a_stale_lease_leaves_the_new_claim_alone(tmp_path):
+    queue = queue_with(tmp_path, "0000-Story-scene")
+    stale = queue.claim("node-a")
+    queue.reap()
+    current = queue.claim("node-b")
+    assert not queue.complete(stale, {"movie": "late.mp4"})
+    assert not queue.fail(stale, "late error")
+    assert queue.owns(current)
+    assert queue.result(current["id"]) is None
+    assert queue.complete(current, {"movie": "x.mp4"})
+    assert queue.ids("done") == [current["id"]]
+    # Nothing parked left behind
+    assert os.listdir(queue.root / "running") == []
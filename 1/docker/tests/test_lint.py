@@ -0,0 +1,193 @@
+import json
+import textwrap
+
+import pytest
+
+from render_tools.lint import SceneSource, collect_plays, lint_source, load_cost_model, static_act_costs
+
+
+def scene_source(tmp_path, construct, helpers=""):
+    path = tmp_path / "scene.py"
+    path.write_text(
+        "from manim import *\n\n\nclass Story(Scene):\n"
+        + textwrap.indent(textwrap.dedent(helpers), "    ")
+        + "    def construct(self):\n"
+        + textwrap.indent(textwrap.dedent(construct), "        "),
+        encoding="utf-8",
+    )
+    return SceneSource(path, "Story")
+
+
+def lint(tmp_path, construct, helpers=""):
+    source = scene_source(tmp_path, construct, helpers)
+    return lint_source(source, collect_plays(source))
+
+
+def rules(findings):
+    return [finding.rule for finding in findings]
+
+
+def test_clean_scene(tmp_path):
+    findings = lint(tmp_path, """\
+        # SCENE 1: Title (0-5s)
+        title = Text("Docker")
+        self.play(Write(title), run_time=2)
+        self.play(FadeOut(title))
+    """)
+    assert findings == []
+
+
+def test_repeated_build_in_a_loop(tmp_path):
+    findings = lint(tmp_path, """\
+        for i in range(5):
+            label = Text("container")
+            self.add(label.shift(i * DOWN))
+        for name in ["web", "db"]:
+            self.add(Text(name))
+    """)
+    finding, = findings
+    assert finding.rule == "repeated-build"
+    assert finding.line == 7
+    assert "on every pass of the loop" in finding.message
+
+
+def test_repeated_build_in_a_helper(tmp_path):
+    findings = lint(tmp_path, """\
+        self.badge(UP)
+        self.badge(DOWN)
+    """, helpers="""\
+        def badge(self, where):
+            self.add(SVGMobject("docker.svg").to_edge(where))
+
+    """)
+    assert rules(findings) == ["repeated-build"]
+    assert "on every call of badge() (2 calls)" in findings[0].message
+
+
+def test_same_constant_built_twice(tmp_path):
+    findings = lint(tmp_path, """\
+        first = Text("docker compose up")
+        self.add(first)
+        second = Text("docker compose up")
+        self.add(second)
+    """)
+    assert rules(findings) == ["repeated-build"]
+    assert "built 2 times (lines 6, 8)" in findings[0].message
+
+
+def test_micro_plays_in_a_row(tmp_path):
+    findings = lint(tmp_path, """\
+        box = Square()
+        self.play(FadeIn(box))
+        for _ in range(3):
+            self.play(box.animate.shift(0.1 * LEFT), run_time=0.08)
+            self.play(box.animate.shift(0.1 * RIGHT), run_time=0.08)
+        self.play(FadeOut(box))
+    """)
+    finding, = findings
+    assert finding.rule == "micro-plays"
+    assert finding.message.startswith("6 plays of 0.08s in a row")
+    assert "Wiggle(box" in finding.suggestion
+
+
+def test_short_plays_broken_up_are_fine(tmp_path):
+    findings = lint(tmp_path, """\
+        box = Square()
+        for _ in range(3):
+            self.play(box.animate.shift(LEFT), run_time=0.1)
+            self.play(box.animate.shift(RIGHT), run_time=1)
+    """)
+    assert findings == []
+
+
+def test_fadeout_each_comprehension(tmp_path):
+    findings = lint(tmp_path, """\
+        boxes = [Square() for _ in range(3)]
+        self.play(*[FadeOut(box, shift=UP) for box in boxes])
+    """)
+    finding, = findings
+    assert finding.rule == "fadeout-each"
+    assert finding.suggestion.startswith("FadeOut(Group(*boxes), shift=UP)")
+
+
+def test_fadeout_each_arguments_and_loops(tmp_path):
+    findings = lint(tmp_path, """\
+        a, b, c, d = Square(), Circle(), Dot(), Star()
+        self.play(FadeOut(a), FadeOut(b), FadeOut(c), FadeOut(d))
+        for mobject in [a, b]:
+            self.play(FadeOut(mobject))
+    """)
+    assert rules(findings) == ["fadeout-each", "fadeout-each"]
+    assert findings[0].message == "4 FadeOut animations in one play"
+    assert findings[1].message.startswith("one play per mobject")
+
+
+def test_invisible_left(tmp_path):
+    findings = lint(tmp_path, """\
+        hint = Text("hint")
+        self.add(hint)
+        self.play(hint.animate.set_opacity(0))
+        gone = Square()
+        self.add(gone)
+        gone.set_fill(opacity=0)
+        self.remove(gone)
+    """)
+    finding, = findings
+    assert finding.rule == "invisible-left"
+    assert finding.line == 8
+    assert finding.message.startswith("hint is faded to opacity 0")
+
+
+def test_findings_carry_their_act(tmp_path):
+    findings = lint(tmp_path, """\
+        # SCENE 1: Setup (0-10s)
+        self.wait()
+        # SCENE 2: Cleanup (10-20s)
+        faded = Dot().set_opacity(0)
+        self.add(faded)
+    """)
+    assert [(finding.rule, finding.act) for finding in findings] == [("invisible-left", 1)]
+
+
+def test_static_costs_per_act(tmp_path):
+    source = scene_source(tmp_path, """\
+        # SCENE 1: Setup (0-10s)
+        self.play(FadeIn(Square()), run_time=2)
+        for _ in range(3):
+            self.wait(0.5)
+        # SCENE 2: Outro
+        self.play(FadeOut(Square()))
+        for item in items:
+            self.wait(1)
+    """)
+    setup, outro = static_act_costs(source, collect_plays(source), (1080, 1920, 60))
+    assert (setup["label"], setup["planned"]) == ("SCENE 1: Setup", [0, 10])
+    assert (setup["plays"], setup["seconds"], setup["frames"], setup["exact"]) == (4, 3.5, 210, True)
+    # A loop of unknown length counts once, and the estimate says it is a guess
+    assert (outro["plays"], outro["seconds"], outro["exact"]) == (2, 2.0, False)
+
+
+def test_cost_model_from_trace_reports(tmp_path):
+    source = scene_source(tmp_path, """\
+        # SCENE 1: Setup
+        self.play(FadeIn(Square()), run_time=1)
+    """)
+    report = {
+        "scene": "Story", "pixel_width": 100, "pixel_height": 100,
+        "acts": [{"index": 0, "label": "SCENE 1", "title": "Setup"}],
+        "plays": [{"act": 0, "status": "rendered", "frames": 10, "raster_seconds": 1.0, "wall_seconds": 1.5,
+                   "construct_seconds": 0.25, "start": 0.0, "end": 1.0, "wall_start": 0.0, "encode_seconds": 0.1}],
+    }
+    profiles = tmp_path / "profile"
+    profiles.mkdir()
+    (profiles / "Story.json").write_text(json.dumps(report), encoding="utf-8")
+    (profiles / "Story.trace.json").write_text("{}", encoding="utf-8")
+    model = load_cost_model("Story", profiles)
+    assert model.reports == 1
+    assert model.pixel_seconds == pytest.approx(1.0 / (10 * 100 * 100))
+    assert model.play_seconds == pytest.approx(0.5)
+    row, = static_act_costs(source, collect_plays(source), (200, 100, 10), model)
+    # Twice the pixels of the profiled render, ten frames
+    assert row["raster_seconds"] == pytest.approx(2.0)
+    assert row["total_seconds"] == pytest.approx(2.0 + 0.5 + 0.25)
+    assert load_cost_model("Story", tmp_path / "empty") is None
@@ -0,0 +1,96 @@
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import Circle, Square, VGroup  # noqa: E402
+
+from render_tools.memory import MemoryGuard, allocation_site, format_report, read_rss  # noqa: E402
+
+# Kept alive by the test, not by the scene
+retained = []
+
+
+def renderer(scene_mobjects=(), current_act=0, last_act=None, time=0.0):
+    scene = SimpleNamespace(get_mobject_family_members=lambda: list(scene_mobjects))
+    return SimpleNamespace(scene=scene, acts=[], current_act=current_act, last_act=last_act, time=time)
+
+
+def test_read_rss():
+    rss, peak = read_rss()
+    assert peak > 0
+    if sys.platform == "linux":
+        assert 0 < rss <= peak
+
+
+def test_allocation_site_skips_libraries():
+    library = sys.modules["json"].__file__
+    traceback = [
+        SimpleNamespace(filename="/work/docker_scene.py", lineno=12),
+        SimpleNamespace(filename="/work/docker_scene.py", lineno=40),
+        SimpleNamespace(filename=library, lineno=300),
+    ]
+    assert allocation_site(traceback) == "/work/docker_scene.py:40"
+    # Only library frames: the most recent one
+    assert allocation_site(traceback[2:]) == f"{library}:300"
+
+
+def test_retained_mobjects_are_reported(tmp_path):
+    # Every live mobject in the table, whatever else this process has built
+    guard = MemoryGuard(allocations=False, top=10_000, directory=tmp_path)
+    on_screen = Circle()
+    retained.append(VGroup(*[Square() for _ in range(40)]))
+    try:
+        render = renderer([on_screen])
+        guard.start(render)
+        render.time = 12.0
+        guard.sample(render, 0)
+    finally:
+        retained.clear()
+    [sample] = guard.samples
+    assert (sample["start"], sample["end"], sample["label"]) == (0.0, 12.0, "act 0")
+    assert sample["scene_mobjects"] == 1
+    assert sample["retained_mobjects"] >= 41
+    largest = {entry["mobject"]: entry for entry in sample["largest"]}
+    assert largest["VGroup"]["family"] == 41 and not largest["VGroup"]["in_scene"]
+    assert largest["Circle"]["in_scene"]
+
+
+def test_allocations_point_at_the_scene_code(tmp_path):
+    guard = MemoryGuard(directory=tmp_path)
+    render = renderer()
+    guard.start(render)
+    try:
+        retained.append(bytearray(8 * 2**20))
+        guard.sample(render, 0)
+    finally:
+        retained.clear()
+        guard.finish(render)
+    [top, *_] = guard.samples[0]["allocations"]
+    assert top["where"].startswith(__file__) and top["size_diff"] >= 8 * 2**20
+
+
+def test_budget_and_report(tmp_path):
+    guard = MemoryGuard(budget=1, allocations=False, directory=tmp_path)
+    render = renderer(current_act=3, last_act=1)
+    guard.start(render)
+    path = guard.finish(render)
+    # A render stopped by --last-act ends in that act
+    assert [sample["act"] for sample in guard.samples] == [1]
+    assert guard.over_budget == guard.samples
+    report = json.loads(path.read_text(encoding="utf-8"))
+    assert report["budget"] == 1
+    text = format_report(report)
+    assert "OVER BUDGET" in text and "act 1 is over the budget of" in text
+
+
+def test_finish_doesnt_sample_an_act_twice(tmp_path):
+    guard = MemoryGuard(allocations=False, directory=tmp_path)
+    render = renderer(current_act=2)
+    guard.start(render)
+    guard.sample(render, 2)
+    guard.finish(render)
+    assert len(guard.samples) == 1
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from render_tools.parallel import check_snapshots  # noqa: E402
+
+
+def manifest(index, entry, exit):
+    return {"act": {"index": index}, "entry": entry, "exit": exit}
+
+
+def snapshot(time, num_plays, mobjects=(("Text", 0), ("Square", 1))):
+    return {"time": time, "num_plays": num_plays, "mobjects": [list(mobject) for mobject in mobjects]}
+
+
+def test_matching_boundaries():
+    check_snapshots([
+        manifest(0, snapshot(0, 0), snapshot(30.0, 12)),
+        # Replayed acts add the time up differently: float noise is fine
+        manifest(1, snapshot(30.0000004, 12), snapshot(75.0, 20)),
+    ])
+
+
+@pytest.mark.parametrize("entry, key", [
+    (snapshot(30.5, 12), "time"),
+    (snapshot(30.0, 11), "num_plays"),
+    (snapshot(30.0, 12, (("Text", 0),)), "mobjects"),
+])
+def test_mismatched_boundary(entry, key):
+    with pytest.raises(RuntimeError, match=f"disagree on '{key}'"):
+        check_snapshots([manifest(0, snapshot(0, 0), snapshot(30.0, 12)), manifest(1, entry, snapshot(75.0, 20))])
+
+
+def test_act_without_plays():
+    with pytest.raises(RuntimeError, match="Act 1 played no animations"):
+        check_snapshots([manifest(0, snapshot(0, 0), snapshot(30.0, 12)), manifest(1, None, None)])
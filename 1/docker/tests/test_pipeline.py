@@ -0,0 +1,41 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from render_tools.pipeline import FramePool  # noqa: E402
+
+
+def test_buffers_are_reused():
+    pool = FramePool(2, (4, 3, 4), np.uint8)
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+    pool.release(first)
+    assert pool.acquire() is first
+    # Buffers in flight when each frame was requested: 0, 1, 1
+    assert (pool.frames, pool.max_depth) == (3, 1)
+
+
+def test_foreign_arrays_are_not_pooled():
+    pool = FramePool(1, (4, 3, 4), np.uint8)
+    buffer = pool.acquire()
+    pool.release(np.zeros((4, 3, 4), np.uint8))
+    pool.release(buffer)
+    assert pool.acquire() is buffer
+    assert pool.free.empty()
+
+
+def test_renderer_waits_for_the_writer():
+    pool = FramePool(1, (4, 3, 4), np.uint8)
+    buffer = pool.acquire()
+    writer = threading.Timer(0.05, pool.release, [buffer])
+    writer.start()
+    started = time.perf_counter()
+    assert pool.acquire() is buffer
+    writer.join()
+    assert time.perf_counter() - started >= 0.04
+    assert pool.stalls == 1 and pool.stall_seconds > 0
+    assert "stalled 1x" in pool.summary()
@@ -0,0 +1,86 @@
+import json
+import time
+
+import pytest
+
+from render_tools.profiler import (
+    RenderProfiler, act_rows, format_acts, format_play, format_table, load_report,
+)
+
+
+def play(index, act, start, end, wall, frames=10, raster=0.5, construct=0.1, status="rendered", cues=0):
+    return {
+        "index": index, "act": act, "animations": f"Play{index}", "start": start, "end": end, "status": status,
+        "frames": frames, "cues": cues, "construct_seconds": construct, "hash_seconds": 0.01,
+        "raster_seconds": raster, "encode_seconds": 0.2, "wall_start": 10.0 * index + construct,
+        "wall_seconds": wall,
+    }
+
+
+@pytest.fixture
+def report():
+    return {
+        "scene": "Story",
+        "acts": [{"index": 0, "label": "SCENE 1", "title": "Setup"}, {"index": 1, "label": "ENDING", "title": ""}],
+        "plays": [
+            play(0, 0, 0.0, 1.0, wall=1.0),
+            play(1, 0, 1.0, 3.0, wall=3.0, frames=0, raster=0.0, status="cached"),
+            play(2, 1, 3.0, 4.0, wall=2.0, cues=2),
+        ],
+        "combine_seconds": 0.5,
+        "wall_seconds": 7.0,
+    }
+
+
+def test_act_rows_sum_per_act(report):
+    first, last = act_rows(report)
+    assert (first["label"], first["plays"], first["frames"]) == ("SCENE 1: Setup", 2, 10)
+    assert (first["start"], first["end"]) == (0.0, 3.0)
+    # Construct time counts towards the act's wall time, and the act starts when its first construct does
+    assert first["wall_seconds"] == pytest.approx(1.0 + 3.0 + 0.2)
+    assert first["wall_start"] == pytest.approx(0.0)
+    assert (last["label"], last["plays"], last["raster_seconds"]) == ("ENDING", 1, 0.5)
+
+
+def test_format_table_sorts_and_limits(report):
+    lines = format_table(report, sort="wall").splitlines()
+    assert [line.split()[0] for line in lines[1:]] == ["1", "2", "0"]
+    lines = format_table(report, sort="start", top=2).splitlines()
+    assert [line.split()[0] for line in lines[1:]] == ["0", "1"]
+    # A play without frames has no time per frame
+    assert format_table(report, sort="frame").splitlines()[-1].split()[0] == "1"
+
+
+def test_format_acts_shares(report):
+    text = format_acts(report)
+    assert "SCENE 1: Setup" in text
+    assert "ENDING" in text
+    assert text.splitlines()[-1] == "Combine and mix: 0.50s; render wall time 7.0s"
+    shares = [float(line.split()[-1].rstrip("%")) for line in text.splitlines()[1:-1]]
+    assert sum(shares) == pytest.approx(100.0, abs=0.2)
+
+
+def test_format_play():
+    line = format_play(play(2, 1, 3.0, 4.0, wall=2.0, cues=2))
+    assert line.startswith("Play 2 (act 1, rendered) Play2 3.00-4.00s: 10 frames, 50.0 ms/frame")
+    assert line.endswith("construct 100 ms, 2 cues")
+    assert "no frames" in format_play(play(1, 0, 1.0, 3.0, wall=3.0, frames=0))
+
+
+def test_load_report(tmp_path, report):
+    path = tmp_path / "Story.json"
+    path.write_text(json.dumps(report), encoding="utf-8")
+    assert load_report(path) == report
+
+
+def test_overhead_is_not_construct_time(tmp_path):
+    profiler = RenderProfiler(directory=tmp_path)
+    profiler.last_end = time.perf_counter()
+    profiler.overhead_seconds = 0.0
+    with profiler.overhead("memory sample"):
+        time.sleep(0.05)
+    profiler.begin_play()
+    assert profiler.construct_seconds < 0.04
+    assert [span[1] for span in profiler.spans] == ["memory sample", "construct"]
+    # Counted once
+    assert profiler.overhead_seconds == 0.0
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import config  # noqa: E402
+
+from render_tools.profiles import (  # noqa: E402
+    PROFILES, apply_profile, current_profile, get_profile, output_frame_rate,
+)
+
+
+def test_pixel_size_keeps_the_frame_shape():
+    draft = PROFILES["draft-540p30"]
+    assert draft.pixel_size(9, 16) == (540, 960)
+    assert PROFILES["review-720p60"].pixel_size(9, 16) == (720, 1280)
+    assert draft.pixel_size(16, 9) == (960, 540)
+    # The long side stays even for the yuv420p encoder
+    assert draft.pixel_size(9, 14.2) == (540, 852)
+
+
+def test_ticks_per_frame():
+    assert PROFILES["draft-540p30"].ticks_per_frame(60) == 2
+    assert PROFILES["review-720p60"].ticks_per_frame(60) == 1
+    with pytest.raises(ValueError, match="divides"):
+        PROFILES["draft-540p30"].ticks_per_frame(25)
+    with pytest.raises(ValueError, match="divides"):
+        PROFILES["review-720p60"].ticks_per_frame(30)
+
+
+def test_profile_names(monkeypatch):
+    with pytest.raises(ValueError, match="draft-540p30"):
+        get_profile("draft")
+    monkeypatch.delenv("RENDER_PROFILE", raising=False)
+    assert current_profile() is None
+    monkeypatch.setenv("RENDER_PROFILE", "review-720p60")
+    assert current_profile() is PROFILES["review-720p60"]
+    assert not current_profile().shortcuts and PROFILES["draft-540p30"].shortcuts
+
+
+def test_apply_profile(monkeypatch):
+    for key, value in {"pixel_width": 1080, "pixel_height": 1920, "frame_width": 9.0, "frame_height": 16.0}.items():
+        monkeypatch.setattr(config, key, value, raising=False)
+    apply_profile(None)
+    assert (config.pixel_width, config.pixel_height) == (1080, 1920)
+    apply_profile(PROFILES["draft-540p30"])
+    assert (config.pixel_width, config.pixel_height) == (540, 960)
+
+
+def test_output_frame_rate_is_restored(monkeypatch):
+    monkeypatch.setattr(config, "frame_rate", 60)
+    with pytest.raises(RuntimeError):
+        with output_frame_rate(30):
+            assert config.frame_rate == 30
+            raise RuntimeError
+    assert config.frame_rate == 60
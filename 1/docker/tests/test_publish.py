@@ -0,0 +1,98 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from render_tools.publish import integrated_loudness, is_partial_movie_path, normalization_gain
+
+RATE = 48000
+
+
+def sine(amplitude, seconds=3.0, channels=1, frequency=1000):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return np.tile(amplitude * np.sin(2 * np.pi * frequency * t), (channels, 1))
+
+
+def test_loudness_of_a_1khz_sine():
+    # BS.1770: a full scale 1kHz sine in one channel reads -3.01 LUFS
+    assert integrated_loudness(sine(1.0), RATE) == pytest.approx(-3.01, abs=0.05)
+    assert integrated_loudness(sine(0.1), RATE) == pytest.approx(-23.01, abs=0.05)
+    # Two channels carry twice the energy
+    assert integrated_loudness(sine(0.1, channels=2), RATE) == pytest.approx(-20.0, abs=0.05)
+
+
+def test_silence_has_no_loudness():
+    assert integrated_loudness(np.zeros((2, RATE)), RATE) is None
+    # Shorter than one 400ms block
+    assert integrated_loudness(sine(0.5, seconds=0.2), RATE) is None
+    assert normalization_gain(np.zeros((1, RATE)), RATE) == (None, 0.0)
+
+
+def test_gain_reaches_the_target_under_the_peak_ceiling():
+    loudness, gain = normalization_gain(sine(0.1), RATE, target_lufs=-14.0, peak_ceiling=-1.0)
+    assert loudness + gain == pytest.approx(-14.0)
+    # A quiet sine with one loud click: the click limits the gain
+    clicked = sine(0.01)
+    clicked[0, 1000] = 0.5
+    _, gain = normalization_gain(clicked, RATE, target_lufs=-14.0, peak_ceiling=-1.0)
+    assert 20 * np.log10(0.5) + gain == pytest.approx(-1.0)
+
+
+def test_partial_movie_paths():
+    assert is_partial_movie_path("media/videos/s/1920p60/partial_movie_files/Intro/a.mp4")
+    assert is_partial_movie_path("media/videos/s/1920p60/partial_movie_files.vfr/Intro/a.mp4")
+    assert not is_partial_movie_path("media/videos/s/1920p60/Intro.mp4")
+
+
+def write_movie(path, seconds=3.0, amplitude=0.05):
+    av = pytest.importorskip("av")
+    with av.open(str(path), mode="w") as container:
+        video = container.add_stream("libx264", rate=10)
+        video.width, video.height, video.pix_fmt = 64, 128, "yuv420p"
+        audio = container.add_stream("aac", rate=RATE)
+        audio.layout = "stereo"
+        for index in range(int(seconds * 10)):
+            frame = av.VideoFrame.from_ndarray(np.full((128, 64, 3), 8 * index, np.uint8), format="rgb24")
+            for packet in video.encode(frame):
+                container.mux(packet)
+        samples = sine(amplitude, seconds, channels=2).astype(np.float32)
+        for start in range(0, samples.shape[1], 1024):
+            frame = av.AudioFrame.from_ndarray(np.ascontiguousarray(samples[:, start:start + 1024]),
+                                               format="fltp", layout="stereo")
+            frame.sample_rate = RATE
+            frame.pts = start
+            frame.time_base = Fraction(1, RATE)
+            for packet in audio.encode(frame):
+                container.mux(packet)
+        for stream in (video, audio):
+            for packet in stream.encode():
+                container.mux(packet)
+    return path
+
+
+def decoded_audio(path):
+    import av
+
+    with av.open(str(path)) as container:
+        chunks = [frame.to_ndarray() for frame in container.decode(audio=0)]
+    return np.concatenate(chunks, axis=1)
+
+
+def test_published_movie_is_normalized_and_fast_start(tmp_path):
+    pytest.importorskip("manim")
+    from render_tools.publish import Publisher
+
+    source = write_movie(tmp_path / "Intro.mp4")
+    publisher = Publisher(tmp_path / "video", keep_source=True)
+    publisher.submit(source)
+    [entry] = publisher.close()
+    assert entry["loudness_lufs"] == pytest.approx(-26.0, abs=0.1)
+    published = tmp_path / "video" / "Intro.mp4"
+    data = published.read_bytes()
+    assert data.index(b"moov") < data.index(b"mdat")
+    # Measured on the whole decoded track; the AAC round trip moves it a little
+    assert integrated_loudness(decoded_audio(published), RATE) == pytest.approx(-14.0, abs=0.5)
+    assert (tmp_path / "video" / "Intro.jpg").exists()
+    assert (tmp_path / "video" / "Intro.preview.mp4").exists()
+    # Unchanged source: nothing to do the second time
+    assert Publisher(tmp_path / "video", keep_source=True).submit(source) is None
@@ -0,0 +1,106 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from render_tools.remote import (
+    CacheRequestHandler, DirectoryCache, HttpCache, RemoteCacheClient, check_key, open_remote_cache,
+)
+
+KEY = "videos/scene/1920p60/partial_movie_files/Intro/abc.mp4"
+
+
+def serve(handler, root=None):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.root = root
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    server = serve(CacheRequestHandler, tmp_path / "remote")
+    yield HttpCache(f"http://127.0.0.1:{server.server_address[1]}", timeout=5)
+    server.shutdown()
+    server.server_close()
+
+
+def test_check_key():
+    assert check_key("videos/a.mp4") == "videos/a.mp4"
+    for key in ("../a.mp4", "/etc/passwd", "videos/../../a", ""):
+        with pytest.raises(ValueError):
+            check_key(key)
+
+
+def test_open_remote_cache():
+    assert isinstance(open_remote_cache("http://cache.local:8765"), HttpCache)
+    assert isinstance(open_remote_cache("/mnt/render-cache"), DirectoryCache)
+
+
+@pytest.mark.parametrize("backend", ["directory", "http"])
+def test_upload_then_fetch(tmp_path, request, backend):
+    cache = DirectoryCache(tmp_path / "remote") if backend == "directory" else request.getfixturevalue("http_cache")
+    source = tmp_path / "abc.mp4"
+    source.write_bytes(b"partial movie" * 1000)
+    assert cache.upload(KEY, source)
+    # Already there
+    assert not cache.upload(KEY, source)
+    fetched = tmp_path / "fetched.mp4"
+    assert cache.fetch(KEY, fetched)
+    assert fetched.read_bytes() == source.read_bytes()
+    assert not cache.fetch("videos/missing.mp4", tmp_path / "missing.mp4")
+    assert not (tmp_path / "missing.mp4").exists()
+
+
+class TruncatingHandler(BaseHTTPRequestHandler):
+    """Promises 1000 bytes and hangs up after 10."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        self.wfile.write(b"x" * 10)
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_truncated_download_leaves_no_file(tmp_path):
+    server = serve(TruncatingHandler)
+    try:
+        client = RemoteCacheClient(HttpCache(f"http://127.0.0.1:{server.server_address[1]}", timeout=5), tmp_path)
+        target = tmp_path / "videos" / "abc.mp4"
+        target.parent.mkdir()
+        assert not client.fetch(target)
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert client.failures == 1 and client.fetched == 0
+    assert list(target.parent.iterdir()) == []
+
+
+def test_client_keys_by_media_path_and_uploads_in_the_background(tmp_path):
+    media = tmp_path / "media"
+    partial = media / KEY
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes(b"frames")
+    remote = DirectoryCache(tmp_path / "remote")
+    client = RemoteCacheClient(remote, media)
+    client.upload(partial)
+    client.close()
+    assert (tmp_path / "remote" / KEY).read_bytes() == b"frames"
+    assert client.uploaded == 1
+    partial.unlink()
+    assert client.fetch(partial) and partial.read_bytes() == b"frames"
+    assert "1 partial files fetched" in client.summary()
+
+
+def test_client_without_upload(tmp_path):
+    client = RemoteCacheClient(DirectoryCache(tmp_path / "remote"), tmp_path, upload=False)
+    (tmp_path / "a.mp4").write_bytes(b"frames")
+    client.upload(tmp_path / "a.mp4")
+    client.close()
+    assert not (tmp_path / "remote").exists()
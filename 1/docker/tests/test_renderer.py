@@ -0,0 +1,148 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from render_tools import file_writer  # noqa: E402
+from render_tools.encode import SoundCue  # noqa: E402
+from render_tools.file_writer import ToolFileWriter  # noqa: E402
+from render_tools.pipeline import FramePool  # noqa: E402
+from render_tools.renderer import ToolRenderer  # noqa: E402
+
+
+def bare_renderer(first_act=None, last_act=None, from_time=None, frame_rate=60):
+    """A ToolRenderer with just the window state, no camera or file writer behind it."""
+    renderer = object.__new__(ToolRenderer)
+    renderer.first_act = first_act
+    renderer.last_act = last_act
+    renderer.from_time = from_time
+    renderer.current_act = 0
+    renderer.time = 0.0
+    renderer.window_start = None
+    renderer.store = None
+    renderer.camera = SimpleNamespace(frame_rate=frame_rate)
+    return renderer
+
+
+def scene(duration, frozen=False):
+    return SimpleNamespace(duration=duration, is_current_animation_frozen_frame=lambda: frozen)
+
+
+def test_acts_before_the_first_act_are_skipped():
+    renderer = bare_renderer(first_act=2)
+    renderer.current_act = 1
+    assert renderer.before_window()
+    renderer.current_act = 2
+    assert not renderer.before_window()
+
+
+def test_plays_before_from_time_are_skipped():
+    renderer = bare_renderer(from_time=12.5)
+    renderer.time = 12.0
+    assert renderer.before_window()
+    renderer.time = 12.5
+    assert not renderer.before_window()
+
+
+def test_skipped_plays_advance_by_whole_frames():
+    renderer = bare_renderer(frame_rate=60)
+    assert renderer.frame_count(scene(1.0)) == 60
+    # A play that doesn't end on a frame still writes its started frame
+    assert renderer.frame_count(scene(0.51)) == 31
+    assert renderer.frame_count(scene(0.5, frozen=True)) == 30
+
+
+def test_cues_are_mixed_relative_to_the_window(monkeypatch):
+    renderer = bare_renderer(first_act=1, last_act=2)
+    renderer.window_start = {"time": 30.0}
+    writer = object.__new__(ToolFileWriter)
+    writer.renderer = renderer
+    writer.sound_cues = [
+        SoundCue("intro.wav", 1.0, act=0),
+        SoundCue("whoosh.wav", 31.5, gain=-3, act=1),
+        SoundCue("ding.wav", 44.0, act=2),
+        SoundCue("outro.wav", 60.0, act=3),
+    ]
+    mixed = []
+    monkeypatch.setattr(file_writer, "load_sound", lambda path, store: SimpleNamespace(
+        path=path, apply_gain=lambda gain: SimpleNamespace(path=f"{path}{gain:+}")
+    ))
+    writer.add_audio_segment = lambda segment, time: mixed.append((segment.path, time))
+    writer.mix_recorded_sounds()
+    assert mixed == [("whoosh.wav-3", 1.5), ("ding.wav", 14.0)]
+
+
+def test_cues_before_from_time_are_dropped():
+    renderer = bare_renderer(from_time=10.0)
+    renderer.window_start = {"time": 10.2}
+    assert not renderer.cue_in_window(SoundCue("early.wav", 9.0))
+    assert renderer.cue_in_window(SoundCue("late.wav", 10.2))
+
+
+def test_resumed_play_takes_the_checkpointed_hash():
+    renderer = bare_renderer()
+    renderer.time = 4.0
+    renderer.num_plays = 3
+    renderer.animations_hashes = [None, None, "replayed"]
+    renderer.resumed_entry = {"time": 4.0, "hash": "checkpointed"}
+    renderer.check_resumed_play()
+    assert renderer.animations_hashes[-1] == "checkpointed"
+    renderer.resumed_entry = {"time": 4.5, "hash": "checkpointed"}
+    with pytest.raises(RuntimeError, match="without --resume"):
+        renderer.check_resumed_play()
+
+
+def test_pooled_frames_are_drawn_into_pool_buffers():
+    renderer = bare_renderer()
+    own_pixels = np.zeros((2, 2, 4), np.uint8)
+    renderer.camera.pixel_array = own_pixels
+    renderer.frame_pool = FramePool(2, (2, 2, 4), np.uint8)
+    written = []
+
+    def update_frame(scene, moving_mobjects=None):
+        renderer.camera.pixel_array[:] = 255
+
+    renderer.update_frame = update_frame
+    renderer.add_frame = written.append
+    renderer.add_pooled_frame(scene=None, moving_mobjects=None)
+    [frame] = written
+    assert id(frame) in renderer.frame_pool.buffer_ids
+    assert frame.min() == 255
+    # The camera draws into its own pixels again; the writer thread owns the buffer now
+    assert renderer.camera.pixel_array is own_pixels and own_pixels.max() == 0
+
+
+@pytest.mark.parametrize("frame_fill, filled", [("blend", [85, 170]), ("repeat", [0, 0])])
+def test_stepped_frames_are_filled_in(frame_fill, filled):
+    renderer = bare_renderer()
+    renderer.frame_step = 3
+    renderer.frame_fill = frame_fill
+    renderer.step_index, renderer.step_last, renderer.step_key, renderer.step_pending = 0, 3, None, 0
+    renderer.filled_frames = 0
+    values = iter([0, 255])
+    renderer.rasterize = lambda scene, moving_mobjects: None
+    renderer.get_frame = lambda: np.full((1, 1, 4), next(values), np.uint8)
+    written = []
+    renderer.add_frame = lambda frame, num_frames=1: written.extend([int(frame[0, 0, 0])] * num_frames)
+    for _ in range(4):
+        renderer.add_stepped_frame(scene=None, moving_mobjects=None)
+    assert written == [0, *filled, 255]
+    assert renderer.filled_frames == 2
+
+
+def test_lower_rate_profile_writes_every_other_tick():
+    renderer = bare_renderer(frame_rate=60)
+    renderer.ticks_per_frame = 2
+    renderer.skip_animations = False
+    renderer.frame_pool = None
+    written = []
+    renderer.file_writer = SimpleNamespace(write_frame=lambda frame, num_frames: written.append((frame, num_frames)))
+    for tick in range(3):
+        renderer.add_frame(f"frame{tick}")
+    # A frozen frame over ticks 3 to 7: written at 4 and 6
+    renderer.add_frame("frozen", num_frames=5)
+    assert written == [("frame0", 1), ("frame2", 1), ("frozen", 2)]
+    # The clock moved exactly as at the full rate
+    assert renderer.tick() == 8
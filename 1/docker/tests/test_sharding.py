@@ -0,0 +1,71 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import config  # noqa: E402
+
+from render_tools.sharding import FrameSharder, ShardRenderer  # noqa: E402
+
+
+class InlinePool:
+    """Runs each shard in this process, with a fresh ShardRenderer stepping through the whole play."""
+
+    def __init__(self, num_frames):
+        self.num_frames = num_frames
+        self.shards = []
+
+    def submit(self, function, scene_file, scene_name, play_index, start, stop, frames_path):
+        self.shards.append((start, stop))
+        renderer = object.__new__(ShardRenderer)
+        renderer.skip_animations = False
+        renderer.start, renderer.stop = start, stop
+        renderer.frames = np.load(frames_path, mmap_mode="r+")
+        renderer.frame_index = 0
+        renderer.camera = SimpleNamespace(pixel_array=None)
+
+        def update_frame(scene, moving_mobjects=None):
+            renderer.camera.pixel_array = np.full((2, 3, 4), renderer.frame_index, dtype=np.uint8)
+
+        renderer.update_frame = update_frame
+        for index in range(self.num_frames):
+            renderer.render(scene=None, time=index)
+        renderer.scene_finished(scene=None)
+        future = Future()
+        future.set_result(stop - start)
+        return future
+
+    def shutdown(self):
+        pass
+
+
+def main_renderer(tmp_path, num_frames):
+    return SimpleNamespace(
+        frame_count=lambda scene: num_frames,
+        camera=SimpleNamespace(pixel_array=np.zeros((2, 3, 4), dtype=np.uint8)),
+        file_writer=SimpleNamespace(partial_movie_directory=tmp_path),
+        num_plays=4,
+    )
+
+
+@pytest.mark.parametrize("processes, num_frames", [(3, 10), (4, 3)])
+def test_shards_cover_every_frame_once(tmp_path, monkeypatch, processes, num_frames):
+    monkeypatch.setattr(config, "input_file", str(tmp_path / "scene.py"), raising=False)
+    sharder = FrameSharder(processes)
+    sharder.pool = InlinePool(num_frames)
+    frames = np.load(sharder.render_play(main_renderer(tmp_path, num_frames), scene=None))
+    starts, stops = zip(*sharder.pool.shards)
+    assert starts[0] == 0 and stops[-1] == num_frames
+    assert list(starts[1:]) == list(stops[:-1])
+    assert all(stop > start for start, stop in sharder.pool.shards)
+    assert [frame[0, 0, 0] for frame in frames] == list(range(num_frames))
+
+
+def test_short_plays_stay_serial():
+    sharder = FrameSharder(4, min_seconds=2.0)
+    assert sharder.wants(SimpleNamespace(duration=2.0))
+    assert not sharder.wants(SimpleNamespace(duration=1.5))
+    assert not FrameSharder(1).wants(SimpleNamespace(duration=10.0))
@@ -0,0 +1,116 @@
+import os
+
+import pytest
+
+from render_tools.store import MediaStore, cache_kind, parse_size
+
+PARTIALS = "videos/scene/1080p60/partial_movie_files/Story"
+
+
+def cache_file(media_dir, name, content, folder=PARTIALS):
+    path = media_dir / folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def set_last_used(store, **last_used):
+    with store.locked_index() as index:
+        for key, digest in index["entries"].items():
+            name = key.rsplit("/", 1)[-1]
+            if name in last_used:
+                index["objects"][digest]["last_used"] = last_used[name]
+
+
+def test_cache_kind_includes_variant_folders():
+    assert cache_kind(f"{PARTIALS}/a.mp4") == "partial"
+    assert cache_kind("videos/scene/1080p60/partial_movie_files.x264-fast/Story/a.mp4") == "partial"
+    assert cache_kind("videos/scene/1080p60/Story.mp4") is None
+    assert cache_kind("texts/abc.svg") == "text"
+
+
+def test_parse_size():
+    assert parse_size("512M") == 512 << 20
+    assert parse_size("1.5GiB") == 3 << 29
+    assert parse_size("1000") == 1000
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_commit_links_identical_files_to_one_object(tmp_path):
+    store = MediaStore(tmp_path)
+    first = cache_file(tmp_path, "a.mp4", b"same")
+    second = cache_file(tmp_path, "b.mp4", b"same", folder=PARTIALS.replace("files", "files.x264-fast"))
+    store.ingest(first)
+    store.ingest(second)
+    store.commit("Story")
+    index = store.load()
+    assert len(index["objects"]) == 1
+    assert len(index["entries"]) == 2
+    assert os.path.samefile(first, second)
+    assert index["scenes"]["Story"] == [sorted(index["entries"])]
+
+
+def test_commit_counts_hits_on_files_the_index_did_not_have(tmp_path):
+    # Cached by a render without the store, then hit by one with it
+    path = cache_file(tmp_path, "a.mp4", b"cached")
+    store = MediaStore(tmp_path)
+    store.record(path, hit=True)
+    store.record(cache_file(tmp_path, "b.mp4", b"new"), hit=False)
+    store.commit("Story")
+    index = store.load()
+    key = store.key(path)
+    assert index["objects"][index["entries"][key]]["uses"] == 1
+    assert index["scenes"]["Story"] == [[key]]
+    assert index["stats"]["partial"] == {"hits": 1, "misses": 1}
+
+
+def test_commit_forgets_deleted_cache_files(tmp_path):
+    store = MediaStore(tmp_path)
+    path = cache_file(tmp_path, "a.mp4", b"gone soon")
+    store.ingest(path)
+    store.commit("Story")
+    path.unlink()
+    store.commit()
+    assert store.load()["entries"] == {}
+
+
+def test_evicts_least_recently_used_first(tmp_path):
+    store = MediaStore(tmp_path, keep_renders=1)
+    for name in ("old.mp4", "older.mp4", "recent.mp4"):
+        store.ingest(cache_file(tmp_path, name, name.encode() * 100))
+    store.commit("Story")
+    set_last_used(store, **{"older.mp4": 1.0, "old.mp4": 2.0, "recent.mp4": 3.0})
+    # The last render of Story used none of them, so none is protected
+    store.commit("Story")
+    size = len(b"recent.mp4" * 100)
+    report = store.gc(budget=size)
+    assert report["evicted"] == 2
+    assert [path.name for path in (tmp_path / PARTIALS).iterdir()] == ["recent.mp4"]
+    assert len(store.load()["objects"]) == 1
+
+
+def test_eviction_keeps_the_last_renders(tmp_path):
+    store = MediaStore(tmp_path, keep_renders=1)
+    old = cache_file(tmp_path, "old.mp4", b"o" * 100)
+    store.ingest(old)
+    store.commit("Story")
+    store.ingest(cache_file(tmp_path, "new.mp4", b"n" * 100))
+    store.commit("Story")
+    set_last_used(store, **{"new.mp4": 1.0, "old.mp4": 2.0})
+    report = store.gc(budget=0)
+    # Over budget, but new.mp4 was used by the last render
+    assert report["evicted"] == 1
+    assert report["over_budget"] == 100
+    assert not old.exists()
+    assert (tmp_path / PARTIALS / "new.mp4").exists()
+
+
+def test_gc_dry_run_deletes_nothing(tmp_path):
+    store = MediaStore(tmp_path, keep_renders=0)
+    path = cache_file(tmp_path, "a.mp4", b"a" * 100)
+    store.ingest(path)
+    store.commit()
+    assert store.gc(budget=0, dry_run=True)["evicted"] == 1
+    assert path.exists()
+    assert len(store.load()["objects"]) == 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+pytest.importorskip("cairo")
+
+from manim import DOWN, LEFT, UP, Circle, Line, Square, Triangle  # noqa: E402
+
+from render_tools.tiles import TiledCamera, pixel_bounds, split_rows  # noqa: E402
+
+
+def test_split_rows_covers_every_row_once():
+    assert split_rows(1920, 4) == [(0, 480), (480, 960), (960, 1440), (1440, 1920)]
+    bands = split_rows(7, 3)
+    assert bands[0][0] == 0 and bands[-1][1] == 7
+    assert all(previous[1] == band[0] for previous, band in zip(bands, bands[1:]))
+    # More tiles than rows: no empty bands
+    assert split_rows(2, 4) == [(0, 1), (1, 2)]
+
+
+def mobjects():
+    return [
+        Circle(radius=1.5, color="#58C4DD", fill_opacity=0.6).shift(UP * 3),
+        Square(side_length=2.5, stroke_width=12).rotate(0.3),
+        # Crosses every band
+        Line(UP * 6 + LEFT, DOWN * 6, stroke_width=8),
+        Triangle(fill_opacity=1).shift(DOWN * 4),
+    ]
+
+
+def capture(camera, tiles):
+    camera.set_tiles(tiles)
+    camera.reset()
+    camera.capture_mobjects(mobjects())
+    return camera.pixel_array.copy()
+
+
+def test_tiled_frame_matches_the_serial_camera():
+    camera = TiledCamera(pixel_width=270, pixel_height=480)
+    try:
+        serial = capture(camera, 1)
+        assert serial.any()
+        for tiles in (2, 3, 4):
+            assert np.array_equal(capture(camera, tiles), serial)
+    finally:
+        camera.close()
+
+
+def test_pixel_bounds_hold_everything_drawn():
+    camera = TiledCamera(pixel_width=270, pixel_height=480)
+    camera.reset()
+    background = camera.pixel_array.copy()
+    for mobject in mobjects():
+        camera.reset()
+        camera.capture_mobjects([mobject])
+        rows, columns = np.nonzero(np.any(camera.pixel_array != background, axis=-1))
+        left, top, right, bottom = pixel_bounds(camera, mobject)
+        assert left <= columns.min() and columns.max() < right
+        assert top <= rows.min() and rows.max() < bottom
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from render_tools.timeline import GUIDELINE_BUDGET, Budget, check_timeline, format_timeline, write_timeline
+
+
+def act(index, start, end, planned=(None, None)):
+    return {"index": index, "label": f"SCENE {index + 1}", "title": "", "start": start, "end": end,
+            "planned_start": planned[0], "planned_end": planned[1], "plays": 0, "waits": 0, "cues": 0}
+
+
+def timeline(duration, *acts):
+    return {"scene": "Story", "duration": duration, "acts": list(acts), "events": [], "cues": []}
+
+
+def test_budget_parse():
+    budget = Budget.parse("120", "0-30, 30-75,75-110,110-120")
+    assert budget == GUIDELINE_BUDGET
+    assert Budget.parse(90).acts == []
+    assert Budget.parse("60", "0-12.5,12.5-60").acts == [(0.0, 12.5), (12.5, 60.0)]
+
+
+def test_budget_parse_rejects_bad_spans():
+    with pytest.raises(ValueError):
+        Budget.parse(120, "0-30,thirty-75")
+
+
+def test_on_budget_timeline_passes():
+    scene = timeline(120.4, act(0, 0, 30.2), act(1, 30.2, 75), act(2, 75, 109.6), act(3, 109.6, 120.4))
+    assert check_timeline(scene, GUIDELINE_BUDGET, tolerance=1.0) == []
+
+
+def test_total_length_against_the_budget():
+    issues = check_timeline(timeline(95.0), Budget(120.0, []), tolerance=1.0)
+    assert issues == ["The scene is 95.00s, 25.00s too short for the 120s budget"]
+
+
+def test_act_spans_against_the_budget():
+    scene = timeline(60.0, act(0, 0, 40), act(1, 40, 60))
+    issues = check_timeline(scene, Budget.parse(60, "0-30,30-60"), tolerance=1.0)
+    assert issues == [
+        "SCENE 1 ends at 40.00s (+10.00s) against the budget's 0-30s",
+        "SCENE 2 starts at 40.00s (+10.00s) against the budget's 30-60s",
+    ]
+
+
+def test_act_spans_are_skipped_when_the_act_count_differs():
+    scene = timeline(120.0, act(0, 0, 100), act(1, 100, 120))
+    assert check_timeline(scene, GUIDELINE_BUDGET, tolerance=1.0) == []
+
+
+def test_planned_times_from_the_banners():
+    scene = timeline(28.0, act(0, 0, 18), act(1, 18, 28, planned=(18, 25)))
+    issues = check_timeline(scene, budget=None, tolerance=0.5)
+    assert issues == ["SCENE 2 ends at 28.00s (+3.00s) against its planned 18-25s"]
+
+
+def test_a_plan_equal_to_the_budget_span_is_reported_once():
+    scene = timeline(60.0, act(0, 0, 35, planned=(0, 30)), act(1, 35, 60, planned=(30, 60)))
+    issues = check_timeline(scene, Budget.parse(60, "0-30,30-60"), tolerance=1.0)
+    assert len(issues) == 2
+    assert all("the budget's" in issue for issue in issues)
+
+
+def test_acts_without_plays_are_ignored():
+    scene = timeline(30.0, act(0, 0, 30, planned=(0, 30)), act(1, None, None, planned=(30, 60)))
+    assert check_timeline(scene, budget=None) == []
+
+
+def test_write_and_format(tmp_path):
+    scene = timeline(30.0, act(0, 0, 30, planned=(0, 30)), act(1, None, None))
+    scene["events"] = [{"index": 0, "kind": "wait", "act": 0, "start": 0.0, "end": 30.0, "duration": 30.0,
+                        "animations": "Wait", "line": 12}]
+    scene["cues"] = [{"time": 0.0, "path": "sounds/whoosh.wav", "gain": -6.0, "act": 0}]
+    path = write_timeline(scene, tmp_path)
+    assert json.loads(path.read_text(encoding="utf-8")) == scene
+    text = format_timeline(scene, Budget.parse(30, "0-30"), events=True)
+    assert "no plays" in text
+    assert "Story: 30.00s, 1 plays and waits, 1 sound cues" in text
+    assert "whoosh.wav -6 dB" in text
@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+import pytest
+
+from render_tools.tuning import EncoderProfile, box_mean, encode_candidate, load_profile, psnr, ssim
+
+
+@pytest.fixture
+def plane():
+    return np.random.default_rng(7).integers(0, 256, (48, 64)).astype(np.uint8)
+
+
+def noisy(plane, amount, seed=1):
+    noise = np.random.default_rng(seed).normal(0, amount, plane.shape)
+    return np.clip(plane + noise, 0, 255).astype(np.uint8)
+
+
+def test_box_mean_matches_a_plain_window_mean(plane):
+    means = box_mean(plane.astype(np.float64), 8)
+    assert means.shape == (41, 57)
+    assert means[5, 9] == pytest.approx(plane[5:13, 9:17].mean())
+
+
+def test_ssim(plane):
+    assert ssim(plane, plane) == pytest.approx(1.0)
+    slightly, badly = ssim(plane, noisy(plane, 4)), ssim(plane, noisy(plane, 40))
+    assert 1.0 > slightly > badly
+
+
+def test_psnr(plane):
+    assert psnr(plane, plane) == float("inf")
+    # Every pixel off by 5: MSE 25
+    assert psnr(np.full((4, 4), 100, np.uint8), np.full((4, 4), 105, np.uint8)) == pytest.approx(
+        10 * np.log10(255 ** 2 / 25)
+    )
+
+
+def test_profile_options():
+    assert EncoderProfile("fast", "none", 23).options() == {"preset": "fast", "crf": "23"}
+    profile = EncoderProfile("veryfast", "animation", 21)
+    assert profile.options()["tune"] == "animation"
+    assert profile.key() == "x264-veryfast-animation-crf21"
+
+
+def test_profile_tuned_at_another_size_is_ignored(tmp_path, monkeypatch):
+    pytest.importorskip("manim")
+    from manim import config
+
+    monkeypatch.setattr(config, "pixel_width", 1080)
+    monkeypatch.setattr(config, "pixel_height", 1920)
+    monkeypatch.setattr(config, "frame_rate", 60)
+    path = tmp_path / "encoder_profile.json"
+    profile = {"preset": "faster", "tune": "animation", "crf": 21}
+    path.write_text(json.dumps({"pixel_width": 1080, "pixel_height": 1920, "frame_rate": 60.0, "profile": profile}))
+    assert load_profile(path) == EncoderProfile(**profile)
+    path.write_text(json.dumps({"pixel_width": 720, "pixel_height": 1280, "frame_rate": 60.0, "profile": profile}))
+    assert load_profile(path) is None
+
+
+def test_candidate_quality_is_measured(tmp_path):
+    pytest.importorskip("av")
+    # Four yuv420p frames of a moving gradient, 64x48
+    y = (np.arange(64)[None, :] * 3 + np.arange(48)[:, None]).astype(np.uint8)
+    frames = np.stack([np.vstack([np.roll(y, step, axis=1), np.full((24, 64), 128, np.uint8)]) for step in range(4)])
+    np.save(tmp_path / "segment.npy", frames)
+    fine = encode_candidate(tmp_path / "segment.npy", 30, EncoderProfile("ultrafast", "none", 18), tmp_path)
+    coarse = encode_candidate(tmp_path / "segment.npy", 30, EncoderProfile("ultrafast", "none", 45), tmp_path)
+    assert fine["ssim"] > coarse["ssim"]
+    assert fine["size_bytes"] > coarse["size_bytes"]
+    assert not fine["timed_alone"]
+    assert list(tmp_path.iterdir()) == [tmp_path / "segment.npy"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+av = pytest.importorskip("av")
+
+from manim import config  # noqa: E402
+
+from render_tools.variants import Variant, VariantEncoder, parse_variant, parse_variants  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def master_frame(monkeypatch):
+    # The 1080x1920 master the scene files configure
+    monkeypatch.setattr(config, "pixel_width", 1080)
+    monkeypatch.setattr(config, "pixel_height", 1920)
+
+
+def test_downscale():
+    assert parse_variant("540x960") == Variant(name="540x960", width=540, height=960)
+
+
+def test_preset():
+    variant = parse_variant(" draft-720p ")
+    assert (variant.name, variant.width, variant.height, variant.crf) == ("draft-720p", 720, 1280, 28)
+
+
+def test_crop_only():
+    variant = parse_variant("square")
+    assert (variant.width, variant.height, variant.crop) == (1080, 1080, (0, 420, 1080, 1080))
+
+
+def test_crop_then_scale():
+    variant = parse_variant("1080x1080+0+420/720x720@crf30")
+    assert (variant.width, variant.height, variant.crop, variant.crf) == (720, 720, (0, 420, 1080, 1080), 30)
+    assert variant.name == "1080x1080_0_420_720x720_crf30"
+
+
+def test_bitrate():
+    assert parse_variant("master-2m").bitrate == 2_000_000
+    assert parse_variant("540x960@800k").bitrate == 800_000
+    assert parse_variant("540x960@800k").crf == 23
+
+
+@pytest.mark.parametrize("spec, error", [
+    ("fullhd", "Can't parse"),
+    ("540x960@fast", "Can't parse"),
+    ("1080x1080+0+1000", "crops outside"),
+    ("541x960", "even width and height"),
+])
+def test_rejected(spec, error):
+    with pytest.raises(ValueError, match=error):
+        parse_variant(spec)
+
+
+def test_parse_variants_skips_empty_parts():
+    assert [variant.name for variant in parse_variants("square,,540x960, ")] == ["square", "540x960"]
+
+
+def test_encoder_crops_and_repeats_frames(tmp_path):
+    variant = parse_variant("1080x1080+0+420/540x540")
+    encoder = VariantEncoder(variant, tmp_path / "Story.mp4", frame_rate=30)
+    master = np.zeros((1920, 1080, 4), dtype=np.uint8)
+    master[..., 3] = 255
+    # White inside the crop, black outside
+    master[420:1500, :, :3] = 255
+    encoder.put(encoder.convert(master), 1)
+    encoder.put(encoder.convert(master), 3)
+    encoder.close()
+    assert encoder.path == tmp_path / "Story.1080x1080_0_420_540x540.mp4"
+    with av.open(str(encoder.path)) as container:
+        frames = [frame.to_ndarray(format="gray") for frame in container.decode(video=0)]
+    assert len(frames) == 4
+    assert frames[0].shape == (540, 540)
+    assert frames[-1].mean() > 240